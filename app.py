@@ -1,10 +1,18 @@
 import streamlit as st
-from modules.config import setup_page_config
-from modules.data_loader import load_data
+from modules.config import setup_page_config, MODO_STREAMING, TAMANHO_BLOCO, MOTOR_CONSULTAS
+from modules.data_loader import load_cube, carregar_cubo_streaming, carregar_cubo_sql, versao_dados
+from modules.consultas_sql import motor_sql_disponivel
 from modules.country_analysis import show_country_analysis
 from modules.mission_analysis import show_mission_analysis
 from modules.success_analysis import show_success_analysis
+from modules.collaboration_analysis import show_collaboration_analysis
 from modules.pdf_export import adicionar_secao_exportacao_pdf  # Nova importação
+from modules.figure_cache import exibir_estatisticas_cache
+from modules.filtros import (
+    carregar_indice, carregar_opcoes_sql, exibir_filtros, aplicar_filtros, aplicar_filtros_sql, descrever_filtro
+)
+from modules.instrumentacao import exibir_painel_instrumentacao
+from modules.utils import fragmento
 
 # Configuração da página
 setup_page_config()
@@ -12,25 +20,19 @@ setup_page_config()
 # Título principal
 st.markdown("<h1 class='main-header'>🚀 Análise de Dados de Exploração Espacial Global</h1>", unsafe_allow_html=True)
 
-# Carregar dados
-df = load_data()
-
-if df is not None:
-    # Visão geral do dataset
+@fragmento
+def show_overview(cubo):
+    """Exibe a visão geral do conjunto de dados"""
     st.markdown("<h2 class='section-header'>Visão Geral dos Dados</h2>", unsafe_allow_html=True)
-    st.write(f"**Total de registros:** {len(df)}")
-    st.write(f"**Período analisado:** {df['Year'].min()} a {df['Year'].max()}")
+    st.write(f"**Total de registros:** {cubo.total}")
+    st.write(f"**Período analisado:** {cubo.ano_min} a {cubo.ano_max}")
     
     # Exibir as primeiras linhas para referência
     with st.expander("Visualizar amostra dos dados"):
-        st.dataframe(df.head())
-    
-    # Análises principais
-    show_country_analysis(df)
-    show_mission_analysis(df)
-    show_success_analysis(df)
-    
-    # Conclusão
+        st.dataframe(cubo.amostra)
+
+def show_conclusions():
+    """Exibe as conclusões da análise"""
     st.markdown("<h2 class='section-header'>Conclusões</h2>", unsafe_allow_html=True)
     st.markdown("""
     A análise exploratória dos dados de exploração espacial global revelou padrões significativos 
@@ -53,9 +55,76 @@ if df is not None:
     da exploração espacial, priorizando eficiência de custos e minimização de riscos humanos, 
     enquanto as missões tripuladas mantêm sua importância simbólica e científica.
     """)
+
+@fragmento
+def show_pdf_export(cubo, subtitulo=None):
+    """Exibe a exportação em PDF, montada a partir do cubo em qualquer modo de carga"""
+    adicionar_secao_exportacao_pdf(cubo, subtitulo)
+
+# Carregar dados
+# No modo streaming e no motor DuckDB o DataFrame completo nunca é materializado,
+# apenas o cubo agregado
+usar_sql = MOTOR_CONSULTAS == 'duckdb' and not MODO_STREAMING
+if usar_sql and not motor_sql_disponivel():
+    st.sidebar.warning("DuckDB não está instalado; usando o pandas.")
+    usar_sql = False
+
+# A versão dos dados é a assinatura dos arquivos do diretório data/: novas partições
+# são incorporadas no próximo rerun de cada sessão, sem reiniciar o app
+versao = versao_dados()
+if st.session_state.get('versao_dados') not in (None, versao):
+    st.toast("Novos dados carregados.")
+st.session_state['versao_dados'] = versao
+
+if MODO_STREAMING:
+    cubo = carregar_cubo_streaming(versao, tamanho_bloco=TAMANHO_BLOCO)
+elif usar_sql:
+    cubo = carregar_cubo_sql(versao)
+else:
+    cubo = load_cube(versao)
+
+if cubo is not None:
+    # Cada seção é executada somente quando selecionada, de modo que editar um
+    # texto ou clicar num botão não recalcula os gráficos das demais seções
+    secoes = {
+        "Visão Geral": lambda: show_overview(cubo),
+        "Análise por País": lambda: show_country_analysis(cubo),
+        "Análise por Tipo de Missão": lambda: show_mission_analysis(cubo),
+        "Análise de Taxas de Sucesso": lambda: show_success_analysis(cubo),
+        "Colaboração Internacional": lambda: show_collaboration_analysis(cubo),
+        "Conclusões": show_conclusions,
+        "Exportar Relatório PDF": lambda: show_pdf_export(cubo, subtitulo),
+    }
+    
+    secao = st.sidebar.radio("Seção", list(secoes))
+    
+    # Filtros da barra lateral, avaliados pelos índices de linhas construídos na carga
+    # ou, no motor DuckDB, por consultas com WHERE; no modo streaming não há linhas
+    # em memória e os filtros ficam indisponíveis
+    subtitulo = None
+    if MODO_STREAMING:
+        st.sidebar.caption("Filtros indisponíveis no modo streaming.")
+    elif usar_sql:
+        filtro = exibir_filtros(carregar_opcoes_sql(versao))
+        subtitulo = descrever_filtro(filtro)
+        cubo = aplicar_filtros_sql(cubo, filtro, versao)
+    else:
+        indice = carregar_indice(versao)
+        if indice is not None:
+            filtro = exibir_filtros(indice)
+            subtitulo = descrever_filtro(filtro)
+            cubo = aplicar_filtros(cubo, indice, filtro, versao)
+    
+    if cubo is None:
+        st.warning("Nenhuma missão corresponde aos filtros selecionados.")
+    else:
+        secoes[secao]()
+    
+    # Contadores do cache de gráficos, para dimensionar o limite de memória
+    exibir_estatisticas_cache()
     
-    # Adicionar seção de exportação PDF
-    adicionar_secao_exportacao_pdf(df)
+    # Percentis de tempo por etapa (somente com INSTRUMENTACAO=1)
+    exibir_painel_instrumentacao()
     
 else:
     st.error("Não foi possível carregar os dados. Verifique se o arquivo está no diretório correto.")
\ No newline at end of file
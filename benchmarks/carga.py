@@ -0,0 +1,170 @@
+import argparse
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+import numpy as np
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.runtime import Runtime
+from streamlit.testing.v1 import AppTest
+
+# Teste de carga: simula N sessões simultâneas do app no mesmo processo, como
+# num servidor compartilhado. Cada sessão abre a página, percorre as seções,
+# edita as áreas de texto e gera o relatório PDF. Roda sem rede:
+#   python -m benchmarks.carga --sessoes 20 --concorrencia 8 --limite-p95 5
+
+CAMINHO_APP = 'app.py'
+SECAO_PDF = "Exportar Relatório PDF"
+BOTAO_PDF = "Gerar Relatório PDF"
+
+class Coletor:
+    """Acumula a latência de cada reexecução, de forma segura entre threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencias = []
+        self.erros = []
+
+    def registrar(self, sessao, acao, segundos, app):
+        with self._lock:
+            self.latencias.append({'sessao': sessao, 'acao': acao, 'segundos': segundos})
+            for excecao in app.exception:
+                self.erros.append({'sessao': sessao, 'acao': acao, 'mensagem': excecao.message})
+
+def _reexecutar(coletor, sessao, acao, app, timeout):
+    inicio = time.perf_counter()
+    app.run(timeout=timeout)
+    coletor.registrar(sessao, acao, time.perf_counter() - inicio, app)
+
+def simular_sessao(sessao, coletor, timeout=120):
+    """Percorre o app como um analista: seções, edição de textos e relatório PDF"""
+    app = AppTest.from_file(CAMINHO_APP, default_timeout=timeout)
+    _reexecutar(coletor, sessao, 'abrir', app, timeout)
+
+    seletor = app.sidebar.radio[0]
+    for secao in seletor.options:
+        if secao == SECAO_PDF:
+            continue
+        app.sidebar.radio[0].set_value(secao)
+        _reexecutar(coletor, sessao, 'trocar_secao', app, timeout)
+
+        # Cada edição de texto dispara uma reexecução, como no navegador
+        for area in list(app.text_area):
+            area.input(f"{area.value}\nNota da sessão {sessao}.")
+            _reexecutar(coletor, sessao, 'editar_texto', app, timeout)
+
+    app.sidebar.radio[0].set_value(SECAO_PDF)
+    _reexecutar(coletor, sessao, 'trocar_secao', app, timeout)
+
+    botoes = [b for b in app.button if b.label == BOTAO_PDF]
+    if botoes:
+        botoes[0].click()
+        _reexecutar(coletor, sessao, 'gerar_pdf', app, timeout)
+
+@contextmanager
+def runtime_compartilhado():
+    """Mantém um único Runtime simulado durante todo o teste de carga
+
+    O AppTest cria e descarta o Runtime global a cada execução, o que quebra
+    execuções simultâneas. Aqui todas as sessões compartilham o mesmo Runtime
+    (gerenciador de mídia e de cache), como num servidor real.
+    """
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+
+    instancia, existe = Runtime.__dict__['instance'], Runtime.__dict__['exists']
+    Runtime.instance = classmethod(lambda cls: runtime)
+    Runtime.exists = classmethod(lambda cls: True)
+    try:
+        yield runtime
+    finally:
+        Runtime.instance, Runtime.exists = instancia, existe
+
+def _percentis(valores):
+    p50, p95, p99 = np.percentile(valores, [50, 95, 99]) if valores else (0.0, 0.0, 0.0)
+    return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99)}
+
+def executar_carga(sessoes, concorrencia, timeout=120):
+    """Executa as sessões em paralelo e devolve o resumo de latências"""
+    coletor = Coletor()
+
+    inicio = time.perf_counter()
+    with runtime_compartilhado(), ThreadPoolExecutor(max_workers=concorrencia) as pool:
+        futuros = [pool.submit(simular_sessao, i, coletor, timeout) for i in range(sessoes)]
+        for futuro in futuros:
+            futuro.result()
+    duracao = time.perf_counter() - inicio
+
+    segundos = [l['segundos'] for l in coletor.latencias]
+    por_acao = {}
+    for acao in sorted({l['acao'] for l in coletor.latencias}):
+        valores = [l['segundos'] for l in coletor.latencias if l['acao'] == acao]
+        por_acao[acao] = {'reexecucoes': len(valores), **_percentis(valores)}
+
+    return {
+        'sessoes': sessoes,
+        'concorrencia': concorrencia,
+        'duracao_segundos': duracao,
+        'reexecucoes': len(segundos),
+        'vazao_reexecucoes_por_segundo': len(segundos) / duracao if duracao else 0.0,
+        'latencia': _percentis(segundos),
+        'por_acao': por_acao,
+        # ru_maxrss é informado em KB no Linux
+        'pico_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'pico_rss_filhos_mb': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+        'erros': coletor.erros
+    }
+
+def imprimir_resumo(resumo):
+    latencia = resumo['latencia']
+    print(f"{resumo['sessoes']} sessões ({resumo['concorrencia']} simultâneas), "
+          f"{resumo['reexecucoes']} reexecuções em {resumo['duracao_segundos']:.1f}s")
+    print(f"Vazão: {resumo['vazao_reexecucoes_por_segundo']:.2f} reexecuções/s")
+    print(f"Latência: p50 {latencia['p50']:.3f}s | p95 {latencia['p95']:.3f}s | p99 {latencia['p99']:.3f}s")
+    print()
+    print(f"{'Ação':<16} {'N':>6} {'p50 (s)':>9} {'p95 (s)':>9} {'p99 (s)':>9}")
+    for acao, valores in resumo['por_acao'].items():
+        print(f"{acao:<16} {valores['reexecucoes']:>6} {valores['p50']:>9.3f} "
+              f"{valores['p95']:>9.3f} {valores['p99']:>9.3f}")
+    print()
+    print(f"Pico de RSS: {resumo['pico_rss_mb']:.0f} MB (processos filhos: {resumo['pico_rss_filhos_mb']:.0f} MB)")
+    print(f"Erros: {len(resumo['erros'])}")
+    for erro in resumo['erros'][:5]:
+        print(f"  sessão {erro['sessao']} ({erro['acao']}): {erro['mensagem']}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simula sessões simultâneas do app Streamlit.")
+    parser.add_argument('--sessoes', type=int, default=10, help="número de sessões simuladas (padrão: 10)")
+    parser.add_argument('--concorrencia', type=int, default=4, help="sessões ativas ao mesmo tempo (padrão: 4)")
+    parser.add_argument('--timeout', type=float, default=120, help="tempo máximo de cada reexecução (s)")
+    parser.add_argument('--saida', default=None, help="arquivo JSON para gravar o resumo")
+    parser.add_argument('--limite-p95', type=float, default=None,
+                        help="falha (código 1) se a latência p95 passar deste valor em segundos")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings('ignore', category=FutureWarning)
+
+    resumo = executar_carga(args.sessoes, args.concorrencia, args.timeout)
+    imprimir_resumo(resumo)
+
+    if args.saida:
+        os.makedirs(os.path.dirname(args.saida) or '.', exist_ok=True)
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resumo, arquivo, indent=2, ensure_ascii=False)
+
+    # Permite usar o teste de carga como critério de liberação de versão
+    if resumo['erros'] or (args.limite_p95 is not None and resumo['latencia']['p95'] > args.limite_p95):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
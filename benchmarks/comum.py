@@ -0,0 +1,25 @@
+import os
+import resource
+import subprocess
+
+# Utilitários compartilhados pelos scripts de benchmark
+
+def commit_atual():
+    """Hash curto do commit atual, registrado junto com os resultados (None fora de um repositório git)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def rss_max_mb():
+    """Maior memória residente do processo até agora (MB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def rss_atual_mb():
+    """Memória residente do processo agora (MB), não o pico"""
+    try:
+        with open('/proc/self/statm') as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except OSError:
+        return rss_max_mb()
@@ -0,0 +1,163 @@
+import argparse
+import ctypes
+import gc
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from benchmarks.comum import commit_atual, rss_atual_mb
+from benchmarks.executar import DIRETORIO_DADOS, GRAFICOS
+from benchmarks.gerador import TAMANHOS_PADRAO, gerar_csv
+from modules import data_loader
+from modules.aggregates import construir_cubo
+from modules.figure_cache import desenhar_png
+
+# Teste de estresse da renderização: várias threads (como as sessões do
+# Streamlit) desenham todos os gráficos matplotlib das seções ao mesmo tempo,
+# em ordens diferentes, sem o cache de figuras. Cada PNG deve ser
+# idêntico ao desenhado sozinho, nenhuma figura pode sobreviver à serialização
+# e a memória residente não pode crescer de uma rodada para a outra:
+#   python -m benchmarks.concorrencia_graficos --sessoes 16 --rodadas 5
+
+def _figuras_vivas():
+    """Figuras matplotlib ainda alcançáveis no processo"""
+    from matplotlib.figure import Figure
+    # Os ciclos dos artistas têm callbacks de weakref: uma figura só é liberada
+    # na coleta seguinte à dos seus eixos
+    for _ in range(3):
+        gc.collect()
+    return sum(1 for objeto in gc.get_objects() if isinstance(objeto, Figure))
+
+def _rss_em_uso_mb():
+    """Memória residente depois de coletar o lixo e devolver ao sistema as páginas livres do malloc
+
+    Sem isso o RSS de uma rodada inclui ciclos ainda não coletados e memória
+    já liberada que o malloc (glibc) guardou para reuso, e oscila dezenas de
+    MB de uma rodada para outra sem que nada vaze.
+    """
+    _figuras_vivas()
+    try:
+        ctypes.CDLL('libc.so.6').malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+    return rss_atual_mb()
+
+def tarefas_desenho(cubo):
+    """{nome: função sem argumentos que devolve o PNG} dos gráficos das seções"""
+    return {
+        grafico.__name__: (lambda grafico=grafico: desenhar_png(grafico.__wrapped__, cubo))
+        for grafico in GRAFICOS
+    }
+
+def _resumo(png):
+    return hashlib.sha256(png).hexdigest() if png is not None else None
+
+def simular_sessao(sessao, tarefas, referencia):
+    """Desenha todos os gráficos numa ordem própria; devolve os nomes que divergiram"""
+    ordem = list(tarefas)
+    random.Random(sessao).shuffle(ordem)
+    return [nome for nome in ordem if _resumo(tarefas[nome]()) != referencia[nome]]
+
+def executar_estresse(cubo, sessoes, rodadas):
+    tarefas = tarefas_desenho(cubo)
+
+    # Referência: cada gráfico desenhado sozinho, sem concorrência
+    referencia = {nome: _resumo(desenhar()) for nome, desenhar in tarefas.items()}
+
+    medicoes, divergencias = [], []
+    with ThreadPoolExecutor(max_workers=sessoes, thread_name_prefix='sessao') as executor:
+        # Rodada de aquecimento, fora das medições: paga as alocações únicas
+        # (caches de fontes e de texto do matplotlib, arenas de memória de cada
+        # thread), que de outro modo contariam como crescimento
+        aquecimento = [executor.submit(simular_sessao, -1 - s, tarefas, referencia) for s in range(sessoes)]
+        for futuro in aquecimento:
+            divergencias.extend(futuro.result())
+        figuras_inicio = _figuras_vivas()
+        rss_base = round(_rss_em_uso_mb(), 1)
+        print(f"  aquecimento: RSS {rss_base:>8.1f} MB", flush=True)
+
+        for rodada in range(rodadas):
+            inicio = time.perf_counter()
+            futuros = [executor.submit(simular_sessao, rodada * sessoes + s, tarefas, referencia)
+                       for s in range(sessoes)]
+            for futuro in futuros:
+                divergencias.extend(futuro.result())
+            segundos = time.perf_counter() - inicio
+            medicoes.append({
+                'rodada': rodada + 1,
+                'segundos': round(segundos, 3),
+                'figuras_vivas': _figuras_vivas() - figuras_inicio,
+                'rss_mb': round(_rss_em_uso_mb(), 1)
+            })
+            m = medicoes[-1]
+            print(f"  rodada {m['rodada']:>3}: {m['segundos']:>8.2f}s  RSS {m['rss_mb']:>8.1f} MB  "
+                  f"figuras vivas {m['figuras_vivas']}", flush=True)
+
+    return {
+        'graficos': len(tarefas),
+        'sessoes': sessoes,
+        'rodadas': rodadas,
+        'desenhos': len(tarefas) * sessoes * rodadas,
+        'divergencias': sorted(set(divergencias)),
+        'rss_base_mb': rss_base,
+        'medicoes': medicoes
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Desenha os gráficos em várias threads e verifica saída e memória.")
+    parser.add_argument('--tamanho', default='3k', choices=list(TAMANHOS_PADRAO),
+                        help="conjunto sintético usado (padrão: 3k)")
+    parser.add_argument('--sessoes', type=int, default=16, help="threads desenhando ao mesmo tempo (padrão: 16)")
+    parser.add_argument('--rodadas', type=int, default=5, help="rodadas de todas as sessões (padrão: 5)")
+    parser.add_argument('--tolerancia-mb', type=float, default=32,
+                        help="crescimento de RSS aceito entre o aquecimento e a última rodada (padrão: 32 MB)")
+    parser.add_argument('--saida', default=None, help="arquivo JSON com as medições")
+    args = parser.parse_args(argv)
+
+    # Avisos de depreciação do seaborn poluiriam a saída
+    warnings.filterwarnings('ignore', category=FutureWarning)
+
+    caminho = os.path.join(DIRETORIO_DADOS, f"sintetico_{args.tamanho}.csv")
+    if not os.path.exists(caminho):
+        print(f"Gerando {caminho}...", flush=True)
+        gerar_csv(TAMANHOS_PADRAO[args.tamanho], caminho)
+    cubo = construir_cubo(data_loader.ler_dados_tipados(caminho))
+
+    print(f"{args.sessoes} sessões x {args.rodadas} rodadas")
+    resultado = executar_estresse(cubo, args.sessoes, args.rodadas)
+
+    medicoes = resultado['medicoes']
+    crescimento = medicoes[-1]['rss_mb'] - resultado['rss_base_mb']
+    print(f"\n{resultado['desenhos']} desenhos; crescimento de RSS após o aquecimento: {crescimento:+.1f} MB "
+          f"(tolerância: {args.tolerancia_mb:.0f} MB)")
+
+    if args.saida:
+        os.makedirs(os.path.dirname(args.saida) or '.', exist_ok=True)
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump({
+                'commit': commit_atual(),
+                'data': datetime.now().isoformat(timespec='seconds'),
+                'cpus': os.cpu_count(),
+                **resultado
+            }, arquivo, indent=2, ensure_ascii=False)
+        print(f"Resultados gravados em {args.saida}")
+
+    falhas = []
+    if resultado['divergencias']:
+        falhas.append(f"gráficos diferentes do desenho isolado: {', '.join(resultado['divergencias'])}")
+    if medicoes[-1]['figuras_vivas'] > 0:
+        falhas.append(f"{medicoes[-1]['figuras_vivas']} figura(s) não liberada(s)")
+    if crescimento > args.tolerancia_mb:
+        falhas.append(f"RSS cresceu {crescimento:.1f} MB entre o aquecimento e a última rodada")
+    for falha in falhas:
+        print(f"FALHA: {falha}", file=sys.stderr)
+    return 1 if falhas else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,287 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import tempfile
+import threading
+import time
+import tracemalloc
+import warnings
+from contextlib import contextmanager
+from datetime import datetime
+from unittest import mock
+
+import pandas as pd
+
+from benchmarks.comum import commit_atual, rss_atual_mb, rss_max_mb
+from benchmarks.gerador import TAMANHOS_PADRAO, gerar_csv
+from modules import analises, data_loader
+from modules.aggregates import construir_cubo
+from modules.consultas_sql import motor_sql_disponivel, construir_cubo_sql
+from modules.figure_cache import desenhar_png
+from modules.collaboration_analysis import (
+    plot_collaboration_network, plot_collaboration_heatmap, plot_solo_vs_collaborative
+)
+from modules.country_analysis import (
+    plot_top_countries_by_missions, plot_top_countries_by_budget, plot_missions_vs_budget
+)
+from modules.mission_analysis import (
+    plot_mission_types_distribution, plot_budget_by_mission_type, plot_mission_types_evolution
+)
+from modules.success_analysis import (
+    plot_success_rate_by_country, plot_success_rate_by_mission_type,
+    plot_budget_vs_success, plot_success_rate_evolution
+)
+from modules.pdf_export import gerar_relatorio_pdf, preparar_tabelas_graficos
+
+# Suíte de benchmarks: mede tempo e memória do carregamento, das agregações, dos
+# gráficos e do relatório PDF em dados sintéticos de vários tamanhos:
+#   python -m benchmarks.executar --tamanhos 3k 300k --saida benchmarks/resultados/atual.json
+#   python -m benchmarks.executar --tamanhos 3k --comparar benchmarks/resultados/base.json
+
+DIRETORIO_DADOS = os.path.join('benchmarks', 'dados')
+
+GRAFICOS = [
+    plot_top_countries_by_missions, plot_top_countries_by_budget, plot_missions_vs_budget,
+    plot_mission_types_distribution, plot_budget_by_mission_type, plot_mission_types_evolution,
+    plot_success_rate_by_country, plot_success_rate_by_mission_type,
+    plot_budget_vs_success, plot_success_rate_evolution,
+    plot_collaboration_network, plot_collaboration_heatmap, plot_solo_vs_collaborative
+]
+
+# Intervalo de amostragem da memória residente nas etapas nativas (segundos)
+INTERVALO_AMOSTRA_RSS = 0.002
+
+@contextmanager
+def _pico_rss():
+    """Amostra a memória residente numa thread enquanto o bloco executa
+
+    Entrega um dicionário que, ao final do bloco, traz o pico acima da
+    memória inicial ('pico_mb') e a memória que ficou retida ('retida_mb').
+    """
+    inicio = rss_atual_mb()
+    pico = [inicio]
+    parar = threading.Event()
+
+    def amostrar():
+        while not parar.wait(INTERVALO_AMOSTRA_RSS):
+            pico[0] = max(pico[0], rss_atual_mb())
+
+    medida = {}
+    amostrador = threading.Thread(target=amostrar, daemon=True)
+    amostrador.start()
+    try:
+        yield medida
+    finally:
+        parar.set()
+        amostrador.join()
+        final = rss_atual_mb()
+        medida['pico_mb'] = max(pico[0], final) - inicio
+        medida['retida_mb'] = final - inicio
+
+def medir(resultados, tamanho, linhas, etapa, funcao, *args, preparar=None, nativa=False, **kwargs):
+    """Executa a etapa duas vezes: a primeira mede só o tempo, a segunda só a memória
+
+    O tracemalloc deixa o código medido mais lento, então fica desligado na
+    cronometragem. Nas etapas nativas (pyarrow, DuckDB), cujas alocações o
+    tracemalloc não enxerga, a memória é o pico de RSS acima do início da
+    execução. preparar, se dado, roda antes de cada execução e fora da medição
+    (ex.: apagar o cache gravado pela primeira), para que as duas encontrem o
+    mesmo estado. Retorna o resultado da segunda execução.
+    """
+    if preparar:
+        preparar()
+    gc.collect()
+    inicio, inicio_cpu = time.perf_counter(), time.process_time()
+    retorno = funcao(*args, **kwargs)
+    segundos, cpu = time.perf_counter() - inicio, time.process_time() - inicio_cpu
+    del retorno
+
+    if preparar:
+        preparar()
+    gc.collect()
+    if nativa:
+        with _pico_rss() as medida:
+            retorno = funcao(*args, **kwargs)
+        pico_mb, retida_mb = medida['pico_mb'], medida['retida_mb']
+    else:
+        rss_inicio = rss_atual_mb()
+        tracemalloc.start()
+        try:
+            retorno = funcao(*args, **kwargs)
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        pico_mb, retida_mb = pico / 1024 / 1024, rss_atual_mb() - rss_inicio
+
+    resultados.append({
+        'tamanho': tamanho,
+        'linhas': linhas,
+        'etapa': etapa,
+        'segundos': round(segundos, 4),
+        'cpu_segundos': round(cpu, 4),
+        'pico_memoria_mb': round(pico_mb, 2),
+        'memoria_medida': 'rss' if nativa else 'tracemalloc',
+        'rss_retida_mb': round(retida_mb, 1),
+        'rss_max_mb': round(rss_max_mb(), 1)
+    })
+    print(f"  {etapa:<45} {segundos:>9.3f}s {pico_mb:>10.1f} MB {'(RSS)' if nativa else ''}", flush=True)
+    return retorno
+
+def _apagar_cache(caminho_csv, sufixo=''):
+    """Remove o Parquet e o manifesto de uma partição, para que a próxima leitura seja fria"""
+    for arquivo in data_loader._caminhos_cache(caminho_csv, sufixo):
+        if os.path.exists(arquivo):
+            os.remove(arquivo)
+
+def _desenhar(grafico, cubo):
+    """Desenha e rasteriza um gráfico ignorando o cache de figuras"""
+    return desenhar_png(grafico.__wrapped__, cubo)
+
+def executar_tamanho(tamanho, linhas, resultados, com_pdf=True):
+    """Executa todas as etapas para um tamanho de conjunto de dados"""
+    caminho = os.path.join(DIRETORIO_DADOS, f"sintetico_{tamanho}.csv")
+    if not os.path.exists(caminho):
+        print(f"Gerando {caminho} ({linhas} linhas)...", flush=True)
+        gerar_csv(linhas, caminho)
+
+    print(f"\n[{tamanho}] {linhas} linhas")
+
+    # O cache colunar fica num diretório temporário para medir leitura fria e quente
+    with tempfile.TemporaryDirectory() as diretorio_cache, \
+            mock.patch.object(data_loader, 'DIRETORIO_CACHE', diretorio_cache):
+        medir(resultados, tamanho, linhas, 'carregar_csv_frio', data_loader.ler_dados_tipados, caminho,
+              preparar=lambda: _apagar_cache(caminho), nativa=True)
+        df = medir(resultados, tamanho, linhas, 'carregar_cache_colunar', data_loader.ler_dados_tipados, caminho,
+                   nativa=True)
+
+        # Motor DuckDB (opcional): conversão para Parquet e cubo montado por consultas SQL
+        if motor_sql_disponivel():
+            conexao = medir(resultados, tamanho, linhas, 'duckdb_converter_parquet',
+                            data_loader.abrir_motor_sql, [caminho],
+                            preparar=lambda: _apagar_cache(caminho, '.sql'), nativa=True)
+            medir(resultados, tamanho, linhas, 'duckdb_construir_cubo', construir_cubo_sql, conexao, nativa=True)
+            conexao.close()
+
+        # Ingestão incremental: o conjunto como primeira partição e depois uma nova
+        # partição com 1% das linhas, que deve custar proporcionalmente a ela
+        particoes = os.path.join(diretorio_cache, 'particoes')
+        os.makedirs(particoes)
+        primeira = os.path.join(particoes, 'parte_000.csv')
+        os.symlink(os.path.abspath(caminho), primeira)
+        versao_inicial = data_loader.versao_dados(particoes)
+        medir(resultados, tamanho, linhas, 'ingestao_inicial',
+              lambda: data_loader.IngestaoParticoes(particoes).atualizar(versao_inicial),
+              preparar=lambda: _apagar_cache(primeira), nativa=True)
+
+        nova = os.path.join(particoes, 'parte_001.csv')
+        gerar_csv(max(linhas // 100, 1), nova, semente=7)
+        versao_nova = data_loader.versao_dados(particoes)
+        base = {}
+
+        def preparar_incremental():
+            # Estado de partida: só a primeira partição ingerida, a nova ainda sem cache
+            _apagar_cache(nova)
+            base['ingestao'] = data_loader.IngestaoParticoes(particoes)
+            base['ingestao'].atualizar(versao_inicial)
+
+        medir(resultados, tamanho, linhas, 'ingestao_incremental_1pct',
+              lambda: base['ingestao'].atualizar(versao_nova), preparar=preparar_incremental, nativa=True)
+        base.clear()
+
+        # Mesmo volume dividido em 4 partições, lidas em paralelo
+        quatro = os.path.join(diretorio_cache, 'quatro_particoes')
+        os.makedirs(quatro)
+        caminhos_quatro = [os.path.join(quatro, f'parte_{i:03d}.csv') for i in range(4)]
+        for i, caminho_parte in enumerate(caminhos_quatro):
+            gerar_csv(linhas // 4, caminho_parte, semente=i)
+        versao_quatro = data_loader.versao_dados(quatro)
+        medir(resultados, tamanho, linhas, 'ingestao_4_particoes',
+              lambda: data_loader.IngestaoParticoes(quatro).atualizar(versao_quatro),
+              preparar=lambda: [_apagar_cache(c) for c in caminhos_quatro], nativa=True)
+
+    cubo = medir(resultados, tamanho, linhas, 'construir_cubo', construir_cubo, df)
+    ano_meio = int(cubo.ano_min + (cubo.ano_max - cubo.ano_min) // 2)
+
+    consultas = {
+        'por_pais': cubo.por_pais,
+        'por_tipo': cubo.por_tipo,
+        'por_ano': cubo.por_ano,
+        'por_ano_tipo': cubo.por_ano_tipo,
+        'estatisticas_sucesso_por_faixa': cubo.estatisticas_sucesso_por_faixa,
+        'por_pais_intervalo_anos': lambda: cubo.por_pais(anos=(cubo.ano_min, ano_meio)),
+    }
+    for nome, consulta in consultas.items():
+        medir(resultados, tamanho, linhas, f'agregacao.{nome}', consulta)
+
+    # Tabelas do relatório sem nenhuma análise memorizada; depois dos gráficos
+    # abaixo, as mesmas tabelas já estão na camada de análises
+    medir(resultados, tamanho, linhas, 'pdf_tabelas_frio', preparar_tabelas_graficos, cubo,
+          preparar=analises.memoria.limpar)
+
+    # Cada gráfico parte da camada de análises vazia, nas duas execuções
+    for grafico in GRAFICOS:
+        medir(resultados, tamanho, linhas, f'grafico.{grafico.__name__}', _desenhar, grafico, cubo,
+              preparar=analises.memoria.limpar)
+
+    # A página inteira, fora da medição, deixa memorizadas as tabelas que ela compartilha com o relatório
+    analises.memoria.limpar()
+    for grafico in GRAFICOS:
+        _desenhar(grafico, cubo)
+    medir(resultados, tamanho, linhas, 'pdf_tabelas_apos_pagina', preparar_tabelas_graficos, cubo)
+
+    if com_pdf:
+        medir(resultados, tamanho, linhas, 'relatorio_pdf', gerar_relatorio_pdf, cubo)
+        medir(resultados, tamanho, linhas, 'relatorio_pdf_rascunho', gerar_relatorio_pdf, cubo, perfil='rascunho')
+
+def comparar(atual, base):
+    """Imprime a variação de tempo de cada etapa em relação a uma execução anterior"""
+    anteriores = {(r['tamanho'], r['etapa']): r for r in base['resultados']}
+    print(f"\nComparação com {base.get('commit')} ({base.get('data')}):")
+    for r in atual['resultados']:
+        anterior = anteriores.get((r['tamanho'], r['etapa']))
+        if anterior and anterior['segundos'] > 0:
+            variacao = (r['segundos'] / anterior['segundos'] - 1) * 100
+            print(f"  [{r['tamanho']}] {r['etapa']:<45} {anterior['segundos']:>9.3f}s -> "
+                  f"{r['segundos']:>9.3f}s ({variacao:+.1f}%)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Executa a suíte de benchmarks.")
+    parser.add_argument('--tamanhos', nargs='+', default=['3k', '300k'], choices=list(TAMANHOS_PADRAO),
+                        help="tamanhos dos conjuntos sintéticos (padrão: 3k 300k)")
+    parser.add_argument('--saida', default=None,
+                        help="arquivo JSON de resultados (padrão: benchmarks/resultados/<commit>.json)")
+    parser.add_argument('--sem-pdf', action='store_true', help="não mede a geração do relatório PDF")
+    parser.add_argument('--comparar', default=None, help="JSON de uma execução anterior para comparação")
+    args = parser.parse_args(argv)
+
+    # Avisos de depreciação do pandas/seaborn poluiriam a tabela de tempos
+    warnings.filterwarnings('ignore', category=FutureWarning)
+
+    resultados = []
+    for tamanho in args.tamanhos:
+        executar_tamanho(tamanho, TAMANHOS_PADRAO[tamanho], resultados, com_pdf=not args.sem_pdf)
+
+    commit = commit_atual()
+    execucao = {
+        'commit': commit,
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'cpus': os.cpu_count(),
+        'resultados': resultados
+    }
+
+    saida = args.saida or os.path.join('benchmarks', 'resultados', f"{commit or 'sem_commit'}.json")
+    os.makedirs(os.path.dirname(saida) or '.', exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(execucao, arquivo, indent=2, ensure_ascii=False)
+    print(f"\nResultados gravados em {saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            comparar(execucao, json.load(arquivo))
+
+if __name__ == '__main__':
+    main()
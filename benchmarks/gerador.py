@@ -0,0 +1,86 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+# Gerador de dados sintéticos com o mesmo esquema do CSV original, para medir
+# como o carregamento, as agregações e o relatório escalam com o volume:
+#   python -m benchmarks.gerador --linhas 300000 --saida benchmarks/dados/sintetico_300k.csv
+
+# Países com distribuição assimétrica (poucos países concentram as missões)
+PAISES = ['USA', 'China', 'Russia', 'India', 'Japan', 'France', 'UK', 'Germany', 'Israel', 'UAE']
+PESOS_PAISES = np.array([0.22, 0.18, 0.14, 0.10, 0.09, 0.08, 0.07, 0.05, 0.04, 0.03])
+
+# Países que podem aparecer em "Collaborating Countries"
+COLABORADORES = PAISES + ['Canada', 'Brazil', 'Italy', 'Spain', 'South Korea', 'Australia']
+
+TIPOS_MISSAO = ['Unmanned', 'Manned']
+PESOS_TIPOS = np.array([0.6, 0.4])
+
+TIPOS_SATELITE = ['Communication', 'Weather', 'Navigation', 'Research', 'Spy']
+TECNOLOGIAS = ['Solar Propulsion', 'Nuclear Propulsion', 'Reusable Rocket', 'Traditional Rocket', 'AI Navigation']
+IMPACTOS = ['Low', 'Medium', 'High']
+
+PALAVRAS = ['Orbital', 'Lunar', 'Deep', 'Solar', 'Stellar', 'Polar', 'Quantum', 'Nova',
+            'Horizon', 'Pioneer', 'Voyager', 'Explorer', 'Sentinel', 'Aurora', 'Zenith']
+
+TAMANHOS_PADRAO = {'3k': 3_000, '300k': 300_000, '3M': 3_000_000, '30M': 30_000_000}
+
+def gerar_bloco(n, rng):
+    """Gera n linhas sintéticas seguindo as distribuições do conjunto original"""
+    # Orçamento: uniforme entre 0.5 e 50 bilhões, como no conjunto de exemplo
+    orcamento = np.round(rng.uniform(0.5, 50, n), 2)
+
+    # Sucesso entre 50% e 100%, levemente maior para orçamentos maiores
+    sucesso = np.clip(np.round(rng.normal(75 + (orcamento - 25) * 0.1, 14)), 50, 100).astype(int)
+
+    # Colaboradores: de 1 a 3 países, unidos por vírgula
+    n_colaboradores = rng.integers(1, 4, n)
+    indices = rng.integers(0, len(COLABORADORES), (n, 3))
+    nomes = np.array(COLABORADORES, dtype=object)[indices]
+    colaboradores = [', '.join(linha[:k]) for linha, k in zip(nomes, n_colaboradores)]
+
+    palavras = np.array(PALAVRAS, dtype=object)
+    nomes_missao = (palavras[rng.integers(0, len(PALAVRAS), n)] + ' '
+                    + palavras[rng.integers(0, len(PALAVRAS), n)] + ' '
+                    + rng.integers(1, 1000, n).astype(str).astype(object))
+
+    return pd.DataFrame({
+        'Country': rng.choice(PAISES, n, p=PESOS_PAISES),
+        'Year': rng.integers(2000, 2026, n),
+        'Mission Name': nomes_missao,
+        'Mission Type': rng.choice(TIPOS_MISSAO, n, p=PESOS_TIPOS),
+        'Launch Site': 'Site ' + rng.integers(0, max(n // 2, 1), n).astype(str).astype(object),
+        'Satellite Type': rng.choice(TIPOS_SATELITE, n),
+        'Budget (in Billion $)': orcamento,
+        'Success Rate (%)': sucesso,
+        'Technology Used': rng.choice(TECNOLOGIAS, n),
+        'Environmental Impact': rng.choice(IMPACTOS, n),
+        'Collaborating Countries': colaboradores,
+        'Duration (in Days)': rng.integers(1, 366, n)
+    })
+
+def gerar_csv(linhas, caminho, semente=42, tamanho_bloco=500_000):
+    """Grava um CSV sintético com o número de linhas pedido, bloco a bloco"""
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    rng = np.random.default_rng(semente)
+
+    restantes = linhas
+    primeiro = True
+    while restantes > 0:
+        n = min(tamanho_bloco, restantes)
+        gerar_bloco(n, rng).to_csv(caminho, mode='w' if primeiro else 'a', header=primeiro, index=False)
+        primeiro = False
+        restantes -= n
+    return caminho
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera um CSV sintético de missões espaciais.")
+    parser.add_argument('--linhas', type=int, required=True)
+    parser.add_argument('--saida', required=True)
+    parser.add_argument('--semente', type=int, default=42)
+    args = parser.parse_args(argv)
+    gerar_csv(args.linhas, args.saida, args.semente)
+
+if __name__ == '__main__':
+    main()
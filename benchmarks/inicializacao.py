@@ -0,0 +1,109 @@
+import argparse
+import ast
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+from benchmarks.comum import commit_atual
+from modules.config import ORCAMENTO_INICIALIZACAO_S
+
+# Tempo de inicialização a frio: executa, num interpretador novo, as importações
+# de nível superior do app.py e registra o tempo de importação de cada módulo
+# (python -X importtime). Falha se o tempo passar do orçamento ou se um módulo
+# carregado só sob demanda (ReportLab, seaborn, pyplot, Altair) for importado:
+#   python -m benchmarks.inicializacao --orcamento 1.5 --saida benchmarks/resultados/inicializacao.json
+
+CAMINHO_APP = 'app.py'
+
+# Dependências pesadas que só devem ser carregadas no primeiro uso
+MODULOS_SOB_DEMANDA = ['reportlab', 'seaborn', 'matplotlib.pyplot', 'altair', 'duckdb']
+
+def importacoes_app(caminho=CAMINHO_APP):
+    """Instruções de importação de nível superior do app, sem executar o script"""
+    with open(caminho, encoding='utf-8') as arquivo:
+        arvore = ast.parse(arquivo.read())
+    return [ast.unparse(no) for no in arvore.body if isinstance(no, (ast.Import, ast.ImportFrom))]
+
+def _ler_importtime(saida):
+    """Converte as linhas 'import time: próprio | acumulado | módulo' em registros"""
+    modulos = []
+    for linha in saida.splitlines():
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        proprio, acumulado, nome = linha[len('import time:'):].split('|')
+        modulos.append({
+            'modulo': nome.strip(),
+            'nivel': (len(nome) - len(nome.lstrip()) - 1) // 2,
+            'proprio_ms': int(proprio) / 1000,
+            'acumulado_ms': int(acumulado) / 1000
+        })
+    return modulos
+
+def medir_inicializacao(instrucoes, diretorio='.'):
+    """Executa as importações num processo novo
+
+    Retorna (segundos, módulos medidos pelo -X importtime, módulos sob demanda carregados).
+    """
+    codigo = '\n'.join(
+        ['import sys, time', '_inicio = time.perf_counter()'] + instrucoes +
+        ['print(time.perf_counter() - _inicio)',
+         f"print(','.join(m for m in {MODULOS_SOB_DEMANDA!r} if m in sys.modules))"]
+    )
+    processo = subprocess.run([sys.executable, '-X', 'importtime', '-c', codigo],
+                              capture_output=True, text=True, check=True, cwd=diretorio)
+    segundos, carregados = processo.stdout.splitlines()[-2:]
+    return float(segundos), _ler_importtime(processo.stderr), [m for m in carregados.split(',') if m]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o tempo de importação do app a frio.")
+    parser.add_argument('--orcamento', type=float, default=ORCAMENTO_INICIALIZACAO_S,
+                        help=f"tempo máximo em segundos (padrão: {ORCAMENTO_INICIALIZACAO_S}, "
+                             f"ou ORCAMENTO_INICIALIZACAO_S)")
+    parser.add_argument('--repeticoes', type=int, default=3,
+                        help="inicializações medidas; vale a mediana (padrão: 3)")
+    parser.add_argument('--top', type=int, default=15, help="módulos mais lentos exibidos (padrão: 15)")
+    parser.add_argument('--saida', default=None, help="arquivo JSON com os tempos por módulo")
+    args = parser.parse_args(argv)
+
+    instrucoes = importacoes_app()
+    # A primeira execução compila os .pyc alterados e não entra na medição
+    medir_inicializacao(instrucoes)
+    medicoes = [medir_inicializacao(instrucoes) for _ in range(args.repeticoes)]
+    tempos = [segundos for segundos, _, _ in medicoes]
+    mediana = statistics.median(tempos)
+    _, modulos, carregados = medicoes[tempos.index(sorted(tempos)[len(tempos) // 2])]
+
+    print(f"{'Módulo':<50} {'Próprio (ms)':>13} {'Acumulado (ms)':>15}")
+    for m in sorted(modulos, key=lambda m: m['acumulado_ms'], reverse=True)[:args.top]:
+        print(f"{'  ' * m['nivel'] + m['modulo']:<50} {m['proprio_ms']:>13.1f} {m['acumulado_ms']:>15.1f}")
+    print(f"\nImportações do app: {mediana:.3f}s (mediana de {args.repeticoes}; orçamento: {args.orcamento:.3f}s)")
+
+    if args.saida:
+        os.makedirs(os.path.dirname(args.saida) or '.', exist_ok=True)
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump({
+                'commit': commit_atual(),
+                'data': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'segundos': tempos,
+                'orcamento': args.orcamento,
+                'modulos_sob_demanda_carregados': carregados,
+                'modulos': modulos
+            }, arquivo, indent=2, ensure_ascii=False)
+        print(f"Resultados gravados em {args.saida}")
+
+    falhas = []
+    if mediana > args.orcamento:
+        falhas.append(f"inicialização de {mediana:.3f}s acima do orçamento de {args.orcamento:.3f}s")
+    if carregados:
+        falhas.append(f"módulos que deveriam ser carregados sob demanda: {', '.join(carregados)}")
+    for falha in falhas:
+        print(f"FALHA: {falha}", file=sys.stderr)
+    return 1 if falhas else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
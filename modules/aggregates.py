@@ -0,0 +1,359 @@
+import pandas as pd
+import numpy as np
+import hashlib
+from modules.colaboracao import COLUNA_COLABORADORES, RedeColaboracao, agregar_colaboracoes
+from modules.derivadas import LABELS_ORCAMENTO, coluna_derivada
+
+# Dimensões do cubo; cada célula guarda estatísticas de todas as missões do grupo
+DIMENSOES = ['Country', 'Year', 'Mission Type', 'Budget Category']
+
+# Métricas numéricas e os nomes curtos usados nas tabelas agregadas
+METRICAS = {
+    'Budget (in Billion $)': 'orcamento',
+    'Success Rate (%)': 'sucesso',
+    'Duration (in Days)': 'duracao'
+}
+
+# Largura (bilhões $) das faixas finas de orçamento do mapa de densidade
+LARGURA_DENSIDADE_ORCAMENTO = 1
+
+def _regras_combinacao():
+    """Define como cada coluna do cubo é combinada entre blocos ou em roll-ups"""
+    regras = {'missoes': 'sum'}
+    for nome in METRICAS.values():
+        regras[f'{nome}_n'] = 'sum'
+        regras[f'{nome}_soma'] = 'sum'
+        regras[f'{nome}_soma2'] = 'sum'
+        regras[f'{nome}_min'] = 'min'
+        regras[f'{nome}_max'] = 'max'
+    return regras
+
+REGRAS = _regras_combinacao()
+
+# Colunas que podem ser subtraídas (usadas nas somas acumuladas por ano)
+ADITIVAS = [coluna for coluna, regra in REGRAS.items() if regra == 'sum']
+
+def _agregar_bloco(df):
+    """Agrupa um bloco de linhas pelas dimensões do cubo"""
+    # Estatísticas em float64 para não acumular erro quando as colunas são float32
+    valores = df[list(METRICAS)].astype('float64')
+    chaves = [df['Country'], df['Year'], df['Mission Type'],
+              coluna_derivada(df, 'Budget Category').rename('Budget Category')]
+
+    grupos = valores.groupby(chaves, observed=True, dropna=False)
+    quadrados = (valores ** 2).groupby(chaves, observed=True, dropna=False)
+
+    tabela = grupos.size().to_frame('missoes')
+    for coluna, nome in METRICAS.items():
+        tabela[f'{nome}_n'] = grupos[coluna].count()
+        tabela[f'{nome}_soma'] = grupos[coluna].sum()
+        tabela[f'{nome}_soma2'] = quadrados[coluna].sum()
+        tabela[f'{nome}_min'] = grupos[coluna].min()
+        tabela[f'{nome}_max'] = grupos[coluna].max()
+
+    # Níveis categóricos viram objetos para que blocos diferentes possam ser unidos
+    niveis = []
+    for dimensao in DIMENSOES:
+        nivel = tabela.index.get_level_values(dimensao)
+        if isinstance(nivel.dtype, pd.CategoricalDtype):
+            nivel = nivel.astype(object)
+        niveis.append(nivel)
+    tabela.index = pd.MultiIndex.from_arrays(niveis, names=DIMENSOES)
+    return tabela
+
+def _histograma_sucesso(df):
+    """Conta missões por faixa de orçamento, taxa de sucesso (arredondada) e ano"""
+    faixas = coluna_derivada(df, 'Budget Category')
+    sucesso = df['Success Rate (%)'].round()
+    histograma = df.groupby([faixas, sucesso, df['Year']], observed=True, dropna=False).size()
+    histograma.index = histograma.index.set_names(['Budget Category', 'Success Rate (%)', 'Year'])
+    return _sem_ausentes(histograma, ['Budget Category', 'Success Rate (%)'])
+
+def _histograma_densidade(df):
+    """Conta missões por faixa fina de orçamento, taxa de sucesso (arredondada) e ano"""
+    inicio_faixa = np.floor(df['Budget (in Billion $)'].astype('float64') / LARGURA_DENSIDADE_ORCAMENTO)
+    inicio_faixa = inicio_faixa * LARGURA_DENSIDADE_ORCAMENTO
+    sucesso = df['Success Rate (%)'].round()
+    histograma = df.groupby([inicio_faixa, sucesso, df['Year']], dropna=False).size()
+    histograma.index = histograma.index.set_names(['Budget Start', 'Success Rate (%)', 'Year'])
+    return _sem_ausentes(histograma, ['Budget Start', 'Success Rate (%)'])
+
+def _sem_ausentes(histograma, niveis):
+    """Descarta as contagens com valor ausente nos níveis dados (o ano ausente é mantido)"""
+    presentes = np.logical_and.reduce([histograma.index.get_level_values(n).notna() for n in niveis])
+    return histograma[presentes]
+
+def _somar_anos(agregado):
+    """Roll-up de um agregado auxiliar (histogramas, colaborações) sobre o nível 'Year'"""
+    niveis = [nome for nome in agregado.index.names if nome != 'Year']
+    return agregado.groupby(level=niveis, dropna=False).sum()
+
+def _no_intervalo(agregado, anos):
+    """Células de um agregado com o nível 'Year' dentro do intervalo (inclusivo)"""
+    ano = agregado.index.get_level_values('Year')
+    return agregado[(ano >= anos[0]) & (ano <= anos[1])]
+
+def _finalizar(resultado):
+    """Converte contagens para inteiro e deriva média e desvio padrão das somas"""
+    resultado['missoes'] = resultado['missoes'].astype('int64')
+    for nome in METRICAS.values():
+        n = resultado[f'{nome}_n'].astype('int64')
+        soma = resultado[f'{nome}_soma']
+        resultado[f'{nome}_n'] = n
+        resultado[f'{nome}_media'] = soma / n.replace(0, np.nan)
+
+        variancia = (resultado[f'{nome}_soma2'] - soma ** 2 / n.replace(0, np.nan)) / (n - 1).where(n > 1)
+        resultado[f'{nome}_desvio'] = np.sqrt(variancia.clip(lower=0))
+    return resultado
+
+class CuboMissoes:
+    """Cubo pré-agregado por país, ano, tipo de missão e faixa de orçamento
+
+    Cada célula guarda contagem, soma, soma dos quadrados, mínimo e máximo de
+    orçamento, taxa de sucesso e duração. Os gráficos são roll-ups desse cubo,
+    então o custo por rerun depende do número de grupos e não de linhas.
+    Blocos podem ser incorporados incrementalmente (modo streaming).
+    """
+
+    def __init__(self):
+        self.tabela = None
+        self.histograma_sucesso = None
+        self.densidade = None
+        self.colaboracoes = None
+        self.amostra = None
+        self._acumulado = None
+        self._rede = None
+        self._impressao_digital = None
+        self._anos_recorte = None
+
+    def adicionar_bloco(self, df):
+        """Incorpora um bloco de linhas já preparado ao cubo"""
+        return self.adicionar_agregados(
+            _agregar_bloco(df),
+            _histograma_sucesso(df),
+            _histograma_densidade(df),
+            agregar_colaboracoes(df) if COLUNA_COLABORADORES in df.columns else None,
+            df.head()
+        )
+
+    def adicionar_agregados(self, tabela, histograma, densidade, colaboracoes=None, amostra=None):
+        """Incorpora agregados parciais já calculados (de um bloco ou de uma consulta SQL)"""
+        if self.amostra is None:
+            self.amostra = amostra
+
+        if self.tabela is None:
+            self.tabela = tabela
+            self.histograma_sucesso = histograma
+            self.densidade = densidade
+            self.colaboracoes = colaboracoes
+        else:
+            self.tabela = (
+                pd.concat([self.tabela, tabela])
+                .groupby(level=DIMENSOES, dropna=False)
+                .agg(REGRAS)
+            )
+            self.histograma_sucesso = self.histograma_sucesso.add(histograma, fill_value=0)
+            self.densidade = self.densidade.add(densidade, fill_value=0)
+            if colaboracoes is not None:
+                self.colaboracoes = colaboracoes if self.colaboracoes is None else (
+                    self.colaboracoes.add(colaboracoes, fill_value=0)
+                )
+
+        # As somas acumuladas, a rede e a impressão digital são reconstruídas sob demanda
+        self._acumulado = None
+        self._rede = None
+        self._impressao_digital = None
+        return self
+
+    def adicionar_cubo(self, outro):
+        """Incorpora os agregados de outro cubo (ex.: de uma partição nova dos dados)"""
+        return self.adicionar_agregados(
+            outro.tabela, outro.histograma_sucesso, outro.densidade, outro.colaboracoes, outro.amostra
+        )
+
+    @property
+    def impressao_digital(self):
+        """Hash do conteúdo do cubo, usado como versão dos dados em caches"""
+        if self._impressao_digital is None:
+            sha = hashlib.sha256()
+            sha.update(pd.util.hash_pandas_object(self.tabela).to_numpy().tobytes())
+            sha.update(pd.util.hash_pandas_object(self.histograma_sucesso).to_numpy().tobytes())
+            sha.update(pd.util.hash_pandas_object(self.densidade).to_numpy().tobytes())
+            if self.colaboracoes is not None:
+                sha.update(pd.util.hash_pandas_object(self.colaboracoes).to_numpy().tobytes())
+            if self._anos_recorte is not None:
+                # Os roll-ups de um recorte vêm das somas acumuladas (sem mínimo e máximo)
+                sha.update(repr(self._anos_recorte).encode())
+            self._impressao_digital = sha.hexdigest()[:16]
+        return self._impressao_digital
+
+    @property
+    def total(self):
+        """Número total de missões no cubo"""
+        return int(self.tabela['missoes'].sum())
+
+    @property
+    def ano_min(self):
+        return self.tabela.index.get_level_values('Year').min()
+
+    @property
+    def ano_max(self):
+        return self.tabela.index.get_level_values('Year').max()
+
+    def _somas_acumuladas(self):
+        """Monta as somas acumuladas ao longo do ano para cada célula sem ano
+
+        Resultado: (anos, células, {coluna: matriz células x anos}).
+        """
+        if self._acumulado is None:
+            com_ano = self.tabela[self.tabela.index.get_level_values('Year').notna()]
+
+            acumulado = {}
+            anos = celulas = None
+            for coluna in ADITIVAS:
+                matriz = com_ano[coluna].unstack('Year', fill_value=0).sort_index(axis=1)
+                if anos is None:
+                    anos = matriz.columns.to_numpy()
+                    celulas = matriz.index
+                acumulado[coluna] = matriz.to_numpy().cumsum(axis=1)
+
+            self._acumulado = (anos, celulas, acumulado)
+        return self._acumulado
+
+    def _celulas_no_intervalo(self, ano_inicio, ano_fim):
+        """Estatísticas aditivas de cada célula no intervalo de anos, em O(1) por célula"""
+        anos, celulas, acumulado = self._somas_acumuladas()
+        fim = np.searchsorted(anos, ano_fim, side='right') - 1
+        inicio = np.searchsorted(anos, ano_inicio, side='left') - 1
+
+        dados = {}
+        for coluna, matriz in acumulado.items():
+            total = matriz[:, fim] if fim >= 0 else np.zeros(len(celulas))
+            anterior = matriz[:, inicio] if inicio >= 0 else np.zeros(len(celulas))
+            dados[coluna] = total - anterior
+        return pd.DataFrame(dados, index=celulas)
+
+    def agrupar(self, dimensoes, anos=None):
+        """Faz o roll-up do cubo nas dimensões pedidas, opcionalmente num intervalo de anos
+
+        Sem a dimensão 'Year', o intervalo é resolvido pelas somas acumuladas;
+        mínimo e máximo não são subtraíveis e nesse caso vêm como NaN, para que
+        o resultado tenha sempre as mesmas colunas.
+        """
+        if isinstance(dimensoes, str):
+            dimensoes = [dimensoes]
+
+        # Num recorte por anos (recortar_anos), os roll-ups sem 'Year' também
+        # saem das somas acumuladas, herdadas do cubo de origem
+        if self._anos_recorte is not None and 'Year' not in dimensoes:
+            inicio, fim = anos or self._anos_recorte
+            anos = (max(inicio, self._anos_recorte[0]), min(fim, self._anos_recorte[1]))
+
+        if anos is None:
+            resultado = self.tabela.groupby(level=dimensoes).agg(REGRAS)
+        elif 'Year' in dimensoes:
+            resultado = _no_intervalo(self.tabela, anos).groupby(level=dimensoes).agg(REGRAS)
+        else:
+            celulas = self._celulas_no_intervalo(*anos)
+            resultado = celulas.groupby(level=dimensoes).sum()
+            resultado = resultado[resultado['missoes'] > 0].reindex(columns=list(REGRAS))
+
+        return _finalizar(resultado).reset_index()
+
+    def por_pais(self, anos=None):
+        return self.agrupar('Country', anos)
+
+    def por_tipo(self, anos=None):
+        return self.agrupar('Mission Type', anos)
+
+    def por_ano(self, anos=None):
+        return self.agrupar('Year', anos)
+
+    def por_ano_tipo(self, anos=None):
+        return self.agrupar(['Year', 'Mission Type'], anos)
+
+    def por_faixa_orcamento(self, anos=None):
+        return self.agrupar('Budget Category', anos)
+
+    def recortar_anos(self, anos, amostra=None):
+        """Cubo restrito ao intervalo de anos (inclusivo), sem reler nenhuma linha
+
+        Fatia o nível 'Year' da tabela e dos agregados auxiliares, então o custo
+        depende do número de células. As somas acumuladas deste cubo continuam
+        válidas no recorte e resolvem os roll-ups sem 'Year' (ver agrupar).
+        """
+        recorte = CuboMissoes()
+        recorte.tabela = _no_intervalo(self.tabela, anos)
+        recorte.histograma_sucesso = _no_intervalo(self.histograma_sucesso, anos)
+        recorte.densidade = _no_intervalo(self.densidade, anos)
+        if self.colaboracoes is not None:
+            recorte.colaboracoes = _no_intervalo(self.colaboracoes, anos)
+        recorte.amostra = amostra
+        recorte._acumulado = self._somas_acumuladas()
+        recorte._anos_recorte = tuple(anos)
+        return recorte
+
+    def estatisticas_sucesso_por_faixa(self):
+        """Calcula quartis e limites do boxplot de sucesso para cada faixa de orçamento"""
+        histograma = _somar_anos(self.histograma_sucesso)
+        estatisticas = []
+        for faixa in LABELS_ORCAMENTO:
+            if faixa not in histograma.index.get_level_values(0):
+                continue
+
+            contagens = histograma.loc[faixa].sort_index()
+            contagens = contagens[contagens > 0]
+            if contagens.empty:
+                continue
+
+            valores = contagens.index.to_numpy(dtype=float)
+            acumulado = contagens.to_numpy().cumsum()
+            total = acumulado[-1]
+
+            def quantil(q):
+                posicao = int(np.floor(q * (total - 1))) + 1
+                return valores[np.searchsorted(acumulado, posicao)]
+
+            q1, mediana, q3 = quantil(0.25), quantil(0.5), quantil(0.75)
+            iqr = q3 - q1
+            dentro = valores[(valores >= q1 - 1.5 * iqr) & (valores <= q3 + 1.5 * iqr)]
+
+            estatisticas.append({
+                'label': faixa,
+                'med': mediana,
+                'q1': q1,
+                'q3': q3,
+                'whislo': dentro.min(),
+                'whishi': dentro.max(),
+                'fliers': valores[(valores < dentro.min()) | (valores > dentro.max())],
+                'n': int(total)
+            })
+        return estatisticas
+
+    def contagens_densidade(self):
+        """Número de missões (não nulo) por faixa fina de orçamento e taxa de sucesso, somando os anos"""
+        contagens = _somar_anos(self.densidade)
+        return contagens[contagens > 0]
+
+    def rede_colaboracao(self):
+        """Rede de colaboração entre países (None sem a coluna de colaboradores)"""
+        if self._rede is None and self.colaboracoes is not None:
+            self._rede = RedeColaboracao(_somar_anos(self.colaboracoes))
+        return self._rede
+
+    def calcular_derivados(self):
+        """Calcula já a impressão digital, a rede de colaboração e as somas acumuladas
+
+        Os carregadores em st.cache_data chamam antes de retornar: o cubo é
+        serializado com esses resultados, e a cópia que cada rerun recebe não
+        precisa refazer a interpretação das listas de colaboradores nem as
+        somas usadas pelos recortes por ano.
+        """
+        self.impressao_digital
+        self.rede_colaboracao()
+        self._somas_acumuladas()
+        return self
+
+def construir_cubo(df):
+    """Constrói o cubo a partir de um DataFrame completo"""
+    return CuboMissoes().adicionar_bloco(df)
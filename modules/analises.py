@@ -0,0 +1,293 @@
+import inspect
+import threading
+import functools
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from modules.aggregates import LARGURA_DENSIDADE_ORCAMENTO
+from modules.derivadas import LABELS_ORCAMENTO
+from modules.instrumentacao import etapa, registrar_cache
+
+# Camada de análises: as tabelas agregadas exibidas pelas seções e usadas pelo
+# relatório PDF, calculadas a partir do cubo e sem nenhuma dependência do
+# Streamlit. Cada função é memorizada pela impressão digital do cubo (a versão
+# dos dados, já com os filtros aplicados) e pelos parâmetros, num cache
+# compartilhado pelo processo: o relatório gerado logo depois de a página ser
+# exibida reaproveita as mesmas tabelas, sem nenhuma nova agregação.
+
+# Número máximo de tabelas memorizadas (cada uma tem no máximo algumas centenas de linhas)
+LIMITE_TABELAS = 512
+
+_AUSENTE = object()
+
+class MemoriaAnalises:
+    """Cache LRU das tabelas analíticas, limitado pelo número de itens"""
+
+    def __init__(self, limite=LIMITE_TABELAS):
+        self.limite = limite
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, chave):
+        with self._lock:
+            resultado = self._itens.get(chave, _AUSENTE)
+            if resultado is _AUSENTE:
+                self.falhas += 1
+            else:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+            return resultado
+
+    def guardar(self, chave, resultado):
+        with self._lock:
+            self._itens[chave] = resultado
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.limite:
+                self._itens.popitem(last=False)
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+
+memoria = MemoriaAnalises()
+
+def analise(funcao):
+    """Decorador que memoriza uma tabela analítica calculada a partir do cubo
+
+    A chave combina a impressão digital do cubo, o nome da função e todos os
+    parâmetros (com os valores padrão preenchidos), de modo que chamadas
+    posicionais e nomeadas compartilham o resultado. O resultado é
+    compartilhado entre sessões e não deve ser alterado por quem o recebe.
+    """
+    nome = f"{funcao.__module__}.{funcao.__qualname__}"
+    assinatura = inspect.signature(funcao)
+
+    @functools.wraps(funcao)
+    def wrapper(cubo, *args, **kwargs):
+        argumentos = assinatura.bind(cubo, *args, **kwargs)
+        argumentos.apply_defaults()
+        parametros = tuple((k, repr(v)) for k, v in argumentos.arguments.items() if k != 'cubo')
+        chave = (cubo.impressao_digital, nome, parametros)
+
+        resultado = memoria.obter(chave)
+        registrar_cache(resultado is not _AUSENTE)
+        if resultado is _AUSENTE:
+            with etapa(f"analise.{funcao.__qualname__}"):
+                resultado = funcao(cubo, *args, **kwargs)
+            memoria.guardar(chave, resultado)
+        return resultado
+
+    return wrapper
+
+# Roll-ups do cubo compartilhados pelas tabelas abaixo
+
+@analise
+def por_pais(cubo):
+    return cubo.por_pais()
+
+@analise
+def por_tipo(cubo):
+    return cubo.por_tipo()
+
+@analise
+def por_ano(cubo):
+    return cubo.por_ano()
+
+@analise
+def por_ano_tipo(cubo):
+    return cubo.por_ano_tipo()
+
+@analise
+def por_faixa_orcamento(cubo):
+    return cubo.por_faixa_orcamento()
+
+@analise
+def dados_general_statistics(cubo):
+    """Totais do conjunto exibidos na introdução do relatório"""
+    tabela = cubo.tabela
+    return {
+        'missoes': cubo.total,
+        'ano_min': cubo.ano_min,
+        'ano_max': cubo.ano_max,
+        'paises': tabela.index.get_level_values('Country').nunique(),
+        'tipos': tabela.index.get_level_values('Mission Type').nunique(),
+        'sucesso_medio': tabela['sucesso_soma'].sum() / tabela['sucesso_n'].sum(),
+        'orcamento_medio': tabela['orcamento_soma'].sum() / tabela['orcamento_n'].sum()
+    }
+
+# Análise por país
+
+@analise
+def dados_top_countries_by_missions(cubo, top_n=10):
+    """Tabela dos principais países por número de missões"""
+    # Contagem de missões por país
+    country_missions = por_pais(cubo)[['Country', 'missoes']]
+    country_missions.columns = ['País', 'Número de Missões']
+    return country_missions.sort_values('Número de Missões', ascending=False).head(top_n)
+
+@analise
+def dados_top_countries_by_budget(cubo, top_n=10, ordenar_por='Orçamento Total (Bilhões $)'):
+    """Tabela dos principais países por orçamento total (ou pela coluna em ordenar_por)"""
+    # Calculando orçamento total e médio por país
+    country_budget = por_pais(cubo)[['Country', 'orcamento_soma', 'orcamento_media']]
+    country_budget.columns = ['País', 'Orçamento Total (Bilhões $)', 'Orçamento Médio (Bilhões $)']
+    
+    # Ordenando por orçamento total
+    return country_budget.sort_values(ordenar_por, ascending=False).head(top_n)
+
+@analise
+def dados_missions_vs_budget(cubo, min_missoes=10):
+    """Tabela de número de missões e orçamento médio por país"""
+    # Preparando os dados agregados
+    country_data = por_pais(cubo)[['Country', 'missoes', 'orcamento_media']]
+    country_data.columns = ['País', 'Número de Missões', 'Orçamento Médio (Bilhões $)']
+    
+    # Filtrando para mostrar apenas países com pelo menos 10 missões (para legibilidade)
+    return country_data[country_data['Número de Missões'] >= min_missoes].sort_values('Número de Missões', ascending=False)
+
+# Análise por tipo de missão
+
+@analise
+def dados_mission_types_distribution(cubo, top_n=8):
+    """Tabela dos tipos de missão mais frequentes"""
+    # Contagem de missões por tipo
+    mission_counts = por_tipo(cubo)[['Mission Type', 'missoes']]
+    mission_counts.columns = ['Tipo de Missão', 'Contagem']
+        
+    # Limitando aos principais tipos para legibilidade
+    return mission_counts.sort_values('Contagem', ascending=False).head(top_n)
+
+@analise
+def dados_budget_by_mission_type(cubo, min_missoes=10):
+    """Tabela do orçamento médio por tipo de missão"""
+    # Calculando estatísticas de orçamento por tipo de missão
+    budget_by_type = por_tipo(cubo)[['Mission Type', 'orcamento_media', 'orcamento_n']]
+    budget_by_type.columns = ['Tipo de Missão', 'Orçamento Médio (Bilhões $)', 'Contagem']
+    
+    # Ordenando por contagem para manter consistência com o gráfico anterior
+    # e filtrando para tipos com um mínimo de missões para relevância estatística
+    return budget_by_type[budget_by_type['Contagem'] >= min_missoes].sort_values('Contagem', ascending=False)
+
+@analise
+def dados_mission_types_evolution(cubo, top_n=5):
+    """Tabela com a contagem anual dos principais tipos de missão"""
+    # Agrupando dados por ano e tipo de missão
+    # Selecionando apenas os tipos de missão mais comuns para legibilidade
+    top_types = por_tipo(cubo).nlargest(top_n, 'missoes')['Mission Type'].tolist()
+    
+    mission_evolution = por_ano_tipo(cubo)[['Year', 'Mission Type', 'missoes']]
+    mission_evolution = mission_evolution[mission_evolution['Mission Type'].isin(top_types)]
+    mission_evolution.columns = ['Year', 'Mission Type', 'Contagem']
+    return mission_evolution
+
+# Análise de taxas de sucesso
+
+@analise
+def dados_success_rate_by_country(cubo, top_n=10, min_missoes=10):
+    """Tabela da taxa de sucesso média por país"""
+    # Calculando taxa de sucesso média por país
+    success_by_country = por_pais(cubo)[['Country', 'sucesso_media', 'sucesso_n']]
+    success_by_country.columns = ['País', 'Taxa de Sucesso Média (%)', 'Número de Missões']
+    
+    # Filtrando para países com um mínimo de missões
+    filtered_success = success_by_country[success_by_country['Número de Missões'] >= min_missoes]
+    
+    # Ordenando por taxa de sucesso
+    return filtered_success.sort_values('Taxa de Sucesso Média (%)', ascending=False).head(top_n)
+
+@analise
+def dados_success_rate_by_mission_type(cubo, top_n=10, min_missoes=5):
+    """Tabela da taxa de sucesso média por tipo de missão"""
+    # Calculando taxa de sucesso média por tipo de missão
+    success_by_type = por_tipo(cubo)[['Mission Type', 'sucesso_media', 'sucesso_n']]
+    success_by_type.columns = ['Tipo de Missão', 'Taxa de Sucesso Média (%)', 'Número de Missões']
+    
+    # Filtrando para tipos com um mínimo de missões
+    filtered_success = success_by_type[success_by_type['Número de Missões'] >= min_missoes]
+    
+    # Ordenando por taxa de sucesso
+    return filtered_success.sort_values('Taxa de Sucesso Média (%)', ascending=False).head(top_n)
+
+@analise
+def dados_success_rate_evolution(cubo):
+    """Tabela da taxa de sucesso média e do volume de missões por ano"""
+    # Calculando taxa de sucesso média por ano
+    success_by_year = por_ano(cubo)[['Year', 'sucesso_media', 'sucesso_n']]
+    success_by_year.columns = ['Ano', 'Taxa de Sucesso Média (%)', 'Número de Missões']
+    return success_by_year
+
+@analise
+def dados_success_rate_by_budget(cubo):
+    """Taxa de sucesso média e número de missões em cada faixa de orçamento (inclusive as vazias)"""
+    por_faixa = por_faixa_orcamento(cubo).set_index('Budget Category').reindex(LABELS_ORCAMENTO)
+    return pd.DataFrame({
+        'Categoria de Orçamento': LABELS_ORCAMENTO,
+        'Taxa de Sucesso Média': por_faixa['sucesso_media'].to_numpy(),
+        'Número de Missões': por_faixa['sucesso_n'].fillna(0).astype('int64').to_numpy()
+    })
+
+@analise
+def dados_success_quartiles_by_budget(cubo):
+    """Quartis e limites do boxplot de sucesso em cada faixa de orçamento"""
+    return cubo.estatisticas_sucesso_por_faixa()
+
+@analise
+def dados_budget_success_density_cells(cubo):
+    """Células não vazias do mapa de densidade: faixa fina de orçamento, taxa de sucesso e número de missões"""
+    celulas = cubo.contagens_densidade().rename('Número de Missões').reset_index()
+    celulas['Budget End'] = celulas['Budget Start'] + LARGURA_DENSIDADE_ORCAMENTO
+    celulas['Success End'] = celulas['Success Rate (%)'] + 1
+    return celulas
+
+@analise
+def dados_budget_success_density(cubo):
+    """Bordas e matriz de contagens orçamento x taxa de sucesso do mapa de densidade
+
+    Retorna (bordas de orçamento, bordas de sucesso, matriz sucesso x orçamento),
+    no formato esperado por pcolormesh.
+    """
+    celulas = dados_budget_success_density_cells(cubo)
+    inicios = np.arange(celulas['Budget Start'].min(), celulas['Budget Start'].max() + LARGURA_DENSIDADE_ORCAMENTO / 2,
+                        LARGURA_DENSIDADE_ORCAMENTO)
+    taxas = np.arange(celulas['Success Rate (%)'].min(), celulas['Success Rate (%)'].max() + 1)
+    matriz = (celulas.set_index(['Success Rate (%)', 'Budget Start'])['Número de Missões']
+              .unstack('Budget Start', fill_value=0)
+              .reindex(index=taxas, columns=inicios, fill_value=0))
+
+    bordas_orcamento = np.append(inicios, inicios[-1] + LARGURA_DENSIDADE_ORCAMENTO)
+    bordas_sucesso = np.append(taxas, taxas[-1] + 1) - 0.5
+    return bordas_orcamento, bordas_sucesso, matriz.to_numpy()
+
+# Colaboração internacional
+
+@analise
+def dados_collaboration_network(cubo, max_arestas=45):
+    """Posições dos países num círculo e as arestas com mais missões em comum"""
+    rede = cubo.rede_colaboracao()
+
+    # Layout circular, com os países mais centrais lado a lado
+    nos = rede.centralidade.copy()
+    angulos = np.linspace(0, 2 * np.pi, len(nos), endpoint=False)
+    nos['x'] = np.cos(angulos)
+    nos['y'] = np.sin(angulos)
+
+    posicoes = nos.set_index('País')[['x', 'y']]
+    arestas = rede.arestas.head(max_arestas)[['País A', 'País B', 'missoes', 'taxa_sucesso']].copy()
+    arestas.columns = ['País A', 'País B', 'Missões em Comum', 'Taxa de Sucesso Média (%)']
+    arestas[['x', 'y']] = posicoes.loc[arestas['País A']].to_numpy()
+    arestas[['x2', 'y2']] = posicoes.loc[arestas['País B']].to_numpy()
+    return nos, arestas
+
+@analise
+def dados_collaboration_heatmap(cubo):
+    """Matriz país x país de missões em comum, sem a diagonal"""
+    matriz = cubo.rede_colaboracao().matriz_dataframe()
+    np.fill_diagonal(matriz.values, np.nan)
+    return matriz
+
+@analise
+def dados_solo_vs_collaborative(cubo):
+    """Missões e taxa de sucesso média de missões solo e colaborativas"""
+    return cubo.rede_colaboracao().solo_vs_colaborativa
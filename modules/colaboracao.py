@@ -0,0 +1,145 @@
+import pandas as pd
+import numpy as np
+
+# Rede de colaboração entre países a partir da coluna "Collaborating Countries".
+# O cubo guarda, para cada combinação distinta (país, lista de colaboradores, ano), o
+# número de missões, a soma das taxas de sucesso e quantas missões têm taxa (as
+# médias ignoram taxas ausentes, como o mean do pandas); a lista de texto só é
+# interpretada aqui, uma vez por combinação distinta e nunca por linha.
+
+COLUNA_COLABORADORES = 'Collaborating Countries'
+
+def agregar_colaboracoes(df):
+    """Conta missões e soma as taxas de sucesso por país, lista de colaboradores e ano"""
+    sucesso = df['Success Rate (%)'].astype('float64')
+    grupos = sucesso.groupby([df['Country'], df[COLUNA_COLABORADORES], df['Year']], observed=True, dropna=False)
+    tabela = pd.DataFrame({'missoes': grupos.size(), 'sucesso_n': grupos.count(), 'sucesso_soma': grupos.sum()})
+
+    # Níveis categóricos viram objetos para que blocos diferentes possam ser unidos
+    tabela.index = pd.MultiIndex.from_arrays(
+        [tabela.index.get_level_values(i).astype(object) for i in range(2)] + [tabela.index.get_level_values(2)],
+        names=['Country', COLUNA_COLABORADORES, 'Year']
+    )
+    return tabela
+
+def contar_colaboradores(paises, colaboradores):
+    """Número de colaboradores distintos, sem contar o próprio país, de cada par (país, lista)
+
+    Recebe sequências alinhadas; uma missão é solo quando o resultado é zero,
+    o mesmo critério usado por RedeColaboracao.
+    """
+    paises = pd.Series(np.asarray(paises, dtype=object))
+    membros = pd.Series(np.asarray(colaboradores, dtype=object)).str.split(',').explode().str.strip()
+    validos = membros.notna() & (membros != '') & (membros != paises.reindex(membros.index))
+    distintos = pd.DataFrame({'posicao': membros.index[validos], 'pais': membros[validos]}).drop_duplicates()
+    return distintos.groupby('posicao').size().reindex(range(len(paises)), fill_value=0).to_numpy()
+
+class RedeColaboracao:
+    """Rede de países ligados por missões em comum
+
+    Atributos:
+      paises: nomes dos países, na ordem dos códigos inteiros
+      arestas: lista de arestas (códigos 'origem' < 'destino') com missões e taxa de sucesso
+      matriz: matriz país x país com o número de missões em comum (diagonal = participações)
+      centralidade: grau, grau ponderado e centralidades por país
+      solo_vs_colaborativa: missões e taxa de sucesso de missões solo e colaborativas
+    """
+
+    def __init__(self, colaboracoes):
+        combinacoes = colaboracoes.reset_index()
+        combinacoes['combinacao'] = np.arange(len(combinacoes))
+
+        # Participantes de cada combinação: o país da missão mais os colaboradores
+        colaboradores = combinacoes[COLUNA_COLABORADORES].str.split(',')
+        membros = pd.concat([
+            pd.DataFrame({'combinacao': combinacoes['combinacao'], 'pais': combinacoes['Country']}),
+            pd.DataFrame({'combinacao': combinacoes['combinacao'], 'pais': colaboradores}).explode('pais')
+        ])
+        membros['pais'] = membros['pais'].str.strip()
+        membros = membros[membros['pais'].notna() & (membros['pais'] != '')].drop_duplicates()
+
+        codigos, paises = pd.factorize(membros['pais'], sort=True)
+        membros['codigo'] = codigos
+        self.paises = list(paises)
+        n_paises = len(self.paises)
+
+        missoes = combinacoes['missoes'].to_numpy(dtype='float64')
+        sucesso_n = combinacoes['sucesso_n'].to_numpy(dtype='float64')
+        sucesso_soma = combinacoes['sucesso_soma'].to_numpy(dtype='float64')
+        combinacao = membros['combinacao'].to_numpy()
+        codigo = membros['codigo'].to_numpy()
+
+        # Missões solo: o único participante é o próprio país da missão
+        participantes = np.bincount(combinacao, minlength=len(combinacoes))
+        solo = participantes <= 1
+        self.solo_vs_colaborativa = pd.DataFrame({
+            'Tipo': ['Solo', 'Colaborativa'],
+            'Missões': [missoes[solo].sum(), missoes[~solo].sum()],
+            'Com Taxa': [sucesso_n[solo].sum(), sucesso_n[~solo].sum()],
+            'Soma Sucesso': [sucesso_soma[solo].sum(), sucesso_soma[~solo].sum()]
+        })
+        self.solo_vs_colaborativa['Taxa de Sucesso Média (%)'] = (
+            self.solo_vs_colaborativa['Soma Sucesso'] / self.solo_vs_colaborativa['Com Taxa'].replace(0, np.nan)
+        )
+        self.solo_vs_colaborativa = self.solo_vs_colaborativa.drop(columns=['Com Taxa', 'Soma Sucesso'])
+
+        # Pares de participantes de cada combinação (lista de arestas com códigos inteiros)
+        pares = membros[['combinacao', 'codigo']].merge(membros[['combinacao', 'codigo']], on='combinacao')
+        pares = pares[pares['codigo_x'] < pares['codigo_y']]
+        arestas = pd.DataFrame({
+            'origem': pares['codigo_x'].to_numpy(),
+            'destino': pares['codigo_y'].to_numpy(),
+            'missoes': missoes[pares['combinacao'].to_numpy()],
+            'sucesso_n': sucesso_n[pares['combinacao'].to_numpy()],
+            'sucesso_soma': sucesso_soma[pares['combinacao'].to_numpy()]
+        }).groupby(['origem', 'destino'], as_index=False).sum()
+        arestas['taxa_sucesso'] = arestas['sucesso_soma'] / arestas['sucesso_n'].replace(0, np.nan)
+        arestas['País A'] = [self.paises[i] for i in arestas['origem']]
+        arestas['País B'] = [self.paises[i] for i in arestas['destino']]
+        self.arestas = arestas.sort_values('missoes', ascending=False, ignore_index=True)
+
+        # Matriz simétrica de missões em comum; a diagonal guarda as participações
+        participacoes = np.bincount(codigo, weights=missoes[combinacao], minlength=n_paises)
+        com_taxa = np.bincount(codigo, weights=sucesso_n[combinacao], minlength=n_paises)
+        sucesso_participacoes = np.bincount(codigo, weights=sucesso_soma[combinacao], minlength=n_paises)
+        self.matriz = np.zeros((n_paises, n_paises))
+        np.add.at(self.matriz, (arestas['origem'], arestas['destino']), arestas['missoes'])
+        self.matriz += self.matriz.T
+        self.matriz[np.diag_indices(n_paises)] = participacoes
+
+        fora_diagonal = self.matriz - np.diag(participacoes)
+        grau = (fora_diagonal > 0).sum(axis=1)
+        self.centralidade = pd.DataFrame({
+            'País': self.paises,
+            'Missões': participacoes,
+            'Parceiros': grau,
+            'Missões em Parceria': fora_diagonal.sum(axis=1),
+            'Centralidade de Grau': grau / max(n_paises - 1, 1),
+            'Centralidade de Autovetor': _centralidade_autovetor(fora_diagonal),
+            'Taxa de Sucesso Média (%)': sucesso_participacoes / np.where(com_taxa > 0, com_taxa, np.nan)
+        }).sort_values('Centralidade de Autovetor', ascending=False, ignore_index=True)
+
+    def matriz_dataframe(self):
+        """Cópia da matriz de missões em comum rotulada pelos nomes dos países
+
+        A rede é compartilhada pelas sessões: quem recebe o DataFrame pode
+        alterá-lo (ex.: apagar a diagonal) sem mexer nas participações.
+        """
+        return pd.DataFrame(self.matriz.copy(), index=self.paises, columns=self.paises)
+
+def _centralidade_autovetor(matriz, iteracoes=200, tolerancia=1e-9):
+    """Centralidade de autovetor por iteração de potência, normalizada para máximo 1"""
+    n = len(matriz)
+    if n == 0 or not matriz.any():
+        return np.zeros(n)
+
+    vetor = np.ones(n) / n
+    for _ in range(iteracoes):
+        # Somar o próprio vetor evita oscilação em grafos bipartidos
+        novo = matriz @ vetor + vetor
+        novo /= np.linalg.norm(novo)
+        if np.abs(novo - vetor).max() < tolerancia:
+            vetor = novo
+            break
+        vetor = novo
+    return vetor / vetor.max()
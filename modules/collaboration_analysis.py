@@ -0,0 +1,213 @@
+import streamlit as st
+from modules.utils import create_text_area, fragmento
+from modules.figure_cache import grafico_em_cache, exibir_grafico
+from modules.figuras import nova_figura
+from modules.instrumentacao import medido
+from modules.analises import (
+    dados_collaboration_network, dados_collaboration_heatmap, dados_solo_vs_collaborative
+)
+
+@fragmento
+@medido
+def show_collaboration_analysis(cubo):
+    """Exibe a análise da rede de colaboração entre países"""
+    st.markdown("<h2 class='section-header'>Colaboração Internacional</h2>", unsafe_allow_html=True)
+
+    if cubo.rede_colaboracao() is None:
+        st.warning("A coluna 'Collaborating Countries' não está disponível nestes dados.")
+        return
+
+    # Espaço para explicação sobre colaboração
+    collaboration_explanation = create_text_area(
+        "sua explicação sobre colaboração internacional",
+        """
+        Esta seção analisa a rede de colaboração entre países a partir dos colaboradores de cada missão.
+        Países ligados por mais missões em comum aparecem mais próximos do centro da rede, e a
+        comparação entre missões solo e colaborativas mostra se a cooperação está associada a
+        taxas de sucesso maiores.
+        """
+    )
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Rede de colaboração
+        show_collaboration_network(cubo)
+
+    with col2:
+        # Matriz de missões em comum
+        show_collaboration_heatmap(cubo)
+
+    # Missões solo x colaborativas
+    show_solo_vs_collaborative(cubo)
+
+    # Centralidade de cada país na rede
+    show_collaboration_centrality(cubo)
+
+@medido
+def show_collaboration_network(cubo, max_arestas=45):
+    """Exibe a rede de colaboração entre países"""
+    st.subheader("Rede de Colaboração entre Países")
+    exibir_grafico(cubo, plot_collaboration_network, vega_collaboration_network, max_arestas=max_arestas)
+
+@grafico_em_cache
+def plot_collaboration_network(cubo, max_arestas=45):
+    """Grafo circular: espessura das arestas = missões em comum, cor dos nós = sucesso"""
+    nos, arestas = dados_collaboration_network(cubo, max_arestas)
+
+    fig, ax = nova_figura(figsize=(10, 10))
+
+    # Arestas com espessura proporcional ao número de missões em comum
+    peso_min, peso_max = arestas['Missões em Comum'].min(), arestas['Missões em Comum'].max()
+    for _, aresta in arestas.iterrows():
+        peso = (aresta['Missões em Comum'] - peso_min) / (peso_max - peso_min) if peso_max > peso_min else 1
+        ax.plot([aresta['x'], aresta['x2']], [aresta['y'], aresta['y2']],
+                color='steelblue', linewidth=0.5 + 5 * peso, alpha=0.15 + 0.6 * peso, zorder=1)
+
+    # Nós com tamanho proporcional às participações e cor pela taxa de sucesso
+    pontos = ax.scatter(nos['x'], nos['y'], s=300 + 1500 * nos['Missões'] / nos['Missões'].max(),
+                        c=nos['Taxa de Sucesso Média (%)'], cmap='viridis', edgecolors='black', zorder=2)
+    for _, no in nos.iterrows():
+        ax.annotate(no['País'], (no['x'], no['y']), xytext=(no['x'] * 1.25, no['y'] * 1.25),
+                    ha='center', va='center', fontsize=11)
+    fig.colorbar(pontos, ax=ax, shrink=0.7, label='Taxa de Sucesso Média (%)')
+
+    ax.set_title('Rede de Colaboração entre Países', fontsize=14)
+    ax.set_xlim(-1.4, 1.4)
+    ax.set_ylim(-1.4, 1.4)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    fig.tight_layout()
+
+    return fig
+
+@medido
+def show_collaboration_heatmap(cubo):
+    """Exibe a matriz de missões em comum entre países"""
+    st.subheader("Missões em Comum entre Países")
+    exibir_grafico(cubo, plot_collaboration_heatmap, vega_collaboration_heatmap)
+
+@grafico_em_cache
+def plot_collaboration_heatmap(cubo):
+    """Mapa de calor das missões em comum entre cada par de países"""
+    import seaborn as sns
+    matriz = dados_collaboration_heatmap(cubo)
+
+    fig, ax = nova_figura(figsize=(10, 8))
+
+    sns.heatmap(matriz, annot=len(matriz) <= 15, fmt='.0f', cmap='YlGnBu',
+                cbar_kws={'label': 'Missões em Comum'}, ax=ax)
+
+    ax.set_title('Missões em Comum entre Países', fontsize=14)
+    ax.set_xlabel('')
+    ax.set_ylabel('')
+    fig.tight_layout()
+
+    return fig
+
+@medido
+def show_solo_vs_collaborative(cubo):
+    """Exibe a comparação entre missões solo e colaborativas"""
+    st.subheader("Missões Solo x Colaborativas")
+    exibir_grafico(cubo, plot_solo_vs_collaborative, vega_solo_vs_collaborative)
+
+    st.markdown("""
+    **Observação**: Missões solo são aquelas em que o único participante é o próprio país responsável.
+    A diferença entre as taxas médias de sucesso indica se a cooperação internacional está associada
+    a melhores resultados nestes dados.
+    """)
+
+@grafico_em_cache
+def plot_solo_vs_collaborative(cubo):
+    """Barras da taxa de sucesso média de missões solo e colaborativas"""
+    import seaborn as sns
+    comparacao = dados_solo_vs_collaborative(cubo)
+
+    fig, ax = nova_figura(figsize=(10, 4))
+
+    bars = ax.barh(comparacao['Tipo'], comparacao['Taxa de Sucesso Média (%)'].fillna(0),
+                   color=sns.color_palette('Set2', len(comparacao)))
+
+    # Adicionando taxa e número de missões ao lado de cada barra
+    for bar, (_, linha) in zip(bars, comparacao.iterrows()):
+        ax.text(bar.get_width() + 1, bar.get_y() + bar.get_height()/2,
+                f"{linha['Taxa de Sucesso Média (%)']:.1f}% (n={linha['Missões']:.0f})",
+                ha='left', va='center')
+
+    ax.set_title('Taxa de Sucesso Média: Missões Solo x Colaborativas', fontsize=14)
+    ax.set_xlabel('Taxa de Sucesso Média (%)')
+    ax.set_xlim(0, 100)
+    fig.tight_layout()
+
+    return fig
+
+@medido
+def show_collaboration_centrality(cubo):
+    """Exibe a tabela de centralidade dos países na rede"""
+    st.subheader("Centralidade na Rede de Colaboração")
+    st.dataframe(
+        cubo.rede_colaboracao().centralidade.style.format({
+            'Missões': '{:.0f}',
+            'Missões em Parceria': '{:.0f}',
+            'Centralidade de Grau': '{:.2f}',
+            'Centralidade de Autovetor': '{:.2f}',
+            'Taxa de Sucesso Média (%)': '{:.1f}'
+        }),
+        hide_index=True
+    )
+
+def vega_collaboration_network(cubo, max_arestas=45):
+    """Versão Vega-Lite da rede de colaboração"""
+    import altair as alt
+    nos, arestas = dados_collaboration_network(cubo, max_arestas)
+    eixo = dict(axis=None, scale=alt.Scale(domain=[-1.4, 1.4]))
+
+    linhas = alt.Chart(arestas).mark_rule(color='steelblue').encode(
+        x=alt.X('x:Q', **eixo), y=alt.Y('y:Q', **eixo), x2='x2:Q', y2='y2:Q',
+        strokeWidth=alt.StrokeWidth('Missões em Comum:Q', scale=alt.Scale(range=[0.5, 6], zero=False), legend=None),
+        opacity=alt.Opacity('Missões em Comum:Q', scale=alt.Scale(range=[0.15, 0.75], zero=False), legend=None),
+        tooltip=['País A:N', 'País B:N', 'Missões em Comum:Q',
+                 alt.Tooltip('Taxa de Sucesso Média (%):Q', format='.1f')]
+    )
+    base_nos = alt.Chart(nos).encode(x=alt.X('x:Q', **eixo), y=alt.Y('y:Q', **eixo))
+    circulos = base_nos.mark_circle(stroke='black', opacity=1).encode(
+        size=alt.Size('Missões:Q', scale=alt.Scale(range=[300, 1800]), legend=None),
+        color=alt.Color('Taxa de Sucesso Média (%):Q', scale=alt.Scale(scheme='viridis')),
+        tooltip=['País:N', alt.Tooltip('Missões:Q', format='.0f'), 'Parceiros:Q',
+                 alt.Tooltip('Centralidade de Autovetor:Q', format='.2f'),
+                 alt.Tooltip('Taxa de Sucesso Média (%):Q', format='.1f')]
+    )
+    rotulos = base_nos.mark_text(dy=-22, fontSize=12).encode(text='País:N')
+
+    return (linhas + circulos + rotulos).properties(title='Rede de Colaboração entre Países', height=500)
+
+def vega_collaboration_heatmap(cubo):
+    """Versão Vega-Lite do mapa de calor de missões em comum"""
+    import altair as alt
+    matriz = dados_collaboration_heatmap(cubo)
+    celulas = matriz.rename_axis(index='País A', columns='País B').stack().rename('Missões em Comum').reset_index()
+
+    return alt.Chart(celulas, title='Missões em Comum entre Países').mark_rect().encode(
+        x=alt.X('País B:N', title=None),
+        y=alt.Y('País A:N', title=None),
+        color=alt.Color('Missões em Comum:Q', scale=alt.Scale(scheme='yellowgreenblue')),
+        tooltip=['País A:N', 'País B:N', alt.Tooltip('Missões em Comum:Q', format='.0f')]
+    ).properties(height=500)
+
+def vega_solo_vs_collaborative(cubo):
+    """Versão Vega-Lite da comparação entre missões solo e colaborativas"""
+    import altair as alt
+    base = alt.Chart(
+        dados_solo_vs_collaborative(cubo),
+        title='Taxa de Sucesso Média: Missões Solo x Colaborativas'
+    ).encode(
+        x=alt.X('Taxa de Sucesso Média (%):Q', scale=alt.Scale(domain=[0, 100])),
+        y=alt.Y('Tipo:N', title=None)
+    )
+    barras = base.mark_bar().encode(
+        color=alt.Color('Tipo:N', scale=alt.Scale(scheme='set2'), legend=None),
+        tooltip=['Tipo:N', alt.Tooltip('Missões:Q', format='.0f'),
+                 alt.Tooltip('Taxa de Sucesso Média (%):Q', format='.1f')]
+    )
+    rotulos = base.mark_text(align='left', dx=3).encode(text=alt.Text('Taxa de Sucesso Média (%):Q', format='.1f'))
+    return barras + rotulos
@@ -1,7 +1,50 @@
-import streamlit as st
+import os
+
+# Modo streaming: o CSV é lido em blocos e apenas os agregados ficam em memória
+MODO_STREAMING = os.environ.get('MODO_STREAMING', '0') == '1'
+TAMANHO_BLOCO = int(os.environ.get('TAMANHO_BLOCO', '100000'))
+
+# Motor das agregações: 'pandas' (conjunto completo em memória) ou 'duckdb' (consultas
+# SQL sobre o CSV/Parquet; só os agregados ficam em memória)
+MOTOR_CONSULTAS = os.environ.get('MOTOR_CONSULTAS', 'pandas')
+
+# Memória máxima (MB) do cache de gráficos rasterizados
+LIMITE_CACHE_FIGURAS_MB = int(os.environ.get('LIMITE_CACHE_FIGURAS_MB', '64'))
+
+# Memória máxima (MB) do cache de relatórios PDF já gerados
+LIMITE_CACHE_RELATORIOS_MB = int(os.environ.get('LIMITE_CACHE_RELATORIOS_MB', '128'))
+
+# Número de partições CSV lidas em paralelo (threads; cada leitura usa também o
+# leitor multithread do pyarrow)
+THREADS_LEITURA = int(os.environ.get('THREADS_LEITURA', str(min(8, os.cpu_count() or 1))))
+
+# Acabamento dos gráficos do relatório PDF: 'vetorial' (paletas, grade e rótulos,
+# como nas seções) ou 'rascunho' (uma cor, sem grade nem rótulos, mais rápido)
+PERFIL_RELATORIO = os.environ.get('PERFIL_RELATORIO', 'vetorial')
+
+# Número de relatórios PDF gerados ao mesmo tempo em segundo plano; os demais
+# pedidos esperam na fila sem disputar o processador com as reexecuções interativas
+RELATORIOS_SIMULTANEOS = int(os.environ.get('RELATORIOS_SIMULTANEOS', str(max(1, min(2, (os.cpu_count() or 1) // 2)))))
+
+# Backend dos gráficos: 'matplotlib' (PNG gerado no servidor) ou 'vega' (o navegador
+# desenha a partir da tabela agregada, com zoom e tooltips)
+BACKEND_GRAFICOS = os.environ.get('BACKEND_GRAFICOS', 'matplotlib')
+
+# Tempo máximo (s) de importação dos módulos do app numa inicialização a frio,
+# verificado por python -m benchmarks.inicializacao
+ORCAMENTO_INICIALIZACAO_S = float(os.environ.get('ORCAMENTO_INICIALIZACAO_S', '1.5'))
+
+# Instrumentação de desempenho (tempo, CPU, memória e cache por chamada); desligada por padrão
+INSTRUMENTACAO = os.environ.get('INSTRUMENTACAO', '0') == '1'
+# Mede também a memória alocada (tracemalloc), o que deixa o app mais lento
+INSTRUMENTACAO_MEMORIA = os.environ.get('INSTRUMENTACAO_MEMORIA', '0') == '1'
+# Arquivo JSONL onde cada chamada medida é registrada (vazio = não grava)
+ARQUIVO_TRACO = os.environ.get('ARQUIVO_TRACO', '')
 
 def setup_page_config():
     """Configura a página do Streamlit e define o CSS global"""
+    # Importado aqui para que os módulos sem interface possam ler a configuração sem o Streamlit
+    import streamlit as st
     
     st.set_page_config(
         page_title="Análise de Dados Espaciais",
@@ -0,0 +1,196 @@
+from modules.aggregates import CuboMissoes, DIMENSOES, METRICAS, LARGURA_DENSIDADE_ORCAMENTO
+from modules.derivadas import BINS_ORCAMENTO, LABELS_ORCAMENTO
+from modules.colaboracao import COLUNA_COLABORADORES
+
+# Motor SQL embutido (DuckDB) opcional: o CSV, ou a conversão dele para Parquet, é
+# registrado como a visão 'missoes' e o cubo é montado por consultas GROUP BY.
+# Só os agregados chegam ao pandas, então o conjunto completo nunca fica em memória:
+# o DuckDB lê apenas as colunas usadas e grava em disco o que não couber na RAM.
+
+VISAO = 'missoes'
+
+def motor_sql_disponivel():
+    """Indica se o DuckDB está instalado"""
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _identificador(nome):
+    """Nome de coluna entre aspas duplas, para uso direto no SQL"""
+    return '"' + nome.replace('"', '""') + '"'
+
+def _texto(valor):
+    """Literal de texto SQL (usado onde o DuckDB não aceita parâmetros, como caminhos)"""
+    return "'" + str(valor).replace("'", "''") + "'"
+
+def _origem(caminhos):
+    """Função de leitura do DuckDB para um arquivo ou uma lista de partições do mesmo formato"""
+    if isinstance(caminhos, str):
+        caminhos = [caminhos]
+    lista = '[' + ', '.join(_texto(caminho) for caminho in caminhos) + ']'
+    if caminhos[0].endswith('.parquet'):
+        return f"read_parquet({lista}, union_by_name = true)"
+    return f"read_csv_auto({lista}, header = true, union_by_name = true)"
+
+def selecao_limpa(conexao, caminhos_csv, tipos, traducoes):
+    """SELECT que aplica ao CSV a mesma limpeza de preparar_dados
+
+    tipos: {coluna: tipo SQL} das colunas numéricas (valores inválidos viram NULL)
+    traducoes: {coluna: {valor original: valor traduzido}}
+    """
+    origem = _origem(caminhos_csv)
+    colunas = [linha[0] for linha in conexao.execute(f"DESCRIBE SELECT * FROM {origem}").fetchall()]
+
+    substituicoes = []
+    for coluna in colunas:
+        nome = _identificador(coluna)
+        if coluna in tipos:
+            substituicoes.append(f"TRY_CAST({nome} AS {tipos[coluna]}) AS {nome}")
+        elif coluna in traducoes:
+            casos = ' '.join(f"WHEN {_texto(de)} THEN {_texto(para)}" for de, para in traducoes[coluna].items())
+            substituicoes.append(f"CASE {nome} {casos} ELSE {nome} END AS {nome}")
+
+    if not substituicoes:
+        return f"SELECT * FROM {origem}"
+    return f"SELECT * REPLACE ({', '.join(substituicoes)}) FROM {origem}"
+
+def converter_para_parquet(caminho_csv, caminho_parquet, tipos, traducoes):
+    """Grava o CSV já limpo em Parquet, lido por colunas nas próximas inicializações"""
+    import duckdb
+
+    with duckdb.connect() as conexao:
+        selecao = selecao_limpa(conexao, caminho_csv, tipos, traducoes)
+        conexao.execute(f"COPY ({selecao}) TO {_texto(caminho_parquet)} (FORMAT PARQUET, COMPRESSION ZSTD)")
+
+def abrir_conexao(caminhos, tipos=None, traducoes=None):
+    """Abre um banco DuckDB em memória com a visão 'missoes' sobre os arquivos
+
+    Aceita um arquivo ou uma lista de partições, todas CSV ou todas Parquet.
+    Um Parquet é considerado já limpo; um CSV é limpo na própria visão.
+    """
+    import duckdb
+
+    conexao = duckdb.connect()
+    # Sem a ordem de inserção o DuckDB agrega em paralelo com menos memória
+    conexao.execute("SET preserve_insertion_order = false")
+
+    primeiro = caminhos if isinstance(caminhos, str) else caminhos[0]
+    if primeiro.endswith('.parquet'):
+        selecao = f"SELECT * FROM {_origem(caminhos)}"
+    else:
+        selecao = selecao_limpa(conexao, caminhos, tipos or {}, traducoes or {})
+    conexao.execute(f"CREATE VIEW {VISAO} AS {selecao}")
+    return conexao
+
+def colunas_visao(conexao):
+    return [linha[0] for linha in conexao.execute(f"DESCRIBE {VISAO}").fetchall()]
+
+def _condicoes(filtro):
+    """Cláusula WHERE e parâmetros equivalentes a um filtro da barra lateral"""
+    partes, parametros = [], []
+    for nome, valor in (filtro or {}).items():
+        if not valor:
+            continue
+        if nome == 'anos':
+            partes.append('"Year" BETWEEN ? AND ?')
+            parametros.extend(valor)
+        else:
+            marcadores = ', '.join('?' for _ in valor)
+            partes.append(f"CAST({_identificador(nome)} AS VARCHAR) IN ({marcadores})")
+            parametros.extend(str(v) for v in valor)
+    return (' WHERE ' + ' AND '.join(partes) if partes else ''), parametros
+
+def _faixa_orcamento(coluna):
+    """CASE equivalente à coluna derivada Budget Category (intervalos fechados à direita, o primeiro também à esquerda)"""
+    casos = [f"WHEN {coluna} < {BINS_ORCAMENTO[0]} THEN NULL"]
+    for limite, rotulo in zip(BINS_ORCAMENTO[1:], LABELS_ORCAMENTO):
+        casos.append(f"WHEN {coluna} <= {limite} THEN {_texto(rotulo)}")
+    return f"CASE {' '.join(casos)} END"
+
+def _base(colunas, filtro):
+    """Subconsulta com as dimensões do cubo e as métricas em DOUBLE"""
+    orcamento = _identificador('Budget (in Billion $)')
+    selecao = [_identificador(c) for c in DIMENSOES if c != 'Budget Category']
+    selecao.append(f"{_faixa_orcamento(orcamento)} AS \"Budget Category\"")
+    selecao += [f"CAST({_identificador(coluna)} AS DOUBLE) AS {nome}" for coluna, nome in METRICAS.items()]
+    if COLUNA_COLABORADORES in colunas:
+        selecao.append(_identificador(COLUNA_COLABORADORES))
+
+    onde, parametros = _condicoes(filtro)
+    return f"(SELECT {', '.join(selecao)} FROM {VISAO}{onde}) AS base", parametros
+
+def _consultar(conexao, sql, parametros, indice):
+    """Executa a consulta e devolve o resultado indexado e ordenado (ordem estável para o hash)"""
+    return conexao.execute(sql, parametros).df().set_index(indice).sort_index()
+
+def construir_cubo_sql(conexao, filtro=None):
+    """Monta o cubo com consultas GROUP BY no DuckDB (None se nenhuma linha atende ao filtro)"""
+    cursor = conexao.cursor()
+    colunas = colunas_visao(cursor)
+    base, parametros = _base(colunas, filtro)
+    dimensoes = ', '.join(_identificador(c) for c in DIMENSOES)
+
+    metricas = ['COUNT(*) AS missoes']
+    for nome in METRICAS.values():
+        metricas += [
+            f"COUNT({nome}) AS {nome}_n",
+            f"COALESCE(SUM({nome}), 0) AS {nome}_soma",
+            f"COALESCE(SUM({nome} * {nome}), 0) AS {nome}_soma2",
+            f"MIN({nome}) AS {nome}_min",
+            f"MAX({nome}) AS {nome}_max"
+        ]
+    tabela = _consultar(
+        cursor, f"SELECT {dimensoes}, {', '.join(metricas)} FROM {base} GROUP BY {dimensoes}",
+        parametros, DIMENSOES
+    )
+    if tabela.empty:
+        return None
+
+    histograma = _consultar(
+        cursor,
+        f"""SELECT "Budget Category", round_even(sucesso, 0) AS "Success Rate (%)", "Year", COUNT(*) AS missoes
+            FROM {base} WHERE "Budget Category" IS NOT NULL AND sucesso IS NOT NULL GROUP BY ALL""",
+        parametros, ['Budget Category', 'Success Rate (%)', 'Year']
+    )['missoes']
+
+    densidade = _consultar(
+        cursor,
+        f"""SELECT floor(orcamento / {LARGURA_DENSIDADE_ORCAMENTO}) * {LARGURA_DENSIDADE_ORCAMENTO} AS "Budget Start",
+                   round_even(sucesso, 0) AS "Success Rate (%)", "Year", COUNT(*) AS missoes
+            FROM {base} WHERE orcamento IS NOT NULL AND sucesso IS NOT NULL GROUP BY ALL""",
+        parametros, ['Budget Start', 'Success Rate (%)', 'Year']
+    )['missoes']
+
+    colaboracoes = None
+    if COLUNA_COLABORADORES in colunas:
+        colaboradores = _identificador(COLUNA_COLABORADORES)
+        colaboracoes = _consultar(
+            cursor,
+            f"""SELECT "Country", {colaboradores}, "Year", COUNT(*) AS missoes,
+                       COUNT(sucesso) AS sucesso_n, COALESCE(SUM(sucesso), 0) AS sucesso_soma
+                FROM {base} GROUP BY ALL""",
+            parametros, ['Country', COLUNA_COLABORADORES, 'Year']
+        )
+
+    onde, parametros_amostra = _condicoes(filtro)
+    amostra = cursor.execute(f"SELECT * FROM {VISAO}{onde} LIMIT 5", parametros_amostra).df()
+
+    return CuboMissoes().adicionar_agregados(tabela, histograma, densidade, colaboracoes, amostra)
+
+def valores_filtro(conexao, colunas):
+    """Valores distintos (como texto, ordenados) de cada coluna de filtro"""
+    cursor = conexao.cursor()
+    valores = {}
+    for coluna in colunas:
+        nome = _identificador(coluna)
+        linhas = cursor.execute(
+            f"SELECT DISTINCT CAST({nome} AS VARCHAR) AS v FROM {VISAO} WHERE {nome} IS NOT NULL ORDER BY v"
+        ).fetchall()
+        valores[coluna] = [linha[0] for linha in linhas]
+    return valores
+
+def intervalo_anos(conexao):
+    """Menor e maior ano da visão"""
+    return conexao.cursor().execute(f'SELECT MIN("Year"), MAX("Year") FROM {VISAO}').fetchone()
@@ -1,11 +1,15 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from modules.utils import set_plot_style, create_text_area
+from modules.utils import create_text_area, fragmento
+from modules.figure_cache import grafico_em_cache, exibir_grafico
+from modules.figuras import nova_figura
+from modules.instrumentacao import medido
+from modules.analises import (
+    dados_top_countries_by_missions, dados_top_countries_by_budget, dados_missions_vs_budget
+)
 
-def show_country_analysis(df):
+@fragmento
+@medido
+def show_country_analysis(cubo):
     """Exibe análise resumida por país"""
     st.markdown("<h2 class='section-header'>Análise por País</h2>", unsafe_allow_html=True)
     
@@ -24,91 +28,97 @@ def show_country_analysis(df):
     
     with col1:
         # Top países por número de missões
-        show_top_countries_by_missions(df)
+        show_top_countries_by_missions(cubo)
     
     with col2:
         # Top países por investimento
-        show_top_countries_by_budget(df)
+        show_top_countries_by_budget(cubo)
     
     # Relação entre número de missões e orçamento médio
-    show_missions_vs_budget(df)
+    show_missions_vs_budget(cubo)
 
-def show_top_countries_by_missions(df):
+@medido
+def show_top_countries_by_missions(cubo, top_n=10):
     """Exibe os principais países por número de missões"""
     st.subheader("Países com Maior Número de Missões Espaciais")
-    
-    # Contagem de missões por país
-    country_missions = df['Country'].value_counts().reset_index()
-    country_missions.columns = ['País', 'Número de Missões']
-    top_countries = country_missions.head(10)
+    exibir_grafico(cubo, plot_top_countries_by_missions, vega_top_countries_by_missions, top_n=top_n)
+
+@grafico_em_cache
+def plot_top_countries_by_missions(cubo, top_n=10):
+    """Gráfico de barras dos principais países por número de missões"""
+    import seaborn as sns
+    top_countries = dados_top_countries_by_missions(cubo, top_n)
     
     # Gráfico de barras horizontais
-    set_plot_style()
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = nova_figura(figsize=(10, 6))
     
     # Invertendo a ordem para que o maior valor apareça no topo
     sns.barplot(
         y='País', 
         x='Número de Missões', 
         data=top_countries, #iloc[::-1] 
-        palette='viridis'
+        palette='viridis',
+        ax=ax
     )
     
-    plt.title('Top 10 Países em Número de Missões Espaciais', fontsize=14)
-    plt.xlabel('Número de Missões')
-    plt.ylabel('País')
-    plt.tight_layout()
+    ax.set_title(f'Top {top_n} Países em Número de Missões Espaciais', fontsize=14)
+    ax.set_xlabel('Número de Missões')
+    ax.set_ylabel('País')
+    fig.tight_layout()
     
-    st.pyplot(fig)
+    return fig
 
-def show_top_countries_by_budget(df):
+@medido
+def show_top_countries_by_budget(cubo, top_n=10):
     """Exibe os principais países por orçamento"""
     st.subheader("Países com Maior Investimento em Exploração Espacial")
-    
-    # Calculando orçamento total e médio por país
-    country_budget = df.groupby('Country')['Budget (in Billion $)'].agg(['sum', 'mean']).reset_index()
-    country_budget.columns = ['País', 'Orçamento Total (Bilhões $)', 'Orçamento Médio (Bilhões $)']
-    
-    # Ordenando por orçamento total
-    top_countries_budget = country_budget.sort_values('Orçamento Total (Bilhões $)', ascending=False).head(10)
+    exibir_grafico(cubo, plot_top_countries_by_budget, vega_top_countries_by_budget, top_n=top_n)
+
+@grafico_em_cache
+def plot_top_countries_by_budget(cubo, top_n=10):
+    """Gráfico de barras dos principais países por orçamento total"""
+    import seaborn as sns
+    top_countries_budget = dados_top_countries_by_budget(cubo, top_n)
     
     # Gráfico de barras horizontais
-    set_plot_style()
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = nova_figura(figsize=(10, 6))
     
     # Invertendo a ordem para que o maior valor apareça no topo
     sns.barplot(
         y='País', 
         x='Orçamento Total (Bilhões $)', 
         data=top_countries_budget,  #iloc[::-1] 
-        palette='magma'
+        palette='magma',
+        ax=ax
     )
     
-    plt.title('Top 10 Países em Investimento em Missões Espaciais', fontsize=14)
-    plt.xlabel('Orçamento Total (Bilhões $)')
-    plt.ylabel('País')
-    plt.tight_layout()
+    ax.set_title(f'Top {top_n} Países em Investimento em Missões Espaciais', fontsize=14)
+    ax.set_xlabel('Orçamento Total (Bilhões $)')
+    ax.set_ylabel('País')
+    fig.tight_layout()
     
-    st.pyplot(fig)
+    return fig
 
-def show_missions_vs_budget(df):
+@medido
+def show_missions_vs_budget(cubo, min_missoes=10):
     """Exibe a relação entre número de missões e orçamento médio"""
     st.subheader("Relação entre Número de Missões e Orçamento Médio por País")
+    exibir_grafico(cubo, plot_missions_vs_budget, vega_missions_vs_budget, min_missoes=min_missoes)
     
-    # Preparando os dados agregados
-    country_data = df.groupby('Country').agg({
-        'Mission Name': 'count',
-        'Budget (in Billion $)': 'mean'
-    }).reset_index()
-    
-    country_data.columns = ['País', 'Número de Missões', 'Orçamento Médio (Bilhões $)']
-    
-    # Filtrando para mostrar apenas países com pelo menos 10 missões (para legibilidade)
-    filtered_data = country_data[country_data['Número de Missões'] >= 10].sort_values('Número de Missões', ascending=False)
+    st.markdown("""
+    **Observação**: Este gráfico mostra a relação entre o volume de missões e o orçamento médio por missão.
+    Países no quadrante superior direito têm muitas missões com alto orçamento, enquanto países no quadrante inferior direito 
+    têm muitas missões com orçamento menor por missão.
+    """)
+
+@grafico_em_cache
+def plot_missions_vs_budget(cubo, min_missoes=10):
+    """Gráfico de dispersão entre número de missões e orçamento médio por país"""
+    import seaborn as sns
+    filtered_data = dados_missions_vs_budget(cubo, min_missoes)
     
     # Gráfico de dispersão
-    set_plot_style()
-    fig, ax = plt.subplots(figsize=(12, 8))
+    fig, ax = nova_figura(figsize=(12, 8))
     
     scatter = sns.scatterplot(
         x='Número de Missões', 
@@ -118,31 +128,73 @@ def show_missions_vs_budget(df):
         sizes=(100, 700),
         alpha=0.7,
         palette='viridis',
-        hue='País'
+        hue='País',
+        ax=ax
     )
     
     # Adicionando rótulos para os pontos
     for i, row in filtered_data.iterrows():
-        plt.text(
+        ax.text(
             row['Número de Missões'] + 1, 
             row['Orçamento Médio (Bilhões $)'], 
             row['País'],
             fontsize=9
         )
     
-    plt.title('Relação entre Volume de Missões e Orçamento Médio por País', fontsize=14)
-    plt.xlabel('Número de Missões')
-    plt.ylabel('Orçamento Médio por Missão (Bilhões $)')
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
+    ax.set_title('Relação entre Volume de Missões e Orçamento Médio por País', fontsize=14)
+    ax.set_xlabel('Número de Missões')
+    ax.set_ylabel('Orçamento Médio por Missão (Bilhões $)')
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
     
     # Removendo a legenda já que os pontos estão rotulados
-    plt.legend([],[], frameon=False)
+    ax.legend([],[], frameon=False)
     
-    st.pyplot(fig)
-    
-    st.markdown("""
-    **Observação**: Este gráfico mostra a relação entre o volume de missões e o orçamento médio por missão.
-    Países no quadrante superior direito têm muitas missões com alto orçamento, enquanto países no quadrante inferior direito 
-    têm muitas missões com orçamento menor por missão.
-    """)
\ No newline at end of file
+    return fig
+
+def vega_top_countries_by_missions(cubo, top_n=10):
+    """Versão Vega-Lite do gráfico de países por número de missões"""
+    import altair as alt
+    return alt.Chart(
+        dados_top_countries_by_missions(cubo, top_n),
+        title=f'Top {top_n} Países em Número de Missões Espaciais'
+    ).mark_bar().encode(
+        x='Número de Missões:Q',
+        y=alt.Y('País:N', sort='-x'),
+        color=alt.Color('Número de Missões:Q', scale=alt.Scale(scheme='viridis'), legend=None),
+        tooltip=['País:N', 'Número de Missões:Q']
+    )
+
+def vega_top_countries_by_budget(cubo, top_n=10):
+    """Versão Vega-Lite do gráfico de países por orçamento total"""
+    import altair as alt
+    return alt.Chart(
+        dados_top_countries_by_budget(cubo, top_n),
+        title=f'Top {top_n} Países em Investimento em Missões Espaciais'
+    ).mark_bar().encode(
+        x='Orçamento Total (Bilhões $):Q',
+        y=alt.Y('País:N', sort='-x'),
+        color=alt.Color('Orçamento Total (Bilhões $):Q', scale=alt.Scale(scheme='magma'), legend=None),
+        tooltip=['País:N',
+                 alt.Tooltip('Orçamento Total (Bilhões $):Q', format='.1f'),
+                 alt.Tooltip('Orçamento Médio (Bilhões $):Q', format='.2f')]
+    )
+
+def vega_missions_vs_budget(cubo, min_missoes=10):
+    """Versão Vega-Lite da dispersão entre número de missões e orçamento médio"""
+    import altair as alt
+    base = alt.Chart(
+        dados_missions_vs_budget(cubo, min_missoes),
+        title='Relação entre Volume de Missões e Orçamento Médio por País'
+    ).encode(
+        x='Número de Missões:Q',
+        y=alt.Y('Orçamento Médio (Bilhões $):Q', title='Orçamento Médio por Missão (Bilhões $)')
+    )
+    pontos = base.mark_circle(opacity=0.7).encode(
+        size=alt.Size('Número de Missões:Q', scale=alt.Scale(range=[100, 700]), legend=None),
+        color=alt.Color('País:N', legend=None),
+        tooltip=['País:N', 'Número de Missões:Q',
+                 alt.Tooltip('Orçamento Médio (Bilhões $):Q', format='.2f')]
+    )
+    rotulos = base.mark_text(align='left', dx=12, fontSize=11).encode(text='País:N')
+    return (pontos + rotulos).interactive()
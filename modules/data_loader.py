@@ -1,48 +1,458 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import hashlib
+import json
+import os
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from modules.config import THREADS_LEITURA
+from modules.aggregates import CuboMissoes, construir_cubo
+from modules.derivadas import adicionar_derivadas
+from modules.consultas_sql import abrir_conexao, converter_para_parquet, construir_cubo_sql
+from modules.instrumentacao import medido, registrar_cache
 
-@st.cache_data
-def load_data():
-    """Carrega o conjunto de dados de exploração espacial"""
-    try:
-        df = pd.read_csv('data/Global_Space_Exploration_Dataset.csv')
-        
-        # Convertendo tipos de dados para garantir análise correta
-        if 'Year' in df.columns:
-            df['Year'] = pd.to_numeric(df['Year'], errors='coerce')
-        
-        if 'Budget (in Billion $)' in df.columns:
-            df['Budget (in Billion $)'] = pd.to_numeric(df['Budget (in Billion $)'], errors='coerce')
-            
-        if 'Success Rate (%)' in df.columns:
-            df['Success Rate (%)'] = pd.to_numeric(df['Success Rate (%)'], errors='coerce')
-            
-        if 'Duration (in Days)' in df.columns:
-            df['Duration (in Days)'] = pd.to_numeric(df['Duration (in Days)'], errors='coerce')
-        
-        # Traduzindo valores da coluna Mission Type
-        if 'Mission Type' in df.columns:
-            # Criando um dicionário de mapeamento para tradução
-            mission_type_map = {
-                'Unmanned': 'Não tripulada',
-                'Manned': 'Tripulada'
-            }
-            
-            # Aplicando a tradução
-            df['Mission Type'] = df['Mission Type'].replace(mission_type_map)
-            
-            # Verificando se existem outros valores além dos traduzidos
-            unique_values = df['Mission Type'].unique()
-            for value in unique_values:
-                if value not in mission_type_map.values() and value not in mission_type_map.keys():
-                    # Para valores que não são 'Manned' ou 'Unmanned', mantemos o original
-                    pass
-            
-        return df
+# Diretório do conjunto de dados: cada arquivo CSV é uma partição, e novos registros
+# chegam como arquivos adicionais; o cache colunar fica num subdiretório oculto
+DIRETORIO_DADOS = 'data'
+DIRETORIO_CACHE = os.path.join(DIRETORIO_DADOS, '.cache')
+
+# Versão do formato do cache; incrementar sempre que a limpeza dos dados ou as
+# colunas derivadas mudarem
+VERSAO_CACHE = 3
+
+COLUNAS_NUMERICAS = ['Year', 'Budget (in Billion $)', 'Success Rate (%)', 'Duration (in Days)']
+
+# Tipos SQL das colunas numéricas no motor DuckDB, com os mesmos valores que
+# _reduzir_numerico produz: inteiros para ano e duração, DOUBLE para orçamento
+# (com frações) e taxa de sucesso (pode ter valores ausentes)
+TIPOS_SQL = {
+    'Year': 'INTEGER',
+    'Budget (in Billion $)': 'DOUBLE',
+    'Success Rate (%)': 'DOUBLE',
+    'Duration (in Days)': 'INTEGER'
+}
+
+# Colunas candidatas a 'category' (convertidas apenas se tiverem baixa cardinalidade)
+COLUNAS_CATEGORICAS = [
+    'Country', 'Mission Type', 'Launch Site', 'Satellite Type',
+    'Technology Used', 'Environmental Impact'
+]
+LIMITE_CARDINALIDADE = 0.5
+
+# Dicionário de mapeamento para tradução da coluna Mission Type
+MISSION_TYPE_MAP = {
+    'Unmanned': 'Não tripulada',
+    'Manned': 'Tripulada'
+}
+
+def _reduzir_numerico(serie):
+    """Converte uma série para número usando o menor tipo que preserva os valores"""
+    serie = pd.to_numeric(serie, errors='coerce')
+
+    # Inteiros sem valores ausentes cabem em int8/int16/int32
+    if serie.notna().all() and np.array_equal(serie, np.floor(serie)):
+        return pd.to_numeric(serie, downcast='integer')
+
+    # float32 só quando todos os valores sobrevivem à conversão; frações como
+    # orçamentos em bilhões com centavos perderiam precisão e ficam em float64
+    serie = serie.astype('float64')
+    reduzida = serie.astype('float32')
+    if np.array_equal(reduzida.astype('float64'), serie, equal_nan=True):
+        return reduzida
+    return serie
+
+def preparar_dados(df):
+    """Aplica conversão de tipos e tradução de valores a um DataFrame bruto"""
+    # Convertendo tipos de dados para garantir análise correta
+    for coluna in COLUNAS_NUMERICAS:
+        if coluna in df.columns:
+            df[coluna] = _reduzir_numerico(df[coluna])
+
+    # Traduzindo valores da coluna Mission Type
+    # (valores que não são 'Manned' ou 'Unmanned' mantêm o original)
+    if 'Mission Type' in df.columns:
+        df['Mission Type'] = df['Mission Type'].replace(MISSION_TYPE_MAP)
+
+    # Colunas de texto com poucos valores distintos são armazenadas como 'category'
+    for coluna in COLUNAS_CATEGORICAS:
+        if coluna in df.columns and len(df) > 0:
+            if df[coluna].nunique() / len(df) <= LIMITE_CARDINALIDADE:
+                df[coluna] = df[coluna].astype('category')
+
+    # Colunas derivadas (faixa de orçamento, década, colaboração), calculadas uma única vez
+    return adicionar_derivadas(df)
+
+def _hash_arquivo(caminho, tamanho_bloco=1 << 20):
+    """Calcula o hash SHA-256 do conteúdo de um arquivo, lendo em blocos"""
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+def _caminhos_cache(caminho_csv, sufixo=''):
+    """Retorna os caminhos do arquivo Parquet e do manifesto associados a um CSV"""
+    nome = os.path.splitext(os.path.basename(caminho_csv))[0] + sufixo
+    base = os.path.join(DIRETORIO_CACHE, nome)
+    return base + '.parquet', base + '.json'
+
+def _cache_valido(caminho_csv, caminho_manifesto):
+    """Verifica se o manifesto do cache corresponde ao CSV atual
+
+    Tamanho e data de modificação iguais bastam; se algum deles mudou,
+    o hash do conteúdo decide (ex.: arquivo apenas tocado ou copiado).
+    """
+    try:
+        with open(caminho_manifesto, encoding='utf-8') as arquivo:
+            manifesto = json.load(arquivo)
+    except (OSError, ValueError):
+        return False
+
+    if manifesto.get('versao') != VERSAO_CACHE:
+        return False
+
+    stat = os.stat(caminho_csv)
+    if manifesto.get('tamanho') == stat.st_size and manifesto.get('mtime_ns') == stat.st_mtime_ns:
+        return True
+
+    if manifesto.get('tamanho') != stat.st_size:
+        return False
+
+    if manifesto.get('sha256') != _hash_arquivo(caminho_csv):
+        return False
+
+    # Conteúdo idêntico: atualiza a data de modificação para evitar novo hash
+    _gravar_manifesto(caminho_manifesto, stat, manifesto['sha256'])
+    return True
+
+def _gravar_manifesto(caminho_manifesto, stat, sha256):
+    """Grava o manifesto que identifica a versão do CSV usada no cache"""
+    manifesto = {
+        'versao': VERSAO_CACHE,
+        'tamanho': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': sha256
+    }
+    with open(caminho_manifesto, 'w', encoding='utf-8') as arquivo:
+        json.dump(manifesto, arquivo)
+
+def ler_dados_tipados(caminho_csv):
+    """Lê o CSV usando um arquivo Parquet como cache entre reinicializações
+
+    Com pyarrow o CSV é interpretado pelo leitor multithread dele. O cache é
+    opcional: sem pyarrow, ou sem permissão de escrita, o CSV é lido
+    diretamente a cada inicialização.
+    """
+    caminho_parquet, caminho_manifesto = _caminhos_cache(caminho_csv)
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return preparar_dados(pd.read_csv(caminho_csv))
+
+    if os.path.exists(caminho_parquet) and _cache_valido(caminho_csv, caminho_manifesto):
+        try:
+            return pd.read_parquet(caminho_parquet)
+        except Exception:
+            # Cache corrompido: reconstruímos a partir do CSV
+            pass
+
+    stat = os.stat(caminho_csv)
+    df = preparar_dados(pd.read_csv(caminho_csv, engine='pyarrow'))
+
+    try:
+        os.makedirs(DIRETORIO_CACHE, exist_ok=True)
+        df.to_parquet(caminho_parquet, index=False)
+        _gravar_manifesto(caminho_manifesto, stat, _hash_arquivo(caminho_csv))
+    except OSError:
+        pass
+
+    return df
+
+def listar_particoes(diretorio=DIRETORIO_DADOS):
+    """Caminhos dos arquivos CSV do diretório de dados, em ordem alfabética"""
+    return [os.path.join(diretorio, nome) for nome, _, _ in versao_dados(diretorio)]
+
+def versao_dados(diretorio=DIRETORIO_DADOS):
+    """Assinatura das partições: nome, tamanho e data de modificação de cada CSV
+
+    É barata (só lê metadados) e por isso é recalculada a cada rerun; muda
+    sempre que um arquivo é acrescentado, alterado ou removido e serve de
+    versão dos dados nas chaves dos caches.
+    """
+    try:
+        entradas = [e for e in os.scandir(diretorio) if e.is_file() and e.name.lower().endswith('.csv')]
     except FileNotFoundError:
-        st.error("Arquivo 'Global_Space_Exploration_Dataset.csv' não encontrado.")
-        return None
+        return ()
+    return tuple(sorted((e.name, e.stat().st_size, e.stat().st_mtime_ns) for e in entradas))
+
+def _concatenar_categoricas(series):
+    """Concatena séries categóricas unindo as categorias e remapeando só os códigos
+
+    Equivale a union_categoricals, mas não compara os tipos por hash, o que fica
+    caro com muitas categorias; partições com as mesmas categorias não são remapeadas.
+    """
+    categorias = series[0].cat.categories
+    for serie in series[1:]:
+        if not serie.cat.categories.equals(categorias):
+            categorias = categorias.union(serie.cat.categories)
+
+    codigos = []
+    for serie in series:
+        codigo = serie.cat.codes.to_numpy()
+        if not serie.cat.categories.equals(categorias):
+            mapa = categorias.get_indexer(serie.cat.categories)
+            codigo = np.where(codigo >= 0, mapa[codigo], -1)
+        codigos.append(codigo)
+    ordenada = all(serie.cat.ordered for serie in series)
+    return pd.Categorical.from_codes(np.concatenate(codigos), dtype=pd.CategoricalDtype(categorias, ordenada))
+
+def concatenar_particoes(partes):
+    """Concatena os DataFrames das partições mantendo as colunas 'category'
+
+    pd.concat converteria para object uma coluna cujas categorias diferem entre
+    as partições; aqui cada coluna categórica usa a união das categorias.
+    """
+    partes = [parte for parte in partes if parte is not None]
+    if len(partes) <= 1:
+        return partes[0] if partes else None
+
+    colunas = list(partes[0].columns)
+    if any(list(parte.columns) != colunas for parte in partes[1:]):
+        # Esquemas diferentes: o pd.concat alinha as colunas e preenche as ausentes
+        df = pd.concat(partes, ignore_index=True)
+    else:
+        dados = {}
+        for coluna in colunas:
+            series = [parte[coluna] for parte in partes]
+            if all(isinstance(serie.dtype, pd.CategoricalDtype) for serie in series):
+                dados[coluna] = _concatenar_categoricas(series)
+            else:
+                dados[coluna] = pd.concat(series, ignore_index=True)
+        df = pd.DataFrame(dados)
+
+    # Partições pequenas podem não ter convertido uma coluna que, no total, é categórica
+    for coluna in COLUNAS_CATEGORICAS:
+        if coluna in df.columns and df[coluna].dtype == object and len(df) > 0:
+            if df[coluna].nunique() / len(df) <= LIMITE_CARDINALIDADE:
+                df[coluna] = df[coluna].astype('category')
+    return df
+
+def ler_em_paralelo(funcao, caminhos, threads=THREADS_LEITURA):
+    """Aplica a função a cada partição numa pool de threads, preservando a ordem
+
+    Threads em vez de processos: a leitura do pyarrow e a maior parte da limpeza
+    liberam o GIL, e os DataFrames lidos voltam sem cópia nem serialização.
+    """
+    if len(caminhos) <= 1 or threads <= 1:
+        return [funcao(caminho) for caminho in caminhos]
+    with ThreadPoolExecutor(max_workers=min(threads, len(caminhos))) as pool:
+        return list(pool.map(funcao, caminhos))
+
+def ler_particoes(diretorio=DIRETORIO_DADOS):
+    """Lê e concatena todas as partições do diretório (uso fora do Streamlit)"""
+    return concatenar_particoes(ler_em_paralelo(ler_dados_tipados, listar_particoes(diretorio)))
+
+class TabelaParticionada:
+    """Partições lidas vistas como uma só tabela, com as linhas numeradas em sequência
+
+    As partições não são concatenadas: acrescentar uma partição não copia as
+    anteriores, e take monta um DataFrame só com as linhas pedidas. É
+    compartilhada pelas sessões e não deve ser alterada.
+    """
+
+    def __init__(self, partes):
+        self.partes = [parte for parte in partes if parte is not None and len(parte) > 0]
+        # Número global da primeira linha de cada partição (e o total no fim)
+        self.inicios = np.cumsum([0] + [len(parte) for parte in self.partes])
+
+    def __len__(self):
+        return int(self.inicios[-1])
+
+    def take(self, linhas):
+        """DataFrame com as linhas pedidas, dadas por números globais em ordem crescente"""
+        limites = np.searchsorted(linhas, self.inicios)
+        pedacos = [
+            parte.take(linhas[limites[i]:limites[i + 1]] - self.inicios[i])
+            for i, parte in enumerate(self.partes)
+            if limites[i + 1] > limites[i]
+        ]
+        return concatenar_particoes(pedacos) if pedacos else self.partes[0].iloc[:0]
+
+class IngestaoParticoes:
+    """Partições já lidas e seus cubos parciais, compartilhados por todas as sessões
+
+    A cada nova versão do diretório apenas as partições novas ou alteradas são
+    lidas. O cubo total é a combinação dos cubos parciais (custo proporcional ao
+    número de grupos, não de linhas); se houve apenas acréscimos, os cubos novos
+    são somados ao cubo total anterior. As linhas ficam numa TabelaParticionada
+    que reaproveita os DataFrames das partições mantidas, sem copiá-los.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_DADOS, streaming=False, tamanho_bloco=100_000):
+        self.diretorio = diretorio
+        self.streaming = streaming
+        self.tamanho_bloco = tamanho_bloco
+        self._trava = threading.Lock()
+        self._particoes = {}  # nome -> (assinatura, DataFrame, cubo parcial)
+        self._ordem = []      # ordem das partições dentro da tabela
+        self._versao = None
+        self._tabela = None
+        self._cubo = None
+
+    def _ler(self, caminho):
+        """Lê uma partição e retorna (DataFrame, cubo); no modo streaming o DataFrame é None"""
+        if self.streaming:
+            # Cada bloco é limpo e descartado após ser incorporado ao cubo
+            cubo = CuboMissoes()
+            for bloco in pd.read_csv(caminho, chunksize=self.tamanho_bloco):
+                cubo.adicionar_bloco(preparar_dados(bloco))
+            return None, (cubo if cubo.tabela is not None else None)
+
+        df = ler_dados_tipados(caminho)
+        return df, (construir_cubo(df) if len(df) > 0 else None)
+
+    def atualizar(self, versao):
+        """Retorna (tabela, cubo) da versão pedida, lendo apenas as partições que mudaram
+
+        A tabela é uma TabelaParticionada (None no modo streaming ou sem linhas).
+        """
+        with self._trava:
+            if versao == self._versao:
+                return self._tabela, self._cubo
+
+            assinaturas = {nome: (tamanho, mtime) for nome, tamanho, mtime in versao}
+            novas = [nome for nome in sorted(assinaturas)
+                     if self._particoes.get(nome, (None,))[0] != assinaturas[nome]]
+            mantidas = [nome for nome in self._ordem if nome in assinaturas and nome not in novas]
+            so_acrescimos = mantidas == self._ordem
+
+            # Partições novas lidas, limpas e agregadas em paralelo
+            caminhos = [os.path.join(self.diretorio, nome) for nome in novas]
+            lidas = dict(zip(novas, ler_em_paralelo(self._ler, caminhos)))
+
+            for nome in set(self._particoes) - set(mantidas):
+                del self._particoes[nome]
+            for nome in novas:
+                self._particoes[nome] = (assinaturas[nome],) + lidas[nome]
+
+            # Cubo total: só os cubos novos quando houve apenas acréscimos, senão todos
+            cubo = copy.copy(self._cubo) if so_acrescimos else None
+            for nome in (novas if so_acrescimos else mantidas + novas):
+                cubo_parte = self._particoes[nome][2]
+                if cubo_parte is None:
+                    continue
+                cubo = copy.copy(cubo_parte) if cubo is None else cubo.adicionar_cubo(cubo_parte)
+            if cubo is not None:
+                cubo.calcular_derivados()
+
+            self._ordem = mantidas + novas
+            tabela = None
+            if not self.streaming:
+                tabela = TabelaParticionada([self._particoes[nome][1] for nome in self._ordem])
+                tabela = tabela if len(tabela) > 0 else None
+            self._versao, self._tabela, self._cubo = versao, tabela, cubo
+            return tabela, cubo
+
+@st.cache_resource
+def estado_ingestao(diretorio=DIRETORIO_DADOS, streaming=False, tamanho_bloco=100_000):
+    """Estado de ingestão compartilhado pelas sessões, um por diretório e modo"""
+    return IngestaoParticoes(diretorio, streaming, tamanho_bloco)
+
+def _erro_carga(versao, erro=None):
+    """Mostra o erro de carga adequado e retorna None"""
+    if erro is not None:
+        st.error(f"Erro ao carregar os dados: {str(erro)}")
+    elif not versao:
+        st.error(f"Nenhum arquivo CSV encontrado em '{DIRETORIO_DADOS}'.")
+    else:
+        st.error("Os arquivos de dados estão vazios.")
+    return None
+
+@medido(em_cache=True)
+@st.cache_resource(max_entries=2)
+def load_data(versao):
+    """Linhas do conjunto de dados na versão indicada por versao_dados(), como TabelaParticionada
+
+    Fica em st.cache_resource: todas as sessões recebem os mesmos DataFrames
+    mantidos pelo estado de ingestão, sem a cópia serializada do st.cache_data.
+    """
+    registrar_cache(False)
+    try:
+        tabela, _ = estado_ingestao().atualizar(versao)
+        return tabela if tabela is not None else _erro_carga(versao)
+    except Exception as e:
+        return _erro_carga(versao, e)
+
+@medido(em_cache=True)
+@st.cache_data(max_entries=2)
+def load_cube(versao):
+    """Retorna o cubo agregado usado por todos os gráficos, atualizado incrementalmente"""
+    registrar_cache(False)
+    try:
+        _, cubo = estado_ingestao().atualizar(versao)
+        return cubo if cubo is not None else _erro_carga(versao)
+    except Exception as e:
+        return _erro_carga(versao, e)
+
+@medido(em_cache=True)
+@st.cache_data(max_entries=2)
+def carregar_cubo_streaming(versao, tamanho_bloco=100_000):
+    """Lê as partições em blocos e acumula apenas o cubo usado pelos gráficos
+
+    Cada bloco é limpo e descartado após ser incorporado, então o pico de
+    memória depende do tamanho do bloco e não do tamanho dos arquivos.
+    """
+    registrar_cache(False)
+    try:
+        _, cubo = estado_ingestao(streaming=True, tamanho_bloco=tamanho_bloco).atualizar(versao)
+        return cubo if cubo is not None else _erro_carga(versao)
+    except Exception as e:
+        return _erro_carga(versao, e)
+
+def abrir_motor_sql(caminhos_csv):
+    """Abre o motor DuckDB sobre as partições
+
+    Cada partição é convertida pelo próprio DuckDB para Parquet (já limpo), sem
+    passar pelo pandas, e só é reconvertida quando muda; as consultas leem então
+    apenas as colunas necessárias. Sem permissão de escrita, os CSVs são
+    consultados diretamente.
+    """
+    traducoes = {'Mission Type': MISSION_TYPE_MAP}
+    caminhos_parquet = []
+    for caminho_csv in caminhos_csv:
+        caminho_parquet, caminho_manifesto = _caminhos_cache(caminho_csv, sufixo='.sql')
+        if not (os.path.exists(caminho_parquet) and _cache_valido(caminho_csv, caminho_manifesto)):
+            stat = os.stat(caminho_csv)
+            try:
+                os.makedirs(DIRETORIO_CACHE, exist_ok=True)
+                converter_para_parquet(caminho_csv, caminho_parquet, TIPOS_SQL, traducoes)
+                _gravar_manifesto(caminho_manifesto, stat, _hash_arquivo(caminho_csv))
+            except Exception:
+                # Sem permissão de escrita (o DuckDB não usa OSError)
+                return abrir_conexao(caminhos_csv, TIPOS_SQL, traducoes)
+        caminhos_parquet.append(caminho_parquet)
+
+    return abrir_conexao(caminhos_parquet)
+
+@st.cache_resource(max_entries=2)
+def conexao_sql(versao, diretorio=DIRETORIO_DADOS):
+    """Conexão DuckDB compartilhada para a versão dos dados"""
+    return abrir_motor_sql([os.path.join(diretorio, nome) for nome, _, _ in versao])
+
+@medido(em_cache=True)
+@st.cache_data(max_entries=2)
+def carregar_cubo_sql(versao):
+    """Monta o cubo com consultas no motor DuckDB, sem carregar as linhas no pandas"""
+    registrar_cache(False)
+    if not versao:
+        return _erro_carga(versao)
+    try:
+        cubo = construir_cubo_sql(conexao_sql(versao))
+        if cubo is None:
+            return _erro_carga(versao)
+        return cubo.calcular_derivados()
     except Exception as e:
-        st.error(f"Erro ao carregar os dados: {str(e)}")
-        return None
\ No newline at end of file
+        return _erro_carga(versao, e)
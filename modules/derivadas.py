@@ -0,0 +1,59 @@
+import pandas as pd
+from modules.colaboracao import COLUNA_COLABORADORES, contar_colaboradores
+
+# Registro das colunas derivadas: o carregador as calcula uma vez, de forma vetorizada,
+# logo após a limpeza (preparar_dados), e elas são gravadas no cache colunar junto com
+# as demais. Análises, cubo e relatório PDF leem daqui em vez de recalcular.
+
+# Faixas de orçamento (bilhões $) usadas na análise de sucesso
+BINS_ORCAMENTO = [0, 1, 2, 5, 10, 20, 50, 100]
+LABELS_ORCAMENTO = ['0-1B', '1-2B', '2-5B', '5-10B', '10-20B', '20-50B', '50-100B']
+
+TIPOS_COLABORACAO = ['Solo', 'Colaborativa']
+
+def faixa_orcamento(orcamento):
+    """Classifica os orçamentos nas faixas usadas pelos gráficos"""
+    return pd.cut(orcamento, bins=BINS_ORCAMENTO, labels=LABELS_ORCAMENTO, include_lowest=True)
+
+def _faixa_orcamento(df):
+    return faixa_orcamento(df['Budget (in Billion $)'])
+
+def _decada(df):
+    """Década de lançamento (ex.: 2010 para 2010 a 2019), no mesmo tipo inteiro do ano"""
+    return df['Year'] // 10 * 10
+
+def _numero_colaboradores(df):
+    """Colaboradores distintos de cada missão, sem contar o próprio país
+
+    A lista de texto é interpretada uma vez por combinação distinta de país e
+    colaboradores, e o resultado é espalhado para as linhas pelos códigos.
+    """
+    codigos, combinacoes = pd.factorize(pd.MultiIndex.from_arrays([df['Country'], df[COLUNA_COLABORADORES]]))
+    contagens = contar_colaboradores(combinacoes.get_level_values(0), combinacoes.get_level_values(1))
+    return pd.Series(contagens[codigos].astype('int16'), index=df.index)
+
+def _tipo_colaboracao(df):
+    """'Solo' quando o único participante é o próprio país, senão 'Colaborativa'"""
+    return pd.Categorical.from_codes((df['Collaborator Count'] > 0).astype('int8'), categories=TIPOS_COLABORACAO)
+
+# nome -> (colunas necessárias, função vetorizada); a ordem permite que uma derivada
+# dependa de outra definida antes
+COLUNAS_DERIVADAS = {
+    'Budget Category': (['Budget (in Billion $)'], _faixa_orcamento),
+    'Decade': (['Year'], _decada),
+    'Collaborator Count': (['Country', COLUNA_COLABORADORES], _numero_colaboradores),
+    'Collaboration Type': (['Collaborator Count'], _tipo_colaboracao),
+}
+
+def adicionar_derivadas(df):
+    """Calcula no DataFrame todas as colunas derivadas cujas colunas de origem existem"""
+    for nome, (origens, funcao) in COLUNAS_DERIVADAS.items():
+        if all(origem in df.columns for origem in origens):
+            df[nome] = funcao(df)
+    return df
+
+def coluna_derivada(df, nome):
+    """Retorna a coluna derivada, calculando-a se o DataFrame não passou pelo carregador"""
+    if nome in df.columns:
+        return df[nome]
+    return COLUNAS_DERIVADAS[nome][1](df)
@@ -0,0 +1,63 @@
+import io
+import threading
+
+# Camada de desenho sem o estado global do pyplot: as figuras são objetos Figure
+# criados diretamente (fora do registro de figuras do pyplot, que as manteria
+# vivas até um plt.close) e os gráficos desenham sempre no Axes recebido.
+# O estilo das seções é o único usado pelo processo: nova_figura o instala uma
+# vez no rcParams do matplotlib e ninguém mais o altera. Um rc_context por
+# desenho mudaria o rcParams de todas as threads e exigiria um lock global;
+# com o estilo fixo, sessões em threads diferentes desenham em paralelo.
+
+_trava_estilo = threading.Lock()
+_estilo = None
+_estilo_instalado = False
+
+def estilo_padrao():
+    """Parâmetros do matplotlib usados nos gráficos das seções (calculados no primeiro uso)"""
+    global _estilo
+    if _estilo is None:
+        import seaborn as sns
+        estilo = dict(sns.axes_style("whitegrid"))
+        estilo.update({
+            'font.family': 'sans-serif',
+            'font.sans-serif': ['Arial', 'Helvetica', 'DejaVu Sans'],
+            'axes.labelsize': 12,
+            'axes.titlesize': 14,
+            'xtick.labelsize': 10,
+            'ytick.labelsize': 10
+        })
+        _estilo = estilo
+    return _estilo
+
+def _instalar_estilo():
+    """Aplica estilo_padrao() ao rcParams uma única vez, antes da primeira figura"""
+    global _estilo_instalado
+    if _estilo_instalado:
+        return
+    with _trava_estilo:
+        if not _estilo_instalado:
+            import matplotlib
+            matplotlib.rcParams.update(estilo_padrao())
+            _estilo_instalado = True
+
+def nova_figura(figsize, **subplots_kw):
+    """Cria uma figura no estilo das seções, com canvas Agg próprio, e retorna (fig, eixos)"""
+    _instalar_estilo()
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots(**subplots_kw)
+
+def figura_para_png(fig, dpi):
+    """Rasteriza a figura em PNG e descarta seus artistas, mesmo se a gravação falhar"""
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    finally:
+        # Eixos, artistas e dados saem da figura: uma referência que sobre para
+        # ela (num traceback, por exemplo) não mantém os dados vivos
+        fig.clear()
+    return buffer.getvalue()
@@ -0,0 +1,162 @@
+import streamlit as st
+import threading
+import functools
+from collections import OrderedDict
+from modules.config import LIMITE_CACHE_FIGURAS_MB, BACKEND_GRAFICOS
+from modules.instrumentacao import etapa, registrar_cache
+from modules import figuras
+
+# Mesmos parâmetros que o st.pyplot usa ao rasterizar uma figura
+DPI_FIGURAS = 200
+
+class CacheLRU:
+    """Cache LRU de conteúdos em bytes (gráficos, relatórios) com limite de memória"""
+
+    def __init__(self, limite_bytes):
+        self.limite_bytes = limite_bytes
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_usados = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def obter(self, chave):
+        """Retorna o conteúdo armazenado para a chave (ou None), contabilizando acerto/falha"""
+        with self._lock:
+            conteudo = self._itens.get(chave)
+            if conteudo is None:
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return conteudo
+
+    def guardar(self, chave, conteudo):
+        """Armazena um conteúdo, removendo os menos usados até caber no limite"""
+        if len(conteudo) > self.limite_bytes:
+            return
+
+        with self._lock:
+            if chave in self._itens:
+                self.bytes_usados -= len(self._itens.pop(chave))
+
+            self._itens[chave] = conteudo
+            self.bytes_usados += len(conteudo)
+
+            while self.bytes_usados > self.limite_bytes:
+                _, removido = self._itens.popitem(last=False)
+                self.bytes_usados -= len(removido)
+                self.remocoes += 1
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self.bytes_usados = 0
+
+    def estatisticas(self):
+        """Contadores usados para dimensionar o cache"""
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                'itens': len(self._itens),
+                'bytes_usados': self.bytes_usados,
+                'limite_bytes': self.limite_bytes,
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'remocoes': self.remocoes,
+                'taxa_acerto': self.acertos / consultas if consultas else 0.0
+            }
+
+@st.cache_resource
+def obter_cache_figuras():
+    """Cache de figuras compartilhado por todas as sessões do processo"""
+    return CacheLRU(LIMITE_CACHE_FIGURAS_MB * 1024 * 1024)
+
+def figura_para_png(fig):
+    """Rasteriza a figura das seções em PNG e a descarta"""
+    return figuras.figura_para_png(fig, DPI_FIGURAS)
+
+def desenhar_png(desenhar, cubo, **parametros):
+    """Desenha e rasteriza um gráfico no estilo das seções, sem passar pelo cache
+
+    Retorna None quando a função não tem dados para desenhar.
+    """
+    with etapa(f"desenho.{desenhar.__qualname__}"):
+        fig = desenhar(cubo, **parametros)
+    if fig is None:
+        return None
+    with etapa(f"rasterizacao.{desenhar.__qualname__}"):
+        return figura_para_png(fig)
+
+def grafico_em_cache(desenhar):
+    """Decorador que memoriza o PNG de uma função de gráfico
+
+    A função decorada recebe o cubo como primeiro argumento e devolve uma
+    figura criada com figuras.nova_figura (ou None quando não há dados). A
+    chave combina a impressão digital do cubo, o nome da função e os
+    parâmetros nomeados; parâmetros iniciados por '_' ficam fora da chave
+    (mesma convenção do st.cache_data). Em caso de acerto, nem a agregação
+    nem o desenho são executados.
+    """
+    nome = f"{desenhar.__module__}.{desenhar.__qualname__}"
+
+    @functools.wraps(desenhar)
+    def wrapper(cubo, **parametros):
+        chave = (
+            cubo.impressao_digital,
+            nome,
+            tuple(sorted((k, repr(v)) for k, v in parametros.items() if not k.startswith('_')))
+        )
+
+        cache = obter_cache_figuras()
+        png = cache.obter(chave)
+        registrar_cache(png is not None)
+        if png is None:
+            png = desenhar_png(desenhar, cubo, **parametros)
+            if png is None:
+                # Sem dados para desenhar: nada a armazenar
+                return None
+            cache.guardar(chave, png)
+        return png
+
+    return wrapper
+
+def exibir_png(png):
+    """Exibe um gráfico rasterizado ocupando a largura da coluna, como o st.pyplot"""
+    st.image(png, use_column_width=True)
+
+def exibir_grafico(cubo, plot, vega, **parametros):
+    """Exibe um gráfico no backend configurado em BACKEND_GRAFICOS
+
+    plot é a função matplotlib decorada com @grafico_em_cache e vega a que monta
+    o gráfico Altair; ambas recebem o cubo e os mesmos parâmetros. No backend
+    'vega' só a tabela agregada é enviada e o navegador desenha o gráfico.
+    Retorna False quando não há dados para exibir.
+    """
+    if BACKEND_GRAFICOS == 'vega':
+        grafico = vega(cubo, **parametros)
+        if grafico is None:
+            return False
+        st.altair_chart(grafico, use_container_width=True)
+        return True
+
+    png = plot(cubo, **parametros)
+    if png is None:
+        return False
+    exibir_png(png)
+    return True
+
+def exibir_estatisticas_cache():
+    """Mostra na barra lateral os contadores do cache de gráficos"""
+    if BACKEND_GRAFICOS == 'vega':
+        # Nenhum gráfico é rasterizado no servidor neste backend
+        return
+    estatisticas = obter_cache_figuras().estatisticas()
+    with st.sidebar.expander("Cache de gráficos"):
+        st.write(f"**Itens:** {estatisticas['itens']}")
+        st.write(f"**Memória:** {estatisticas['bytes_usados'] / 1024 / 1024:.1f} "
+                 f"de {estatisticas['limite_bytes'] / 1024 / 1024:.0f} MB")
+        st.write(f"**Acertos / falhas:** {estatisticas['acertos']} / {estatisticas['falhas']} "
+                 f"({estatisticas['taxa_acerto']:.0%})")
+        st.write(f"**Remoções (LRU):** {estatisticas['remocoes']}")
@@ -0,0 +1,123 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Fila de geração de relatórios em segundo plano, sem Streamlit: cada pedido vira
+# uma tarefa executada por um pool com número limitado de threads, para que uma
+# rajada de relatórios não tome o processador das reexecuções interativas.
+# Pedidos idênticos (mesma chave) feitos enquanto a tarefa está na fila ou em
+# execução recebem a mesma tarefa em vez de gerar outro relatório.
+
+NA_FILA = 'na_fila'
+EXECUTANDO = 'executando'
+CONCLUIDA = 'concluida'
+ERRO = 'erro'
+
+class TarefaRelatorio:
+    """Estado de uma geração de relatório, compartilhado pelas sessões que a pediram"""
+
+    def __init__(self, chave):
+        self.chave = chave
+        self.estado = NA_FILA
+        self.etapa = "Aguardando na fila"
+        self.progresso = 0.0
+        self.resultado = None
+        self.erro = None
+        self.pedidos = 1
+        self.criada_em = time.time()
+        self.iniciada_em = None
+        self.concluida_em = None
+
+    @classmethod
+    def pronta(cls, chave, resultado):
+        """Tarefa já concluída, para um resultado encontrado em cache"""
+        tarefa = cls(chave)
+        tarefa.concluir(resultado)
+        return tarefa
+
+    @property
+    def finalizada(self):
+        return self.estado in (CONCLUIDA, ERRO)
+
+    def iniciar(self):
+        self.estado = EXECUTANDO
+        self.iniciada_em = time.time()
+
+    def atualizar(self, etapa, progresso):
+        """Callback de progresso passado à função que gera o relatório"""
+        self.etapa = etapa
+        self.progresso = min(max(progresso, 0.0), 1.0)
+
+    def concluir(self, resultado):
+        self.resultado = resultado
+        self.etapa = "Concluído"
+        self.progresso = 1.0
+        self.concluida_em = time.time()
+        self.estado = CONCLUIDA
+
+    def falhar(self, erro):
+        self.erro = erro
+        self.etapa = "Erro"
+        self.concluida_em = time.time()
+        self.estado = ERRO
+
+class FilaRelatorios:
+    """Tabela de tarefas em andamento e pool de threads que as executa"""
+
+    def __init__(self, max_simultaneas):
+        self.max_simultaneas = max_simultaneas
+        self._executor = ThreadPoolExecutor(max_workers=max_simultaneas, thread_name_prefix='relatorio')
+        self._tarefas = {}
+        self._lock = threading.Lock()
+        self.geradas = 0
+        self.reaproveitadas = 0
+
+    def enviar(self, chave, gerar, *args, **kwargs):
+        """Retorna a tarefa em andamento com a mesma chave ou agenda uma nova
+
+        gerar recebe os argumentos e, como parâmetro nomeado progresso, o
+        callback (etapa, fração) da tarefa.
+        """
+        with self._lock:
+            tarefa = self._tarefas.get(chave)
+            if tarefa is not None:
+                tarefa.pedidos += 1
+                self.reaproveitadas += 1
+                return tarefa
+
+            tarefa = self._tarefas[chave] = TarefaRelatorio(chave)
+            self.geradas += 1
+
+        self._executor.submit(self._executar, tarefa, gerar, args, kwargs)
+        return tarefa
+
+    def _executar(self, tarefa, gerar, args, kwargs):
+        tarefa.iniciar()
+        try:
+            tarefa.concluir(gerar(*args, progresso=tarefa.atualizar, **kwargs))
+        except Exception as erro:
+            tarefa.falhar(erro)
+        finally:
+            # Daqui em diante um pedido igual encontra o resultado no cache do chamador
+            with self._lock:
+                self._tarefas.pop(tarefa.chave, None)
+
+    def posicao(self, tarefa):
+        """Quantas tarefas na fila foram criadas antes desta (0 se já estiver executando)"""
+        if tarefa.estado != NA_FILA:
+            return 0
+        with self._lock:
+            return sum(1 for t in self._tarefas.values()
+                       if t.estado == NA_FILA and t.criada_em < tarefa.criada_em)
+
+    def estatisticas(self):
+        """Contadores da tabela de tarefas"""
+        with self._lock:
+            tarefas = list(self._tarefas.values())
+        return {
+            'executando': sum(1 for t in tarefas if t.estado == EXECUTANDO),
+            'na_fila': sum(1 for t in tarefas if t.estado == NA_FILA),
+            'max_simultaneas': self.max_simultaneas,
+            'geradas': self.geradas,
+            'reaproveitadas': self.reaproveitadas
+        }
@@ -0,0 +1,251 @@
+import streamlit as st
+import threading
+import numpy as np
+import pandas as pd
+from modules.aggregates import construir_cubo
+from modules.data_loader import load_data, load_cube, conexao_sql
+from modules.consultas_sql import construir_cubo_sql, valores_filtro, intervalo_anos
+from modules.instrumentacao import medido, registrar_cache
+
+# Colunas com filtro de múltipla escolha na barra lateral
+COLUNAS_FILTRO = ['Country', 'Mission Type', 'Satellite Type', 'Technology Used']
+
+# Rótulos exibidos na barra lateral
+ROTULOS_FILTRO = {
+    'Country': 'País',
+    'Mission Type': 'Tipo de Missão',
+    'Satellite Type': 'Tipo de Satélite',
+    'Technology Used': 'Tecnologia'
+}
+
+# Quantidade de recortes filtrados mantidos em memória
+MAX_RECORTES = 32
+
+_VAZIO = np.array([], dtype=np.int64)
+
+def _intersectar(menor, maior):
+    """Interseção de dois vetores ordenados de linhas, em O(k log m) com k = len(menor)"""
+    if len(menor) == 0 or len(maior) == 0:
+        return _VAZIO
+    posicoes = np.searchsorted(maior, menor)
+    posicoes[posicoes == len(maior)] = len(maior) - 1
+    return menor[maior[posicoes] == menor]
+
+class IndiceParticao:
+    """Índices invertidos (valor -> linhas ordenadas) de uma partição dos dados
+
+    As linhas são posições dentro da partição. É construído uma única vez, quando
+    a partição é lida, e reaproveitado enquanto ela não muda.
+    """
+
+    def __init__(self, df):
+        # Linhas ordenadas por ano: um intervalo de anos é uma fatia contígua
+        anos = df['Year'].to_numpy()
+        self._ordem_anos = np.argsort(anos, kind='stable')
+        self._anos_ordenados = anos[self._ordem_anos]
+        self.ano_min = np.nanmin(anos)
+        self.ano_max = np.nanmax(anos)
+
+        # Para cada coluna, a ordenação estável pelos códigos deixa as linhas de
+        # cada valor contíguas e já em ordem crescente
+        self.valores = {}
+        for coluna in COLUNAS_FILTRO:
+            codigos, categorias = pd.factorize(df[coluna], sort=True)
+            ordem = np.argsort(codigos, kind='stable')
+            limites = np.searchsorted(codigos[ordem], np.arange(len(categorias) + 1))
+            self.valores[coluna] = {
+                str(valor): ordem[limites[i]:limites[i + 1]]
+                for i, valor in enumerate(categorias)
+            }
+
+    def linhas(self, anos, escolhas):
+        """Linhas (ordenadas) da partição que atendem ao intervalo de anos e às escolhas
+
+        anos: (início, fim), ou None para qualquer ano; escolhas: {coluna: valores}.
+        """
+        conjuntos = []
+        if anos is not None:
+            inicio = np.searchsorted(self._anos_ordenados, anos[0], side='left')
+            fim = np.searchsorted(self._anos_ordenados, anos[1], side='right')
+            conjuntos.append(np.sort(self._ordem_anos[inicio:fim]))
+
+        for coluna, escolhidos in escolhas.items():
+            partes = [self.valores[coluna].get(valor, _VAZIO) for valor in escolhidos]
+            conjuntos.append(partes[0] if len(partes) == 1 else np.sort(np.concatenate(partes)))
+
+        # Começa pelo menor conjunto: cada interseção só encolhe o resultado
+        conjuntos.sort(key=len)
+        resultado = conjuntos[0]
+        for conjunto in conjuntos[1:]:
+            resultado = _intersectar(resultado, conjunto)
+        return resultado
+
+class IndiceLinhas:
+    """Índices de linhas de uma TabelaParticionada, um IndiceParticao por partição
+
+    Avaliar um filtro é intersectar, em cada partição, os vetores de linhas dos
+    valores escolhidos, então o custo depende do tamanho da seleção e não do
+    conjunto inteiro. As linhas devolvidas são os números globais da tabela.
+    """
+
+    def __init__(self, tabela, indices):
+        self.tabela = tabela
+        self.indices = indices
+        self.ano_min = int(min(indice.ano_min for indice in indices))
+        self.ano_max = int(max(indice.ano_max for indice in indices))
+        self.valores = {
+            coluna: sorted(set().union(*(indice.valores[coluna] for indice in indices)))
+            for coluna in COLUNAS_FILTRO
+        }
+
+    def opcoes(self, coluna):
+        return list(self.valores[coluna])
+
+    def linhas(self, filtro):
+        """Retorna as linhas (ordenadas) que atendem ao filtro, ou None se não há filtro ativo"""
+        anos = filtro.get('anos') or (self.ano_min, self.ano_max)
+        if anos[0] <= self.ano_min and anos[1] >= self.ano_max:
+            anos = None
+        escolhas = {coluna: filtro[coluna] for coluna in COLUNAS_FILTRO if filtro.get(coluna)}
+        if anos is None and not escolhas:
+            return None
+
+        return np.concatenate([
+            inicio + indice.linhas(anos, escolhas)
+            for inicio, indice in zip(self.tabela.inicios, self.indices)
+        ])
+
+class EstadoIndices:
+    """Índices das partições, reaproveitados de uma versão dos dados para a seguinte
+
+    O estado de ingestão mantém o mesmo DataFrame para cada partição que não
+    mudou; só as partições novas ou alteradas ganham um IndiceParticao novo, e
+    o custo de uma atualização depende das linhas acrescentadas, não do total.
+    """
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self._por_particao = {}  # id(DataFrame) -> (DataFrame, IndiceParticao)
+
+    def indice(self, tabela):
+        with self._trava:
+            anteriores, self._por_particao = self._por_particao, {}
+            for parte in tabela.partes:
+                df, indice = anteriores.get(id(parte), (None, None))
+                if df is not parte:
+                    indice = IndiceParticao(parte)
+                self._por_particao[id(parte)] = (parte, indice)
+            return IndiceLinhas(tabela, [self._por_particao[id(parte)][1] for parte in tabela.partes])
+
+class OpcoesSQL:
+    """Opções dos filtros no motor DuckDB, onde não há linhas em memória para indexar
+
+    Tem a mesma interface de IndiceLinhas usada por exibir_filtros; cada recorte
+    é uma consulta com WHERE em vez de uma interseção de vetores de linhas.
+    """
+
+    def __init__(self, conexao):
+        self.ano_min, self.ano_max = (int(ano) for ano in intervalo_anos(conexao))
+        self.valores = valores_filtro(conexao, COLUNAS_FILTRO)
+
+    def opcoes(self, coluna):
+        return list(self.valores[coluna])
+
+def chave_filtro(filtro):
+    """Representação imutável e canônica do filtro, usada como chave de cache"""
+    return tuple(
+        (nome, tuple(valor) if nome == 'anos' else tuple(sorted(valor)))
+        for nome, valor in sorted(filtro.items())
+        if valor
+    )
+
+def descrever_filtro(filtro):
+    """Texto curto com os filtros ativos (ex.: subtítulo do relatório PDF)"""
+    partes = []
+    if filtro.get('anos'):
+        partes.append(f"Ano: {filtro['anos'][0]}–{filtro['anos'][1]}")
+    for coluna in COLUNAS_FILTRO:
+        if filtro.get(coluna):
+            partes.append(f"{ROTULOS_FILTRO[coluna]}: {', '.join(filtro[coluna])}")
+    return '; '.join(partes) or None
+
+@st.cache_resource
+def estado_indices():
+    """Índices das partições compartilhados pelas sessões"""
+    return EstadoIndices()
+
+@st.cache_resource(max_entries=2)
+def carregar_indice(versao):
+    """Índices de linhas da versão dos dados (versao_dados()), estendidos a cada nova partição
+
+    Fica em st.cache_resource porque os vetores são só lidos e não precisam
+    ser copiados a cada rerun, ao contrário do retorno de st.cache_data.
+    """
+    tabela = load_data(versao)
+    return None if tabela is None else estado_indices().indice(tabela)
+
+@medido(em_cache=True)
+@st.cache_resource(max_entries=MAX_RECORTES)
+def filtrar(versao, chave):
+    """Monta o cubo do recorte filtrado (None se não houver linhas)
+
+    Só com o intervalo de anos o cubo carregado é fatiado no nível 'Year';
+    as linhas são lidas e reagregadas apenas quando há filtros por valor.
+    """
+    registrar_cache(False)
+    indice = carregar_indice(versao)
+    filtro = dict(chave)
+    linhas = indice.linhas(filtro)
+    if len(linhas) == 0:
+        return None
+
+    if list(filtro) == ['anos']:
+        cubo = load_cube(versao).recortar_anos(filtro['anos'], amostra=indice.tabela.take(linhas[:5]))
+    else:
+        cubo = construir_cubo(indice.tabela.take(linhas))
+    cubo.impressao_digital  # calculada aqui para ser armazenada junto com o cubo
+    return cubo
+
+@st.cache_resource(max_entries=2)
+def carregar_opcoes_sql(versao):
+    """Lê uma única vez por versão dos dados os valores disponíveis em cada filtro"""
+    return OpcoesSQL(conexao_sql(versao))
+
+@medido(em_cache=True)
+@st.cache_resource(max_entries=MAX_RECORTES)
+def filtrar_sql(versao, chave):
+    """Monta o cubo do recorte filtrado no DuckDB (None se não houver linhas)"""
+    registrar_cache(False)
+    cubo = construir_cubo_sql(conexao_sql(versao), dict(chave))
+    if cubo is not None:
+        cubo.impressao_digital  # calculada aqui para ser armazenada junto com o cubo
+    return cubo
+
+def exibir_filtros(indice):
+    """Mostra os filtros na barra lateral e retorna o filtro escolhido"""
+    st.sidebar.markdown("### Filtros")
+    filtro = {}
+
+    if indice.ano_min < indice.ano_max:
+        anos = st.sidebar.slider("Ano", indice.ano_min, indice.ano_max, (indice.ano_min, indice.ano_max))
+        if anos != (indice.ano_min, indice.ano_max):
+            filtro['anos'] = anos
+
+    for coluna in COLUNAS_FILTRO:
+        escolhidos = st.sidebar.multiselect(ROTULOS_FILTRO[coluna], indice.opcoes(coluna))
+        if escolhidos:
+            filtro[coluna] = escolhidos
+
+    return filtro
+
+def aplicar_filtros(cubo, indice, filtro, versao):
+    """Retorna o cubo que os gráficos e o relatório devem usar para o filtro ativo"""
+    if not filtro:
+        return cubo
+    return filtrar(versao, chave_filtro(filtro))
+
+def aplicar_filtros_sql(cubo, filtro, versao):
+    """Versão de aplicar_filtros para o motor DuckDB"""
+    if not filtro:
+        return cubo
+    return filtrar_sql(versao, chave_filtro(filtro))
@@ -0,0 +1,168 @@
+import json
+import threading
+import time
+import tracemalloc
+import functools
+from collections import defaultdict, deque
+from contextlib import nullcontext
+import numpy as np
+from modules.config import INSTRUMENTACAO, INSTRUMENTACAO_MEMORIA, ARQUIVO_TRACO
+
+# Quantidade de chamadas recentes usadas nos percentis de cada etapa
+JANELA_MEDICOES = 200
+
+if INSTRUMENTACAO and INSTRUMENTACAO_MEMORIA and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+class Registro:
+    """Guarda as medições recentes de cada etapa, compartilhadas entre sessões"""
+
+    def __init__(self, janela=JANELA_MEDICOES, arquivo_traco=None):
+        self._medicoes = defaultdict(lambda: deque(maxlen=janela))
+        self._lock = threading.Lock()
+        self.arquivo_traco = arquivo_traco
+
+    def adicionar(self, medicao):
+        with self._lock:
+            self._medicoes[medicao['etapa']].append(medicao)
+            if self.arquivo_traco:
+                with open(self.arquivo_traco, 'a', encoding='utf-8') as arquivo:
+                    arquivo.write(json.dumps(medicao, ensure_ascii=False) + '\n')
+
+    def limpar(self):
+        with self._lock:
+            self._medicoes.clear()
+
+    def resumo(self):
+        """Retorna, por etapa, os percentis de tempo e os contadores de cache"""
+        with self._lock:
+            medicoes = {etapa: list(valores) for etapa, valores in self._medicoes.items()}
+
+        linhas = []
+        for etapa, valores in sorted(medicoes.items()):
+            segundos = [m['segundos'] for m in valores]
+            cpu = [m['cpu_segundos'] for m in valores]
+            memoria = [m['memoria_mb'] for m in valores if m['memoria_mb'] is not None]
+            caches = [m['cache'] for m in valores if m['cache'] is not None]
+            linhas.append({
+                'etapa': etapa,
+                'chamadas': len(valores),
+                'p50_s': float(np.percentile(segundos, 50)),
+                'p95_s': float(np.percentile(segundos, 95)),
+                'cpu_p50_s': float(np.percentile(cpu, 50)),
+                'memoria_media_mb': float(np.mean(memoria)) if memoria else None,
+                'acertos_cache': caches.count('acerto'),
+                'falhas_cache': caches.count('falha')
+            })
+        return linhas
+
+registro = Registro(arquivo_traco=ARQUIVO_TRACO or None)
+
+# Pilha de medições em andamento na thread atual, para atribuir acertos/falhas
+# de cache à etapa mais interna
+_local = threading.local()
+
+def _pilha():
+    pilha = getattr(_local, 'pilha', None)
+    if pilha is None:
+        pilha = _local.pilha = []
+    return pilha
+
+class _Etapa:
+    """Mede uma etapa: tempo de parede, tempo de CPU da thread e memória alocada"""
+
+    __slots__ = ('nome', 'cache', '_inicio', '_inicio_cpu', '_inicio_memoria')
+
+    def __init__(self, nome, cache=None):
+        self.nome = nome
+        self.cache = cache
+
+    def __enter__(self):
+        _pilha().append(self)
+        self._inicio_memoria = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        self._inicio_cpu = time.thread_time()
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao):
+        segundos = time.perf_counter() - self._inicio
+        cpu = time.thread_time() - self._inicio_cpu
+        memoria = None
+        if self._inicio_memoria is not None and tracemalloc.is_tracing():
+            memoria = (tracemalloc.get_traced_memory()[0] - self._inicio_memoria) / 1024 / 1024
+        _pilha().pop()
+
+        registro.adicionar({
+            'etapa': self.nome,
+            'inicio': time.time() - segundos,
+            'segundos': segundos,
+            'cpu_segundos': cpu,
+            'memoria_mb': memoria,
+            'cache': self.cache,
+            'thread': threading.current_thread().name
+        })
+        return False
+
+def etapa(nome):
+    """Context manager que mede um trecho de código (sem custo quando desligado)"""
+    if not INSTRUMENTACAO:
+        return nullcontext()
+    return _Etapa(nome)
+
+def medido(funcao=None, *, em_cache=False):
+    """Decorador que mede cada chamada da função
+
+    Com a instrumentação desligada a própria função é devolvida, sem nenhum
+    custo. em_cache=True indica uma função envolvida por st.cache_data: a
+    chamada conta como acerto, a menos que o corpo chame registrar_cache(False).
+    """
+    if funcao is None:
+        return functools.partial(medido, em_cache=em_cache)
+    if not INSTRUMENTACAO:
+        return funcao
+
+    nome = f"{funcao.__module__.rsplit('.', 1)[-1]}.{funcao.__qualname__}"
+
+    @functools.wraps(funcao)
+    def wrapper(*args, **kwargs):
+        with _Etapa(nome, 'acerto' if em_cache else None):
+            return funcao(*args, **kwargs)
+
+    return wrapper
+
+def registrar_cache(acerto):
+    """Atribui um acerto ou falha de cache à etapa medida mais interna"""
+    if not INSTRUMENTACAO:
+        return
+    pilha = _pilha()
+    if pilha:
+        pilha[-1].cache = 'acerto' if acerto else 'falha'
+
+def exibir_painel_instrumentacao():
+    """Mostra na barra lateral os percentis de tempo de cada etapa medida"""
+    if not INSTRUMENTACAO:
+        return
+    import streamlit as st
+
+    with st.sidebar.expander("Desempenho"):
+        resumo = registro.resumo()
+        if not resumo:
+            st.write("Nenhuma medição registrada.")
+            return
+
+        st.dataframe(
+            [{
+                'Etapa': r['etapa'],
+                'N': r['chamadas'],
+                'p50 (ms)': round(r['p50_s'] * 1000, 1),
+                'p95 (ms)': round(r['p95_s'] * 1000, 1),
+                'CPU p50 (ms)': round(r['cpu_p50_s'] * 1000, 1),
+                'Memória (MB)': None if r['memoria_media_mb'] is None else round(r['memoria_media_mb'], 2),
+                'Cache (acertos/falhas)': f"{r['acertos_cache']}/{r['falhas_cache']}"
+            } for r in resumo],
+            hide_index=True
+        )
+        if registro.arquivo_traco:
+            st.caption(f"Traço gravado em {registro.arquivo_traco}")
+        if st.button("Limpar medições"):
+            registro.limpar()
@@ -1,11 +1,15 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from modules.utils import set_plot_style, create_text_area
+from modules.utils import create_text_area, fragmento
+from modules.figure_cache import grafico_em_cache, exibir_grafico
+from modules.figuras import nova_figura
+from modules.instrumentacao import medido
+from modules.analises import (
+    dados_mission_types_distribution, dados_budget_by_mission_type, dados_mission_types_evolution
+)
 
-def show_mission_analysis(df):
+@fragmento
+@medido
+def show_mission_analysis(cubo):
     """Exibe análise resumida por tipo de missão"""
     st.markdown("<h2 class='section-header'>Análise por Tipo de Missão</h2>", unsafe_allow_html=True)
     
@@ -25,93 +29,100 @@ def show_mission_analysis(df):
     
     with col1:
         # Distribuição de tipos de missão
-        show_mission_types_distribution(df)
+        show_mission_types_distribution(cubo)
     
     with col2:
         # Orçamento médio por tipo de missão
-        show_budget_by_mission_type(df)
+        show_budget_by_mission_type(cubo)
     
     # Evolução dos tipos de missão ao longo do tempo
-    show_mission_types_evolution(df)
+    show_mission_types_evolution(cubo)
 
-def show_mission_types_distribution(df):
+@medido
+def show_mission_types_distribution(cubo, top_n=8):
     """Exibe a distribuição dos tipos de missão"""
     st.subheader("Distribuição de Tipos de Missão")
     
-    # Contagem de missões por tipo
-    mission_counts = df['Mission Type'].value_counts().reset_index()
-    mission_counts.columns = ['Tipo de Missão', 'Contagem']
-        
-    # Limitando aos 8 principais tipos para legibilidade
-    top_mission_types = mission_counts.head(8)
+    if not exibir_grafico(cubo, plot_mission_types_distribution, vega_mission_types_distribution, top_n=top_n):
+        st.warning("Não foram encontrados dados para exibir o gráfico.")
+
+@grafico_em_cache
+def plot_mission_types_distribution(cubo, top_n=8):
+    """Gráfico de barras dos tipos de missão mais frequentes"""
+    import seaborn as sns
+    top_mission_types = dados_mission_types_distribution(cubo, top_n)
     
     # Verificando se temos dados para mostrar
     if len(top_mission_types) > 0:
         # Gráfico de barras
-        set_plot_style()
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = nova_figura(figsize=(10, 6))
         
         # Usando apenas o barplot básico sem inversão da ordem
         sns.barplot(
             y='Tipo de Missão', 
             x='Contagem', 
             data=top_mission_types,
-            palette='coolwarm'
+            palette='coolwarm',
+            ax=ax
         )
         
-        plt.title('Principais Tipos de Missão Espacial', fontsize=14)
-        plt.xlabel('Número de Missões')
-        plt.ylabel('Tipo de Missão')
-        plt.tight_layout()
+        ax.set_title('Principais Tipos de Missão Espacial', fontsize=14)
+        ax.set_xlabel('Número de Missões')
+        ax.set_ylabel('Tipo de Missão')
+        fig.tight_layout()
         
-        st.pyplot(fig)
-    else:
-        st.warning("Não foram encontrados dados para exibir o gráfico.")
+        return fig
+    return None
 
-def show_budget_by_mission_type(df):
+@medido
+def show_budget_by_mission_type(cubo, min_missoes=10):
     """Exibe o orçamento médio por tipo de missão"""
     st.subheader("Orçamento Médio por Tipo de Missão")
-    
-    # Calculando estatísticas de orçamento por tipo de missão
-    budget_by_type = df.groupby('Mission Type')['Budget (in Billion $)'].agg(['mean', 'count']).reset_index()
-    budget_by_type.columns = ['Tipo de Missão', 'Orçamento Médio (Bilhões $)', 'Contagem']
-    
-    # Ordenando por contagem para manter consistência com o gráfico anterior
-    # e filtrando para tipos com pelo menos 10 missões para relevância estatística
-    budget_by_type = budget_by_type[budget_by_type['Contagem'] >= 10].sort_values('Contagem', ascending=False)
+    exibir_grafico(cubo, plot_budget_by_mission_type, vega_budget_by_mission_type, min_missoes=min_missoes)
+
+@grafico_em_cache
+def plot_budget_by_mission_type(cubo, min_missoes=10):
+    """Gráfico de barras do orçamento médio por tipo de missão"""
+    import seaborn as sns
+    budget_by_type = dados_budget_by_mission_type(cubo, min_missoes)
     
     # Gráfico de barras
-    set_plot_style()
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = nova_figura(figsize=(10, 6))
     
     sns.barplot(
         y='Tipo de Missão', 
         x='Orçamento Médio (Bilhões $)', 
         data=budget_by_type.iloc[::-1],  # Invertendo a ordem
-        palette='YlOrRd'
+        palette='YlOrRd',
+        ax=ax
     )
     
-    plt.title('Orçamento Médio por Tipo de Missão', fontsize=14)
-    plt.xlabel('Orçamento Médio (Bilhões $)')
-    plt.ylabel('Tipo de Missão')
-    plt.tight_layout()
+    ax.set_title('Orçamento Médio por Tipo de Missão', fontsize=14)
+    ax.set_xlabel('Orçamento Médio (Bilhões $)')
+    ax.set_ylabel('Tipo de Missão')
+    fig.tight_layout()
     
-    st.pyplot(fig)
+    return fig
 
-def show_mission_types_evolution(df):
+@medido
+def show_mission_types_evolution(cubo, top_n=5):
     """Exibe a evolução dos tipos de missão ao longo do tempo"""
     st.subheader("Evolução dos Tipos de Missão ao Longo do Tempo")
+    exibir_grafico(cubo, plot_mission_types_evolution, vega_mission_types_evolution, top_n=top_n)
     
-    # Agrupando dados por ano e tipo de missão
-    # Selecionando apenas os 5 tipos de missão mais comuns para legibilidade
-    top_types = df['Mission Type'].value_counts().nlargest(5).index.tolist()
-    filtered_df = df[df['Mission Type'].isin(top_types)]
-    
-    mission_evolution = filtered_df.groupby(['Year', 'Mission Type']).size().reset_index(name='Contagem')
+    st.markdown("""
+    **Observação**: Este gráfico mostra como a popularidade dos diferentes tipos de missão 
+    evoluiu ao longo do tempo. Neste caso, temos missões tripuladas e missões não tripuladas revelando tendências e mudanças de foco na exploração espacial.
+    """)
+
+@grafico_em_cache
+def plot_mission_types_evolution(cubo, top_n=5):
+    """Gráfico de linhas com a evolução anual dos principais tipos de missão"""
+    import seaborn as sns
+    mission_evolution = dados_mission_types_evolution(cubo, top_n)
     
     # Criando o gráfico de linha
-    set_plot_style()
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = nova_figura(figsize=(12, 6))
     
     sns.lineplot(
         x='Year', 
@@ -119,22 +130,53 @@ def show_mission_types_evolution(df):
         hue='Mission Type', 
         data=mission_evolution, 
         marker='o',
-        palette='Set2'
+        palette='Set2',
+        ax=ax
     )
     
-    plt.title('Evolução dos Principais Tipos de Missão ao Longo do Tempo', fontsize=14)
-    plt.xlabel('Ano')
-    plt.ylabel('Número de Missões')
-    plt.grid(True, alpha=0.3)
-    plt.legend(title='Tipo de Missão')
-    plt.tight_layout()
+    ax.set_title('Evolução dos Principais Tipos de Missão ao Longo do Tempo', fontsize=14)
+    ax.set_xlabel('Ano')
+    ax.set_ylabel('Número de Missões')
+    ax.grid(True, alpha=0.3)
+    ax.legend(title='Tipo de Missão')
+    fig.tight_layout()
     
     # Ajustando o intervalo do eixo x para melhor visualização
-    plt.xticks(rotation=45)
-    
-    st.pyplot(fig)
+    ax.tick_params(axis='x', labelrotation=45)
     
-    st.markdown("""
-    **Observação**: Este gráfico mostra como a popularidade dos diferentes tipos de missão 
-    evoluiu ao longo do tempo. Neste caso, temos missões tripuladas e missões não tripuladas revelando tendências e mudanças de foco na exploração espacial.
-    """)
\ No newline at end of file
+    return fig
+
+def vega_mission_types_distribution(cubo, top_n=8):
+    """Versão Vega-Lite do gráfico de tipos de missão mais frequentes"""
+    import altair as alt
+    top_mission_types = dados_mission_types_distribution(cubo, top_n)
+    if len(top_mission_types) == 0:
+        return None
+    return alt.Chart(top_mission_types, title='Principais Tipos de Missão Espacial').mark_bar().encode(
+        x=alt.X('Contagem:Q', title='Número de Missões'),
+        y=alt.Y('Tipo de Missão:N', sort='-x'),
+        color=alt.Color('Tipo de Missão:N', scale=alt.Scale(scheme='redblue'), legend=None),
+        tooltip=['Tipo de Missão:N', 'Contagem:Q']
+    )
+
+def vega_budget_by_mission_type(cubo, min_missoes=10):
+    """Versão Vega-Lite do gráfico de orçamento médio por tipo de missão"""
+    import altair as alt
+    return alt.Chart(dados_budget_by_mission_type(cubo, min_missoes), title='Orçamento Médio por Tipo de Missão').mark_bar().encode(
+        x='Orçamento Médio (Bilhões $):Q',
+        y=alt.Y('Tipo de Missão:N', sort='-x'),
+        color=alt.Color('Orçamento Médio (Bilhões $):Q', scale=alt.Scale(scheme='yelloworangered'), legend=None),
+        tooltip=['Tipo de Missão:N', alt.Tooltip('Orçamento Médio (Bilhões $):Q', format='.2f'), 'Contagem:Q']
+    )
+
+def vega_mission_types_evolution(cubo, top_n=5):
+    """Versão Vega-Lite da evolução anual dos principais tipos de missão"""
+    import altair as alt
+    mission_evolution = dados_mission_types_evolution(cubo, top_n)
+    mission_evolution['Mission Type'] = mission_evolution['Mission Type'].astype(str)
+    return alt.Chart(mission_evolution, title='Evolução dos Principais Tipos de Missão ao Longo do Tempo').mark_line(point=True).encode(
+        x=alt.X('Year:O', title='Ano'),
+        y=alt.Y('Contagem:Q', title='Número de Missões'),
+        color=alt.Color('Mission Type:N', title='Tipo de Missão', scale=alt.Scale(scheme='set2')),
+        tooltip=[alt.Tooltip('Year:O', title='Ano'), alt.Tooltip('Mission Type:N', title='Tipo de Missão'), 'Contagem:Q']
+    ).interactive()
@@ -0,0 +1,193 @@
+import math
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.graphics.shapes import Drawing, Group, String
+from reportlab.graphics.charts.barcharts import HorizontalBarChart, VerticalBarChart
+from reportlab.graphics.charts.lineplots import LinePlot
+from reportlab.graphics.charts.legends import Legend
+from reportlab.graphics.widgets.markers import makeMarker
+
+# Gráficos do relatório PDF: funções sem Streamlit que recebem apenas a tabela
+# agregada de cada gráfico e devolvem um Drawing do ReportLab. O gráfico entra
+# no PDF como vetor (texto e formas), então não há rasterização, o arquivo fica
+# menor e o zoom não perde nitidez.
+
+LARGURA = 6 * inch
+ALTURA = 4 * inch
+FONTE = 'Helvetica'
+FONTE_TITULO = 'Helvetica-Bold'
+
+# Perfis do relatório: 'vetorial' reproduz o visual dos gráficos das seções
+# (paletas, grade, rótulos de valor e marcadores); 'rascunho' desenha barras e
+# linhas de uma cor só, sem grade nem rótulos, para lotes em que o tempo de
+# geração importa mais que o acabamento
+PERFIS = {
+    'vetorial': {'paletas': True, 'grade': True, 'rotulos': True, 'marcadores': True},
+    'rascunho': {'paletas': False, 'grade': False, 'rotulos': False, 'marcadores': False},
+}
+
+# Ciclo de cores padrão do matplotlib (tab10), usado nas linhas por tipo de missão
+CORES_LINHAS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+                '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
+
+def _valor(valor):
+    """Número puro do Python, ou None para valores ausentes (barra não desenhada)"""
+    valor = float(valor)
+    return None if math.isnan(valor) else valor
+
+def _paleta(nome, n, cor, opcoes):
+    """n cores amostradas do mapa de cores do matplotlib, como o seaborn faz
+
+    No perfil sem paletas todas as barras usam a cor única e o matplotlib
+    nem é importado.
+    """
+    if not opcoes['paletas']:
+        return [cor] * n
+    from matplotlib import colormaps
+    mapa = colormaps[nome]
+    return [colors.Color(*mapa((i + 1) / (n + 1))[:3]) for i in range(n)]
+
+def _moldura(titulo, xlabel, ylabel):
+    """Desenho com título no topo, rótulo do eixo x embaixo e do eixo y na vertical"""
+    desenho = Drawing(LARGURA, ALTURA)
+    desenho.add(String(LARGURA / 2, ALTURA - 16, titulo, fontName=FONTE_TITULO, fontSize=11, textAnchor='middle'))
+    if xlabel:
+        desenho.add(String(LARGURA / 2, 6, xlabel, fontName=FONTE, fontSize=9, textAnchor='middle'))
+    if ylabel:
+        rotulo = Group(String(0, 0, ylabel, fontName=FONTE, fontSize=9, textAnchor='middle'))
+        rotulo.translate(12, ALTURA / 2)
+        rotulo.rotate(90)
+        desenho.add(rotulo)
+    return desenho
+
+def _margem_categorias(nomes, tamanho=8):
+    """Espaço à esquerda para os nomes das categorias de um gráfico horizontal"""
+    return 30 + max((stringWidth(str(nome), FONTE, tamanho) for nome in nomes), default=0)
+
+def _barras_horizontais(desenho, nomes, valores, cores, opcoes, valor_max=None):
+    """Barras horizontais (a primeira categoria embaixo, como no barh do matplotlib)"""
+    esquerda = _margem_categorias(nomes)
+    grafico = HorizontalBarChart()
+    grafico.x, grafico.y = esquerda, 32
+    grafico.width, grafico.height = LARGURA - esquerda - 16, ALTURA - 64
+    grafico.data = [[_valor(v) for v in valores]]
+    grafico.categoryAxis.categoryNames = [str(nome) for nome in nomes]
+    grafico.categoryAxis.labels.fontName = FONTE
+    grafico.categoryAxis.labels.fontSize = 8
+    grafico.valueAxis.valueMin = 0
+    if valor_max is not None:
+        grafico.valueAxis.valueMax = valor_max
+    grafico.valueAxis.labels.fontName = FONTE
+    grafico.valueAxis.labels.fontSize = 8
+    grafico.bars.strokeColor = None
+    for i, cor in enumerate(cores):
+        grafico.bars[(0, i)].fillColor = cor
+    if opcoes['grade']:
+        grafico.valueAxis.visibleGrid = 1
+        grafico.valueAxis.gridStrokeColor = colors.lightgrey
+    desenho.add(grafico)
+
+def grafico_barras_horizontais(serie, titulo, xlabel, ylabel, cor, perfil='vetorial'):
+    """Gráfico de barras horizontais a partir de uma série já ordenada"""
+    opcoes = PERFIS[perfil]
+    desenho = _moldura(titulo, xlabel, ylabel)
+    _barras_horizontais(desenho, serie.index, serie.values, [getattr(colors, cor)] * len(serie), opcoes)
+    return desenho
+
+def grafico_evolucao_tipos(mission_evolution, perfil='vetorial'):
+    """Gráfico de linhas com a evolução anual dos principais tipos de missão"""
+    opcoes = PERFIS[perfil]
+    desenho = _moldura('Evolução dos Principais Tipos de Missão', 'Ano', 'Número de Missões')
+
+    tipos = list(dict.fromkeys(mission_evolution['Mission Type']))
+    series = [
+        mission_evolution[mission_evolution['Mission Type'] == tipo][['Year', 'Contagem']]
+        for tipo in tipos
+    ]
+
+    grafico = LinePlot()
+    grafico.x, grafico.y = 48, 32
+    grafico.width, grafico.height = LARGURA - 64, ALTURA - 84
+    grafico.data = [
+        [(int(ano), float(contagem)) for ano, contagem in serie.itertuples(index=False)]
+        for serie in series
+    ]
+    grafico.xValueAxis.labels.fontName = grafico.yValueAxis.labels.fontName = FONTE
+    grafico.xValueAxis.labels.fontSize = grafico.yValueAxis.labels.fontSize = 8
+    grafico.xValueAxis.labelTextFormat = '%d'
+    grafico.yValueAxis.valueMin = 0
+    cores = [colors.HexColor(CORES_LINHAS[i % len(CORES_LINHAS)]) for i in range(len(tipos))]
+    for i, cor in enumerate(cores):
+        grafico.lines[i].strokeColor = cor
+        grafico.lines[i].strokeWidth = 1.5
+        if opcoes['marcadores']:
+            grafico.lines[i].symbol = makeMarker('FilledCircle', size=3, fillColor=cor, strokeColor=cor)
+    if opcoes['grade']:
+        grafico.xValueAxis.visibleGrid = grafico.yValueAxis.visibleGrid = 1
+        grafico.xValueAxis.gridStrokeColor = grafico.yValueAxis.gridStrokeColor = colors.lightgrey
+    desenho.add(grafico)
+
+    # A legenda é necessária nos dois perfis: sem ela as linhas não se distinguem.
+    # Fica numa linha entre o título e o gráfico, sem cobrir nenhum ponto
+    legenda = Legend()
+    legenda.x, legenda.y = LARGURA / 2, ALTURA - 28
+    legenda.boxAnchor = 'n'
+    legenda.alignment = 'right'
+    legenda.columnMaximum = 1
+    legenda.dx = legenda.dy = 8
+    legenda.deltax = 20
+    legenda.fontName, legenda.fontSize = FONTE, 8
+    legenda.colorNamePairs = list(zip(cores, tipos))
+    desenho.add(legenda)
+    return desenho
+
+def grafico_sucesso_por_pais(top_countries, perfil='vetorial'):
+    """Gráfico de barras da taxa de sucesso média por país"""
+    opcoes = PERFIS[perfil]
+    desenho = _moldura('Taxa de Sucesso Média por País', 'Taxa de Sucesso Média (%)', 'País')
+
+    # A tabela vem do maior para o menor e o primeiro país fica no topo, como no seaborn
+    cores = _paleta('YlGnBu', len(top_countries), colors.HexColor('#41b6c4'), opcoes)
+    _barras_horizontais(
+        desenho, top_countries['País'][::-1], top_countries['Taxa de Sucesso Média (%)'][::-1],
+        cores[::-1], opcoes, valor_max=100
+    )
+    return desenho
+
+def grafico_sucesso_por_orcamento(budget_success, perfil='vetorial'):
+    """Gráfico de barras da taxa de sucesso média por faixa de orçamento"""
+    opcoes = PERFIS[perfil]
+    desenho = _moldura('Taxa de Sucesso por Categoria de Orçamento',
+                       'Categoria de Orçamento (Bilhões $)', 'Taxa de Sucesso Média (%)')
+
+    grafico = VerticalBarChart()
+    grafico.x, grafico.y = 48, 56
+    grafico.width, grafico.height = LARGURA - 64, ALTURA - 88
+    grafico.data = [[_valor(v) for v in budget_success['Taxa de Sucesso Média']]]
+    grafico.categoryAxis.categoryNames = [str(nome) for nome in budget_success['Categoria de Orçamento']]
+    grafico.categoryAxis.labels.fontName = grafico.valueAxis.labels.fontName = FONTE
+    grafico.categoryAxis.labels.fontSize = grafico.valueAxis.labels.fontSize = 8
+    grafico.categoryAxis.labels.angle = 45
+    grafico.categoryAxis.labels.boxAnchor = 'ne'
+    grafico.valueAxis.valueMin, grafico.valueAxis.valueMax = 0, 100
+    grafico.bars.strokeColor = None
+
+    cores = _paleta('viridis', len(budget_success), colors.HexColor('#21918c'), opcoes)
+    for i, cor in enumerate(cores):
+        grafico.bars[(0, i)].fillColor = cor
+    if opcoes['grade']:
+        grafico.valueAxis.visibleGrid = 1
+        grafico.valueAxis.gridStrokeColor = colors.lightgrey
+
+    # Número de missões acima de cada barra (faixas sem missões ficam sem rótulo)
+    if opcoes['rotulos']:
+        grafico.barLabelFormat = 'values'
+        grafico.barLabelArray = [[
+            f"n={n}" if valor is not None else ''
+            for n, valor in zip(budget_success['Número de Missões'], grafico.data[0])
+        ]]
+        grafico.barLabels.fontName, grafico.barLabels.fontSize = FONTE, 8
+        grafico.barLabels.nudge = 6
+    desenho.add(grafico)
+    return desenho
@@ -1,24 +1,114 @@
 import streamlit as st
 import io
-import base64
+import time
 from datetime import datetime
-import matplotlib.pyplot as plt
-import pandas as pd
-import numpy as np
-import seaborn as sns
-import tempfile
-import os
-
-# Importações do ReportLab
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch, cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle, PageBreak
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
-
-def gerar_relatorio_pdf(df):
-    """Cria um relatório PDF completo da análise de exploração espacial"""
+from modules.config import LIMITE_CACHE_RELATORIOS_MB, RELATORIOS_SIMULTANEOS, PERFIL_RELATORIO
+from modules.figure_cache import CacheLRU
+from modules.fila_relatorios import FilaRelatorios, TarefaRelatorio
+from modules.instrumentacao import etapa, medido, registrar_cache
+from modules.analises import (
+    dados_general_statistics, dados_top_countries_by_missions, dados_top_countries_by_budget,
+    dados_mission_types_distribution, dados_mission_types_evolution,
+    dados_success_rate_by_country, dados_success_rate_by_budget
+)
+
+# O ReportLab e os gráficos do relatório (pdf_charts) são importados só quando
+# o primeiro relatório é gerado: a maioria das sessões nunca o pede e a
+# inicialização do app não paga por eles
+
+# Intervalo (s) entre as verificações do andamento de um relatório em geração
+INTERVALO_ATUALIZACAO_S = 0.25
+
+# Espera máxima (s) por um relatório numa mesma execução do script; depois dela
+# o app é reexecutado uma vez para continuar acompanhando
+ESPERA_POR_EXECUCAO_S = 30.0
+
+def preparar_tabelas_graficos(cubo):
+    """Obtém na camada de análises as pequenas tabelas usadas por cada gráfico do relatório
+
+    As tabelas são as mesmas exibidas pelas seções (e com os mesmos
+    parâmetros), então um relatório gerado depois de a página ser vista não
+    faz nenhuma nova agregação. Retorna {nome: (função de desenho, argumentos)}.
+    """
+    from modules import pdf_charts
+
+    # Contagem de missões por país
+    country_missions = dados_top_countries_by_missions(cubo).set_index('País')['Número de Missões'].sort_values()
+
+    # Orçamento médio por país
+    country_budget = dados_top_countries_by_budget(
+        cubo, ordenar_por='Orçamento Médio (Bilhões $)'
+    ).set_index('País')['Orçamento Médio (Bilhões $)']
+
+    # Contagem de tipos de missão
+    mission_counts = dados_mission_types_distribution(cubo).set_index('Tipo de Missão')['Contagem'].sort_values()
+
+    # Evolução anual dos tipos de missão mais comuns
+    mission_evolution = dados_mission_types_evolution(cubo)
+
+    # Taxa de sucesso média por país, para países com pelo menos 10 missões
+    top_countries = dados_success_rate_by_country(cubo)
+
+    # Taxa de sucesso por categoria de orçamento
+    budget_success = dados_success_rate_by_budget(cubo)
+
+    return {
+        'paises_missoes': (pdf_charts.grafico_barras_horizontais, (
+            country_missions, 'Top 10 Países em Número de Missões',
+            'Número de Missões', 'País', 'skyblue')),
+        'paises_orcamento': (pdf_charts.grafico_barras_horizontais, (
+            country_budget, 'Top 10 Países por Orçamento Médio',
+            'Orçamento Médio (Bilhões $)', 'País', 'salmon')),
+        'tipos_missao': (pdf_charts.grafico_barras_horizontais, (
+            mission_counts, 'Principais Tipos de Missão Espacial',
+            'Número de Missões', 'Tipo de Missão', 'lightgreen')),
+        'evolucao_tipos': (pdf_charts.grafico_evolucao_tipos, (mission_evolution,)),
+        'sucesso_pais': (pdf_charts.grafico_sucesso_por_pais, (top_countries,)),
+        'sucesso_orcamento': (pdf_charts.grafico_sucesso_por_orcamento, (budget_success,)),
+    }
+
+def renderizar_graficos(tarefas, perfil=PERFIL_RELATORIO, concluido=None):
+    """Monta os gráficos do relatório como desenhos vetoriais e retorna {nome: Drawing}
+
+    Cada desenho leva milissegundos (não há rasterização), então os gráficos
+    são montados em sequência no próprio processo. concluido(n) é chamado a
+    cada gráfico pronto.
+    """
+    concluido = concluido or (lambda n: None)
+    graficos = {}
+    for nome, (funcao, args) in tarefas.items():
+        graficos[nome] = funcao(*args, perfil=perfil)
+        concluido(len(graficos))
+    return graficos
+
+def gerar_relatorio_pdf(cubo, subtitulo=None, perfil=PERFIL_RELATORIO, progresso=None):
+    """Cria um relatório PDF completo da análise de exploração espacial a partir do cubo
+
+    subtitulo identifica o recorte dos dados (ex.: "Country: Brazil") nos
+    relatórios em lote; perfil escolhe o acabamento dos gráficos
+    (pdf_charts.PERFIS: 'vetorial' ou 'rascunho').
+    progresso(etapa, fração) é chamado no início de cada etapa e a cada gráfico.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+    
+    progresso = progresso or (lambda etapa, fracao: None)
+
+    # Os gráficos são montados como desenhos vetoriais antes do documento
+    progresso("Calculando tabelas", 0.05)
+    with etapa('pdf.tabelas'):
+        tarefas = preparar_tabelas_graficos(cubo)
+        estatisticas = dados_general_statistics(cubo)
+    progresso(f"Desenhando gráficos (0/{len(tarefas)})", 0.1)
+    with etapa('pdf.graficos'):
+        graficos = renderizar_graficos(
+            tarefas, perfil=perfil,
+            concluido=lambda n: progresso(f"Desenhando gráficos ({n}/{len(tarefas)})", 0.1 + 0.7 * n / len(tarefas))
+        )
     
     # Configuração do buffer para armazenar o PDF
     buffer = io.BytesIO()
@@ -83,6 +173,8 @@ def gerar_relatorio_pdf(df):
     
     # Capa do relatório
     elementos.append(Paragraph("Análise de Exploração Espacial Global", estilos['Titulo']))
+    if subtitulo:
+        elementos.append(Paragraph(subtitulo, estilos['Subsecao']))
     elementos.append(Spacer(1, 0.5*inch))
     
     data_hoje = datetime.now().strftime("%d/%m/%Y")
@@ -93,7 +185,7 @@ def gerar_relatorio_pdf(df):
     elementos.append(Paragraph("Introdução", estilos['Secao']))
     elementos.append(Paragraph(
         f"Este relatório apresenta uma análise exploratória dos dados de exploração espacial global, "
-        f"cobrindo {len(df)} missões registradas entre {df['Year'].min()} e {df['Year'].max()}. "
+        f"cobrindo {estatisticas['missoes']} missões registradas entre {estatisticas['ano_min']} e {estatisticas['ano_max']}. "
         f"São examinados padrões de liderança entre países, tipos de missão predominantes e "
         f"fatores que influenciam o sucesso das missões.",
         estilos['CorpoTexto']
@@ -106,12 +198,12 @@ def gerar_relatorio_pdf(df):
     # Dados para a tabela de estatísticas
     dados_tabela = [
         ["Métrica", "Valor"],
-        ["Total de Missões", f"{len(df)}"],
-        ["Período Analisado", f"{df['Year'].min()} - {df['Year'].max()}"],
-        ["Países Envolvidos", f"{df['Country'].nunique()}"],
-        ["Tipos de Missão", f"{df['Mission Type'].nunique()}"],
-        ["Taxa Média de Sucesso", f"{df['Success Rate (%)'].mean():.2f}%"],
-        ["Orçamento Médio", f"${df['Budget (in Billion $)'].mean():.2f} bilhões"]
+        ["Total de Missões", f"{estatisticas['missoes']}"],
+        ["Período Analisado", f"{estatisticas['ano_min']} - {estatisticas['ano_max']}"],
+        ["Países Envolvidos", f"{estatisticas['paises']}"],
+        ["Tipos de Missão", f"{estatisticas['tipos']}"],
+        ["Taxa Média de Sucesso", f"{estatisticas['sucesso_medio']:.2f}%"],
+        ["Orçamento Médio", f"${estatisticas['orcamento_medio']:.2f} bilhões"]
     ]
     
     # Criando e estilizando a tabela
@@ -149,52 +241,12 @@ def gerar_relatorio_pdf(df):
     ))
     
     # Gráfico: Países com mais missões
-    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_file:
-        # Contagem de missões por país
-        country_missions = df['Country'].value_counts().head(10).sort_values()
-        
-        plt.figure(figsize=(8, 5))
-        bars = country_missions.plot.barh(color='skyblue')
-        plt.title('Top 10 Países em Número de Missões')
-        plt.xlabel('Número de Missões')
-        plt.ylabel('País')
-        plt.tight_layout()
-        
-        # Salvando a figura
-        plt.savefig(tmp_file.name, dpi=150, bbox_inches='tight')
-        plt.close()
-        
-        # Adicionando a imagem ao PDF
-        img = Image(tmp_file.name, width=6*inch, height=4*inch)
-        elementos.append(img)
-        
-        # Excluindo o arquivo temporário
-        tmp_path = tmp_file.name
+    elementos.append(graficos['paises_missoes'])
     
     elementos.append(Spacer(1, 0.3*inch))
     
     # Gráfico: Orçamento por país
-    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_file:
-        # Orçamento médio por país
-        country_budget = df.groupby('Country')['Budget (in Billion $)'].mean().sort_values(ascending=False).head(10)
-        
-        plt.figure(figsize=(8, 5))
-        bars = country_budget.plot.barh(color='salmon')
-        plt.title('Top 10 Países por Orçamento Médio')
-        plt.xlabel('Orçamento Médio (Bilhões $)')
-        plt.ylabel('País')
-        plt.tight_layout()
-        
-        # Salvando a figura
-        plt.savefig(tmp_file.name, dpi=150, bbox_inches='tight')
-        plt.close()
-        
-        # Adicionando a imagem ao PDF
-        img = Image(tmp_file.name, width=6*inch, height=4*inch)
-        elementos.append(img)
-        
-        # Excluindo o arquivo temporário
-        tmp_path = tmp_file.name
+    elementos.append(graficos['paises_orcamento'])
     
     # Quebra de página após análise por país
     elementos.append(PageBreak())
@@ -209,58 +261,13 @@ def gerar_relatorio_pdf(df):
     ))
     
     # Gráfico: Tipos de missão
-    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_file:
-        # Contagem de tipos de missão
-        mission_counts = df['Mission Type'].value_counts().head(8).sort_values()
-        
-        plt.figure(figsize=(8, 5))
-        bars = mission_counts.plot.barh(color='lightgreen')
-        plt.title('Principais Tipos de Missão Espacial')
-        plt.xlabel('Número de Missões')
-        plt.ylabel('Tipo de Missão')
-        plt.tight_layout()
-        
-        # Salvando a figura
-        plt.savefig(tmp_file.name, dpi=150, bbox_inches='tight')
-        plt.close()
-        
-        # Adicionando a imagem ao PDF
-        img = Image(tmp_file.name, width=6*inch, height=4*inch)
-        elementos.append(img)
-        
-        # Excluindo o arquivo temporário
-        tmp_path = tmp_file.name
+    elementos.append(graficos['tipos_missao'])
     
     # Evolução dos tipos de missão
     elementos.append(Spacer(1, 0.3*inch))
     elementos.append(Paragraph("Evolução dos Tipos de Missão ao Longo do Tempo", estilos['Subsecao']))
     
-    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_file:
-        # Selecionando os tipos mais comuns para a visualização
-        top_types = df['Mission Type'].value_counts().nlargest(3).index.tolist()
-        filtered_df = df[df['Mission Type'].isin(top_types)]
-        
-        # Agrupando por ano e tipo
-        mission_evolution = filtered_df.groupby(['Year', 'Mission Type']).size().reset_index(name='Contagem')
-        
-        plt.figure(figsize=(8, 5))
-        sns.lineplot(x='Year', y='Contagem', hue='Mission Type', data=mission_evolution, marker='o')
-        plt.title('Evolução dos Principais Tipos de Missão')
-        plt.xlabel('Ano')
-        plt.ylabel('Número de Missões')
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        
-        # Salvando a figura
-        plt.savefig(tmp_file.name, dpi=150, bbox_inches='tight')
-        plt.close()
-        
-        # Adicionando a imagem ao PDF
-        img = Image(tmp_file.name, width=6*inch, height=4*inch)
-        elementos.append(img)
-        
-        # Excluindo o arquivo temporário
-        tmp_path = tmp_file.name
+    elementos.append(graficos['evolucao_tipos'])
     
     # Quebra de página
     elementos.append(PageBreak())
@@ -275,88 +282,13 @@ def gerar_relatorio_pdf(df):
     ))
     
     # Taxa de sucesso por país
-    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_file:
-        # Calculando taxa de sucesso média por país
-        success_by_country = df.groupby('Country')['Success Rate (%)'].agg(['mean', 'count']).reset_index()
-        success_by_country.columns = ['País', 'Taxa de Sucesso Média (%)', 'Número de Missões']
-        
-        # Filtrando para países com pelo menos 10 missões
-        filtered_success = success_by_country[success_by_country['Número de Missões'] >= 10]
-        
-        # Ordenando por taxa de sucesso
-        top_countries = filtered_success.sort_values('Taxa de Sucesso Média (%)', ascending=True).head(10)
-        
-        plt.figure(figsize=(8, 5))
-        bars = sns.barplot(y='País', x='Taxa de Sucesso Média (%)', data=top_countries, palette='YlGnBu')
-        plt.title('Taxa de Sucesso Média por País')
-        plt.xlabel('Taxa de Sucesso Média (%)')
-        plt.ylabel('País')
-        plt.xlim(0, 100)
-        plt.tight_layout()
-        
-        # Salvando a figura
-        plt.savefig(tmp_file.name, dpi=150, bbox_inches='tight')
-        plt.close()
-        
-        # Adicionando a imagem ao PDF
-        img = Image(tmp_file.name, width=6*inch, height=4*inch)
-        elementos.append(img)
-        
-        # Excluindo o arquivo temporário
-        tmp_path = tmp_file.name
+    elementos.append(graficos['sucesso_pais'])
     
     # Relação entre orçamento e taxa de sucesso
     elementos.append(Spacer(1, 0.3*inch))
     elementos.append(Paragraph("Relação entre Orçamento e Taxa de Sucesso", estilos['Subsecao']))
     
-    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_file:
-        # Categorias de orçamento
-        bins = [0, 1, 2, 5, 10, 20, 50, 100]
-        labels = ['0-1B', '1-2B', '2-5B', '5-10B', '10-20B', '20-50B', '50-100B']
-        
-        # Adicionando categorias ao DataFrame
-        df_with_bins = df.copy()
-        df_with_bins['Budget Category'] = pd.cut(df['Budget (in Billion $)'], 
-                                               bins=bins, 
-                                               labels=labels, 
-                                               include_lowest=True)
-        
-        # Agrupando por categoria de orçamento
-        budget_success = df_with_bins.groupby('Budget Category').agg({
-            'Success Rate (%)': ['mean', 'count']
-        }).reset_index()
-        
-        # Simplificando nomes de colunas
-        budget_success.columns = ['Categoria de Orçamento', 'Taxa de Sucesso Média', 'Número de Missões']
-        
-        plt.figure(figsize=(8, 5))
-        bars = sns.barplot(x='Categoria de Orçamento', y='Taxa de Sucesso Média', data=budget_success, palette='viridis')
-        
-        # Adicionando número de missões como texto em cada barra
-        for i, bar in enumerate(bars.patches):
-            bars.text(bar.get_x() + bar.get_width()/2, 
-                    bar.get_height() + 2,
-                    f"n={budget_success['Número de Missões'].iloc[i]}", 
-                    ha='center')
-        
-        plt.title('Taxa de Sucesso por Categoria de Orçamento')
-        plt.xlabel('Categoria de Orçamento (Bilhões $)')
-        plt.ylabel('Taxa de Sucesso Média (%)')
-        plt.ylim(0, 100)
-        plt.grid(True, alpha=0.3)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        
-        # Salvando a figura
-        plt.savefig(tmp_file.name, dpi=150, bbox_inches='tight')
-        plt.close()
-        
-        # Adicionando a imagem ao PDF
-        img = Image(tmp_file.name, width=6*inch, height=4*inch)
-        elementos.append(img)
-        
-        # Excluindo o arquivo temporário
-        tmp_path = tmp_file.name
+    elementos.append(graficos['sucesso_orcamento'])
     
     # Quebra de página
     elementos.append(PageBreak())
@@ -407,14 +339,9 @@ def gerar_relatorio_pdf(df):
         elementos.append(Spacer(1, 0.1*inch))
     
     # Construir o PDF
-    doc.build(elementos)
-    
-    # Limpar arquivos temporários se ainda existirem
-    try:
-        if 'tmp_path' in locals() and os.path.exists(tmp_path):
-            os.remove(tmp_path)
-    except:
-        pass
+    progresso("Montando o documento", 0.85)
+    with etapa('pdf.documento'):
+        doc.build(elementos)
     
     # Obter o conteúdo do buffer
     pdf_data = buffer.getvalue()
@@ -422,64 +349,112 @@ def gerar_relatorio_pdf(df):
     
     return pdf_data
 
-def criar_link_download(pdf_data, filename="analise_espacial.pdf"):
-    """Cria um link para download do PDF gerado"""
-    b64_pdf = base64.b64encode(pdf_data).decode('utf-8')
-    
-    # Criando o link HTML
-    href = f'<a href="data:application/pdf;base64,{b64_pdf}" download="{filename}" class="download-button">Baixar Relatório PDF</a>'
-    
-    return href
+@st.cache_resource
+def obter_cache_relatorios():
+    """Cache de relatórios PDF compartilhado por todas as sessões do processo"""
+    return CacheLRU(LIMITE_CACHE_RELATORIOS_MB * 1024 * 1024)
+
+@st.cache_resource
+def obter_fila_relatorios():
+    """Fila de relatórios em segundo plano compartilhada por todas as sessões do processo"""
+    return FilaRelatorios(RELATORIOS_SIMULTANEOS)
+
+def chave_relatorio(cubo, subtitulo=None, perfil=PERFIL_RELATORIO):
+    """Chave de um relatório: a data e o subtítulo entram porque são impressos na capa"""
+    return (cubo.impressao_digital, subtitulo, perfil, datetime.now().strftime("%d/%m/%Y"))
+
+def _gerar_e_guardar(cubo, subtitulo, chave, cache, progresso=None):
+    """Executada pela fila: gera o relatório e o guarda no cache antes de liberar a chave
 
-def adicionar_secao_exportacao_pdf(df):
-    """Adiciona a seção de exportação PDF ao app Streamlit"""
+    O cache chega como argumento porque a thread da fila não tem contexto de
+    sessão do Streamlit.
+    """
+    pdf_data = gerar_relatorio_pdf(cubo, subtitulo=subtitulo, progresso=progresso)
+    cache.guardar(chave, pdf_data)
+    return pdf_data
+
+@medido
+def solicitar_relatorio_pdf(cubo, subtitulo=None):
+    """Retorna a tarefa do relatório: já concluída se estiver no cache, senão a da fila
+
+    Pedidos idênticos de várias sessões enquanto o relatório é gerado
+    compartilham a mesma tarefa.
+    """
+    chave = chave_relatorio(cubo, subtitulo)
+
+    cache = obter_cache_relatorios()
+    pdf_data = cache.obter(chave)
+    registrar_cache(pdf_data is not None)
+    if pdf_data is not None:
+        return TarefaRelatorio.pronta(chave, pdf_data)
+    return obter_fila_relatorios().enviar(chave, _gerar_e_guardar, cubo, subtitulo, chave, cache)
+
+def _exibir_andamento(tarefa):
+    """Acompanha o relatório em geração dentro da execução atual, sem reexecutar o app
+
+    O andamento é redesenhado num st.empty() a cada INTERVALO_ATUALIZACAO_S.
+    Cada redesenho envia uma mensagem ao navegador, e é nesse ponto que o
+    Streamlit interrompe o script quando o usuário mexe em outro widget: a
+    espera não prende a sessão e não refaz as demais seções. Só um relatório
+    que passe de ESPERA_POR_EXECUCAO_S provoca uma reexecução completa, uma
+    por intervalo desses, para renovar a espera.
+    """
+    fila = obter_fila_relatorios()
+    andamento = st.empty()
+    limite = time.monotonic() + ESPERA_POR_EXECUCAO_S
+    while not tarefa.finalizada:
+        with andamento.container():
+            posicao = fila.posicao(tarefa)
+            if posicao:
+                st.progress(0.0, text=f"Aguardando na fila ({posicao} relatório(s) à frente)")
+            else:
+                st.progress(tarefa.progresso, text=tarefa.etapa)
+            if tarefa.pedidos > 1:
+                st.caption(f"Este relatório foi pedido por {tarefa.pedidos} sessões e é gerado uma única vez.")
+
+        if time.monotonic() >= limite:
+            st.rerun()
+        time.sleep(INTERVALO_ATUALIZACAO_S)
+    andamento.empty()
+
+def adicionar_secao_exportacao_pdf(cubo, subtitulo=None):
+    """Adiciona a seção de exportação PDF ao app Streamlit
+
+    subtitulo descreve os filtros ativos e é impresso na capa do relatório. A
+    geração acontece em segundo plano (fila_relatorios); a sessão guarda a
+    tarefa e acompanha o andamento.
+    """
     st.markdown("<h2 class='section-header'>Exportar Relatório PDF</h2>", unsafe_allow_html=True)
     
-    # CSS para o botão de download
-    st.markdown("""
-    <style>
-    .download-button {
-        display: inline-block;
-        padding: 12px 24px;
-        background-color: #4CAF50;
-        color: white;
-        text-align: center;
-        text-decoration: none;
-        font-size: 16px;
-        border-radius: 5px;
-        margin: 10px 0;
-        transition: background-color 0.3s;
-        cursor: pointer;
-    }
-    .download-button:hover {
-        background-color: #45a049;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
     st.write("Clique no botão abaixo para gerar e baixar um relatório PDF completo da análise.")
     
-    # Botão para gerar o PDF
+    # Botão para gerar o PDF (ou reutilizar um relatório idêntico já gerado ou em geração)
     if st.button("Gerar Relatório PDF"):
-        with st.spinner("Gerando relatório PDF... Isso pode levar alguns segundos."):
-            try:
-                # Gerar o PDF
-                pdf_data = gerar_relatorio_pdf(df)
-                
-                if pdf_data:
-                    # Criar link de download
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    download_link = criar_link_download(pdf_data, f"analise_espacial_{timestamp}.pdf")
-                    
-                    st.success("Relatório PDF gerado com sucesso!")
-                    st.markdown(download_link, unsafe_allow_html=True)
-                else:
-                    st.error("Ocorreu um erro ao gerar o PDF.")
-            
-            except Exception as e:
-                st.error(f"Erro durante a geração do PDF: {str(e)}")
-                st.info("""
-                Dicas para solução de problemas:
-                1. Verifique se todas as bibliotecas necessárias estão instaladas
-                2. Certifique-se de que seu ambiente tem acesso para criar arquivos temporários
-                """)
\ No newline at end of file
+        st.session_state['tarefa_pdf'] = solicitar_relatorio_pdf(cubo, subtitulo)
+    
+    # Uma tarefa de outro recorte (ou de outra versão dos dados) não é exibida
+    tarefa = st.session_state.get('tarefa_pdf')
+    if tarefa is None or tarefa.chave != chave_relatorio(cubo, subtitulo):
+        return
+    
+    if not tarefa.finalizada:
+        _exibir_andamento(tarefa)
+
+    if tarefa.erro is not None:
+        st.error(f"Erro durante a geração do PDF: {str(tarefa.erro)}")
+        st.info("""
+        Dicas para solução de problemas:
+        1. Verifique se todas as bibliotecas necessárias estão instaladas
+        """)
+        del st.session_state['tarefa_pdf']
+    else:
+        st.success("Relatório PDF gerado com sucesso!")
+        
+        # Download nativo: os bytes são enviados diretamente, sem base64
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        st.download_button(
+            "Baixar Relatório PDF",
+            data=tarefa.resultado,
+            file_name=f"analise_espacial_{timestamp}.pdf",
+            mime="application/pdf"
+        )
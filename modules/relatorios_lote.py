@@ -0,0 +1,101 @@
+import argparse
+import multiprocessing
+import os
+import re
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from modules.aggregates import construir_cubo
+from modules.data_loader import DIRETORIO_DADOS, ler_dados_tipados, ler_particoes
+from modules.config import PERFIL_RELATORIO
+from modules.pdf_charts import PERFIS
+from modules.pdf_export import gerar_relatorio_pdf
+
+# Geração em lote de relatórios PDF, sem Streamlit:
+#   python -m modules.relatorios_lote --por Country --por "Mission Type" --saida relatorios
+#   python -m modules.relatorios_lote --por Country --perfil rascunho
+
+def _nome_arquivo(coluna, valor):
+    """Gera um nome de arquivo seguro a partir da coluna e do valor da partição"""
+    texto = unicodedata.normalize('NFKD', f"{coluna}_{valor}").encode('ascii', 'ignore').decode()
+    return re.sub(r'[^A-Za-z0-9]+', '_', texto).strip('_').lower() + '.pdf'
+
+def _gerar_particao(coluna, valor, df, diretorio, perfil=PERFIL_RELATORIO):
+    """Gera e grava o relatório de uma partição, retornando tempo e tamanho"""
+    inicio = time.perf_counter()
+    pdf_data = gerar_relatorio_pdf(construir_cubo(df), subtitulo=f"{coluna}: {valor}", perfil=perfil)
+
+    caminho = os.path.join(diretorio, _nome_arquivo(coluna, valor))
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(pdf_data)
+
+    return {
+        'coluna': coluna,
+        'valor': str(valor),
+        'caminho': caminho,
+        'linhas': len(df),
+        'segundos': time.perf_counter() - inicio,
+        'bytes': len(pdf_data)
+    }
+
+def gerar_relatorios_em_lote(df, colunas, diretorio, processos=None, perfil=PERFIL_RELATORIO):
+    """Gera um relatório por valor de cada coluna, distribuindo-os entre processos"""
+    os.makedirs(diretorio, exist_ok=True)
+
+    resultados = []
+    with ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context('spawn')) as pool:
+        futuros = [
+            pool.submit(_gerar_particao, coluna, valor, particao, diretorio, perfil)
+            for coluna in colunas
+            for valor, particao in df.groupby(coluna, observed=True)
+        ]
+        for futuro in as_completed(futuros):
+            resultado = futuro.result()
+            print(f"  {resultado['caminho']} ({resultado['segundos']:.2f}s)", flush=True)
+            resultados.append(resultado)
+
+    return sorted(resultados, key=lambda r: (r['coluna'], r['valor']))
+
+def imprimir_resumo(resultados, duracao_total):
+    """Imprime o tempo de cada relatório e o total"""
+    print()
+    print(f"{'Partição':<40} {'Linhas':>8} {'Tempo (s)':>10} {'Tamanho (KB)':>13}")
+    for r in resultados:
+        particao = f"{r['coluna']}={r['valor']}"
+        print(f"{particao[:40]:<40} {r['linhas']:>8} {r['segundos']:>10.2f} {r['bytes'] / 1024:>13.1f}")
+
+    soma = sum(r['segundos'] for r in resultados)
+    print()
+    print(f"{len(resultados)} relatórios em {duracao_total:.2f}s "
+          f"(soma dos tempos individuais: {soma:.2f}s)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Gera um relatório PDF para cada valor das colunas escolhidas."
+    )
+    parser.add_argument('--por', action='append', required=True, metavar='COLUNA',
+                        help="coluna usada para particionar os dados (pode ser repetida)")
+    parser.add_argument('--saida', default='relatorios',
+                        help="diretório onde os PDFs serão gravados (padrão: relatorios)")
+    parser.add_argument('--dados', default=DIRETORIO_DADOS,
+                        help=f"arquivo CSV ou diretório de partições CSV (padrão: {DIRETORIO_DADOS})")
+    parser.add_argument('--processos', type=int, default=os.cpu_count(),
+                        help="número de processos em paralelo (padrão: núcleos disponíveis)")
+    parser.add_argument('--perfil', default=PERFIL_RELATORIO, choices=list(PERFIS),
+                        help=f"acabamento dos gráficos (padrão: {PERFIL_RELATORIO}, ou PERFIL_RELATORIO)")
+    args = parser.parse_args(argv)
+
+    df = ler_particoes(args.dados) if os.path.isdir(args.dados) else ler_dados_tipados(args.dados)
+    if df is None:
+        parser.error(f"nenhum arquivo CSV em {args.dados}")
+    colunas_invalidas = [c for c in args.por if c not in df.columns]
+    if colunas_invalidas:
+        parser.error(f"colunas inexistentes: {', '.join(colunas_invalidas)}")
+
+    inicio = time.perf_counter()
+    resultados = gerar_relatorios_em_lote(df, args.por, args.saida, args.processos, args.perfil)
+    imprimir_resumo(resultados, time.perf_counter() - inicio)
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,18 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from modules.utils import set_plot_style, create_text_area
+from modules.utils import create_text_area, fragmento
+from modules.figure_cache import grafico_em_cache, exibir_grafico
+from modules.figuras import nova_figura
+from modules.instrumentacao import medido
+from modules.analises import (
+    dados_success_rate_by_country, dados_success_rate_by_mission_type, dados_success_rate_evolution,
+    dados_success_quartiles_by_budget, dados_budget_success_density, dados_budget_success_density_cells
+)
 
-def show_success_analysis(df):
+@fragmento
+@medido
+def show_success_analysis(cubo):
     """Exibe análise resumida de taxas de sucesso"""
     st.markdown("<h2 class='section-header'>Análise de Taxas de Sucesso</h2>", unsafe_allow_html=True)
     
@@ -23,41 +30,40 @@ def show_success_analysis(df):
     
     with col1:
         # Taxa de sucesso por país
-        show_success_rate_by_country(df)
+        show_success_rate_by_country(cubo)
     
     with col2:
         # Taxa de sucesso por tipo de missão
-        show_success_rate_by_mission_type(df)
+        show_success_rate_by_mission_type(cubo)
     
     # Relação entre orçamento e taxa de sucesso
-    show_budget_vs_success(df)
+    show_budget_vs_success(cubo)
     
     # Evolução da taxa de sucesso ao longo do tempo
-    show_success_rate_evolution(df)
+    show_success_rate_evolution(cubo)
 
-def show_success_rate_by_country(df):
+@medido
+def show_success_rate_by_country(cubo, top_n=10, min_missoes=10):
     """Exibe taxas de sucesso por país"""
     st.subheader("Taxa de Sucesso por País")
-    
-    # Calculando taxa de sucesso média por país
-    success_by_country = df.groupby('Country')['Success Rate (%)'].agg(['mean', 'count']).reset_index()
-    success_by_country.columns = ['País', 'Taxa de Sucesso Média (%)', 'Número de Missões']
-    
-    # Filtrando para países com pelo menos 10 missões
-    filtered_success = success_by_country[success_by_country['Número de Missões'] >= 10]
-    
-    # Ordenando por taxa de sucesso
-    top_countries = filtered_success.sort_values('Taxa de Sucesso Média (%)', ascending=False).head(10)
+    exibir_grafico(cubo, plot_success_rate_by_country, vega_success_rate_by_country,
+                   top_n=top_n, min_missoes=min_missoes)
+
+@grafico_em_cache
+def plot_success_rate_by_country(cubo, top_n=10, min_missoes=10):
+    """Gráfico de barras da taxa de sucesso média por país"""
+    import seaborn as sns
+    top_countries = dados_success_rate_by_country(cubo, top_n, min_missoes)
     
     # Gráfico de barras horizontais
-    set_plot_style()
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = nova_figura(figsize=(10, 6))
     
     bars = sns.barplot(
         y='País', 
         x='Taxa de Sucesso Média (%)', 
         data=top_countries.iloc[::-1],  # Invertendo para melhor visualização
-        palette='YlGnBu'
+        palette='YlGnBu',
+        ax=ax
     )
     
     # Adicionando rótulos de porcentagem
@@ -70,37 +76,36 @@ def show_success_rate_by_country(df):
             va='center'
         )
     
-    plt.title('Taxa de Sucesso Média por País (Top 10)', fontsize=14)
-    plt.xlabel('Taxa de Sucesso Média (%)')
-    plt.ylabel('País')
-    plt.xlim(0, 100)  # Limitando o eixo x a 100%
-    plt.tight_layout()
+    ax.set_title(f'Taxa de Sucesso Média por País (Top {top_n})', fontsize=14)
+    ax.set_xlabel('Taxa de Sucesso Média (%)')
+    ax.set_ylabel('País')
+    ax.set_xlim(0, 100)  # Limitando o eixo x a 100%
+    fig.tight_layout()
     
-    st.pyplot(fig)
+    return fig
 
-def show_success_rate_by_mission_type(df):
+@medido
+def show_success_rate_by_mission_type(cubo, top_n=10, min_missoes=5):
     """Exibe taxas de sucesso por tipo de missão"""
     st.subheader("Taxa de Sucesso por Tipo de Missão")
-    
-    # Calculando taxa de sucesso média por tipo de missão
-    success_by_type = df.groupby('Mission Type')['Success Rate (%)'].agg(['mean', 'count']).reset_index()
-    success_by_type.columns = ['Tipo de Missão', 'Taxa de Sucesso Média (%)', 'Número de Missões']
-    
-    # Filtrando para tipos com pelo menos 5 missões
-    filtered_success = success_by_type[success_by_type['Número de Missões'] >= 5]
-    
-    # Ordenando por taxa de sucesso
-    top_types = filtered_success.sort_values('Taxa de Sucesso Média (%)', ascending=False).head(10)
+    exibir_grafico(cubo, plot_success_rate_by_mission_type, vega_success_rate_by_mission_type,
+                   top_n=top_n, min_missoes=min_missoes)
+
+@grafico_em_cache
+def plot_success_rate_by_mission_type(cubo, top_n=10, min_missoes=5):
+    """Gráfico de barras da taxa de sucesso média por tipo de missão"""
+    import seaborn as sns
+    top_types = dados_success_rate_by_mission_type(cubo, top_n, min_missoes)
     
     # Gráfico de barras horizontais
-    set_plot_style()
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = nova_figura(figsize=(10, 6))
     
     bars = sns.barplot(
         y='Tipo de Missão', 
         x='Taxa de Sucesso Média (%)', 
         data=top_types.iloc[::-1],  # Invertendo para melhor visualização
-        palette='RdPu'
+        palette='RdPu',
+        ax=ax
     )
     
     # Adicionando rótulos de porcentagem
@@ -113,76 +118,85 @@ def show_success_rate_by_mission_type(df):
             va='center'
         )
     
-    plt.title('Taxa de Sucesso Média por Tipo de Missão (Top 10)', fontsize=14)
-    plt.xlabel('Taxa de Sucesso Média (%)')
-    plt.ylabel('Tipo de Missão')
-    plt.xlim(0, 100)  # Limitando o eixo x a 100%
-    plt.tight_layout()
+    ax.set_title(f'Taxa de Sucesso Média por Tipo de Missão (Top {top_n})', fontsize=14)
+    ax.set_xlabel('Taxa de Sucesso Média (%)')
+    ax.set_ylabel('Tipo de Missão')
+    ax.set_xlim(0, 100)  # Limitando o eixo x a 100%
+    fig.tight_layout()
     
-    st.pyplot(fig)
+    return fig
 
-def show_budget_vs_success(df):
+@medido
+def show_budget_vs_success(cubo):
     """Exibe a relação entre orçamento e taxa de sucesso"""
     st.subheader("Relação entre Orçamento e Taxa de Sucesso")
-    
-     # Create budget ranges/bins
-    bins = [0, 1, 2, 5, 10, 20, 50, 100]
-    labels = ['0-1B', '1-2B', '2-5B', '5-10B', '10-20B', '20-50B', '50-100B']
-    
-    # Add a budget category column
-    df_with_bins = df.copy()
-    df_with_bins['Budget Category'] = pd.cut(df['Budget (in Billion $)'], 
-                                            bins=bins, 
-                                            labels=labels, 
-                                            include_lowest=True)
-    
-    # Create the boxplot
-    set_plot_style()
-    fig, ax = plt.subplots(figsize=(12, 7))
-    
-    # Boxplot showing distribution of success rates by budget category
-    sns.boxplot(x='Budget Category', 
-               y='Success Rate (%)', 
-               data=df_with_bins,
-               palette='viridis')
-    
-    # Add swarmplot to show individual points (will only show if not too many points)
-    if len(df) < 200:
-        sns.swarmplot(x='Budget Category', 
-                     y='Success Rate (%)', 
-                     data=df_with_bins,
-                     color='black', 
-                     alpha=0.5, 
-                     size=4)
-    
-    plt.title('Distribuição das taxas de sucesso por orçamento', fontsize=14)
-    plt.xlabel('Orçamento (Bilhões $)')
-    plt.ylabel('Taxa de Sucesso (%)')
-    plt.ylim(0, 100)
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    
-    st.pyplot(fig)
+    exibir_grafico(cubo, plot_budget_vs_success, vega_budget_vs_success)
     
     st.markdown("""
     **Observação**: O boxplot mostra a distribuição das taxas de sucesso em diferentes categorias de orçamento.
     A linha central representa a mediana, enquanto os limites da caixa representam o intervalo interquartil (IQR). Neste gráfico, percebemos que missões com orçamentos 
     mais altos nem sempre tendem a ter taxas de sucesso mais altas, embora haja uma grande variação dentro de cada categoria.
-    Missões com orçamentos muito baixos podem ter taxas de sucesso variadas, indicando que o orçamento não é o único fator determinante para o sucesso.""")
-    # Count number of missions in each category
-    category_counts = df_with_bins['Budget Category'].value_counts().sort_index()
+    Missões com orçamentos muito baixos podem ter taxas de sucesso variadas, indicando que o orçamento não é o único fator determinante para o sucesso.
+    O mapa de densidade ao lado mostra quantas missões existem em cada combinação de orçamento e taxa de sucesso.""")
 
-def show_success_rate_evolution(df):
+@grafico_em_cache
+def plot_budget_vs_success(cubo):
+    """Boxplot e mapa de densidade da taxa de sucesso por orçamento
+
+    Ambos são desenhados a partir dos histogramas do cubo (quartis por faixa de
+    orçamento e contagens orçamento x sucesso), então o custo não depende do
+    número de missões.
+    """
+    import seaborn as sns
+    fig, (ax1, ax2) = nova_figura(figsize=(14, 6), ncols=2, gridspec_kw={'width_ratios': [1, 1.2]})
+    
+    # Boxplot a partir dos quartis calculados no cubo
+    stats = dados_success_quartiles_by_budget(cubo)
+    boxes = ax1.bxp(stats, patch_artist=True)
+    cores = sns.color_palette('viridis', len(stats))
+    for patch, cor in zip(boxes['boxes'], cores):
+        patch.set_facecolor(cor)
+    
+    ax1.set_title('Distribuição das taxas de sucesso por orçamento', fontsize=14)
+    ax1.set_xlabel('Orçamento (Bilhões $)')
+    ax1.set_ylabel('Taxa de Sucesso (%)')
+    ax1.set_ylim(0, 100)
+    ax1.grid(True, alpha=0.3)
+    
+    # Mapa de densidade: número de missões em cada célula orçamento x sucesso
+    bordas_orcamento, bordas_sucesso, matriz = dados_budget_success_density(cubo)
+    malha = ax2.pcolormesh(bordas_orcamento, bordas_sucesso, np.ma.masked_equal(matriz, 0), cmap='viridis')
+    fig.colorbar(malha, ax=ax2, label='Número de Missões')
+    
+    ax2.set_title('Densidade de missões por orçamento e taxa de sucesso', fontsize=14)
+    ax2.set_xlabel('Orçamento (Bilhões $)')
+    ax2.set_ylabel('Taxa de Sucesso (%)')
+    ax2.set_ylim(0, 100)
+    ax2.grid(False)
+    
+    fig.tight_layout()
+    
+    return fig
+
+@medido
+def show_success_rate_evolution(cubo):
     """Exibe a evolução da taxa de sucesso ao longo do tempo"""
     st.subheader("Evolução da Taxa de Sucesso ao Longo do Tempo")
+    exibir_grafico(cubo, plot_success_rate_evolution, vega_success_rate_evolution)
     
-    # Calculando taxa de sucesso média por ano
-    success_by_year = df.groupby('Year')['Success Rate (%)'].agg(['mean', 'count']).reset_index()
-    success_by_year.columns = ['Ano', 'Taxa de Sucesso Média (%)', 'Número de Missões']
+    st.markdown("""
+    **Observação**: Este gráfico mostra como a taxa de sucesso das missões espaciais se manteve estável ao longo do tempo,
+    junto com o volume de missões realizadas em cada ano. Períodos com aumento significativo no número de missões
+    muitas vezes coincidem com mudanças na taxa média de sucesso.
+    """)
+
+@grafico_em_cache
+def plot_success_rate_evolution(cubo):
+    """Gráfico da taxa de sucesso média e do volume de missões por ano"""
+    success_by_year = dados_success_rate_evolution(cubo)
     
     # Criando o gráfico
-    set_plot_style()
-    fig, ax1 = plt.subplots(figsize=(12, 6))
+    fig, ax1 = nova_figura(figsize=(12, 6))
     
     # Linha para taxa de sucesso
     color = 'tab:blue'
@@ -199,15 +213,83 @@ def show_success_rate_evolution(df):
     ax2.bar(success_by_year['Ano'], success_by_year['Número de Missões'], alpha=0.3, color=color)
     ax2.tick_params(axis='y', labelcolor=color)
     
-    plt.title('Evolução da Taxa de Sucesso e Volume de Missões ao Longo do Tempo', fontsize=14)
-    plt.grid(True, alpha=0.3)
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+    # Título e grade no eixo de cima (o gêmeo), rótulos dos anos no eixo principal
+    ax2.set_title('Evolução da Taxa de Sucesso e Volume de Missões ao Longo do Tempo', fontsize=14)
+    ax2.grid(True, alpha=0.3)
+    ax1.tick_params(axis='x', labelrotation=45)
+    fig.tight_layout()
     
-    st.pyplot(fig)
-    
-    st.markdown("""
-    **Observação**: Este gráfico mostra como a taxa de sucesso das missões espaciais se manteve estável ao longo do tempo,
-    junto com o volume de missões realizadas em cada ano. Períodos com aumento significativo no número de missões
-    muitas vezes coincidem com mudanças na taxa média de sucesso.
-    """)
\ No newline at end of file
+    return fig
+
+def vega_success_rate_by_country(cubo, top_n=10, min_missoes=10):
+    """Versão Vega-Lite do gráfico de taxa de sucesso por país"""
+    return _barras_sucesso(dados_success_rate_by_country(cubo, top_n, min_missoes), 'País', 'yellowgreenblue',
+                           f'Taxa de Sucesso Média por País (Top {top_n})')
+
+def vega_success_rate_by_mission_type(cubo, top_n=10, min_missoes=5):
+    """Versão Vega-Lite do gráfico de taxa de sucesso por tipo de missão"""
+    return _barras_sucesso(dados_success_rate_by_mission_type(cubo, top_n, min_missoes), 'Tipo de Missão', 'redpurple',
+                           f'Taxa de Sucesso Média por Tipo de Missão (Top {top_n})')
+
+def _barras_sucesso(tabela, categoria, esquema, titulo):
+    """Barras horizontais de taxa de sucesso com o valor ao lado de cada barra"""
+    import altair as alt
+    base = alt.Chart(tabela, title=titulo).encode(
+        x=alt.X('Taxa de Sucesso Média (%):Q', scale=alt.Scale(domain=[0, 100])),
+        y=alt.Y(f'{categoria}:N', sort='-x')
+    )
+    barras = base.mark_bar().encode(
+        color=alt.Color('Taxa de Sucesso Média (%):Q', scale=alt.Scale(scheme=esquema), legend=None),
+        tooltip=[f'{categoria}:N', alt.Tooltip('Taxa de Sucesso Média (%):Q', format='.1f'), 'Número de Missões:Q']
+    )
+    rotulos = base.mark_text(align='left', dx=3).encode(text=alt.Text('Taxa de Sucesso Média (%):Q', format='.1f'))
+    return barras + rotulos
+
+def vega_budget_vs_success(cubo):
+    """Versão Vega-Lite do boxplot e do mapa de densidade de orçamento x sucesso
+
+    O boxplot é montado com camadas a partir dos quartis do cubo, porque o
+    boxplot nativo do Vega-Lite exigiria enviar todas as linhas.
+    """
+    import altair as alt
+    stats = pd.DataFrame(dados_success_quartiles_by_budget(cubo))[['label', 'whislo', 'q1', 'med', 'q3', 'whishi', 'n']]
+    eixo_x = alt.X('label:N', title='Orçamento (Bilhões $)', sort=list(stats['label']))
+    eixo_y = alt.Y('q1:Q', title='Taxa de Sucesso (%)', scale=alt.Scale(domain=[0, 100]))
+    dicas = [alt.Tooltip('label:N', title='Faixa'), 'n:Q', 'whislo:Q', 'q1:Q', 'med:Q', 'q3:Q', 'whishi:Q']
+
+    base = alt.Chart(stats).encode(x=eixo_x)
+    bigodes = base.mark_rule().encode(y=alt.Y('whislo:Q', title='Taxa de Sucesso (%)'), y2='whishi:Q')
+    caixas = base.mark_bar(size=30).encode(
+        y=eixo_y, y2='q3:Q',
+        color=alt.Color('label:N', scale=alt.Scale(scheme='viridis'), legend=None, sort=list(stats['label'])),
+        tooltip=dicas
+    )
+    medianas = base.mark_tick(color='white', size=30, thickness=2).encode(y='med:Q')
+    boxplot = (bigodes + caixas + medianas).properties(title='Distribuição das taxas de sucesso por orçamento')
+
+    densidade = dados_budget_success_density_cells(cubo)
+    mapa = alt.Chart(densidade, title='Densidade de missões por orçamento e taxa de sucesso').mark_rect().encode(
+        x=alt.X('Budget Start:Q', title='Orçamento (Bilhões $)'), x2='Budget End:Q',
+        y=alt.Y('Success Rate (%):Q', title='Taxa de Sucesso (%)', scale=alt.Scale(domain=[0, 100])), y2='Success End:Q',
+        color=alt.Color('Número de Missões:Q', scale=alt.Scale(scheme='viridis')),
+        tooltip=['Budget Start:Q', 'Success Rate (%):Q', 'Número de Missões:Q']
+    ).interactive()
+
+    return alt.hconcat(boxplot, mapa)
+
+def vega_success_rate_evolution(cubo):
+    """Versão Vega-Lite da taxa de sucesso e do volume de missões por ano"""
+    import altair as alt
+    base = alt.Chart(
+        dados_success_rate_evolution(cubo),
+        title='Evolução da Taxa de Sucesso e Volume de Missões ao Longo do Tempo'
+    ).encode(x=alt.X('Ano:O'))
+    volume = base.mark_bar(opacity=0.3, color='#d62728').encode(
+        y=alt.Y('Número de Missões:Q', axis=alt.Axis(titleColor='#d62728')),
+        tooltip=['Ano:O', 'Número de Missões:Q']
+    )
+    sucesso = base.mark_line(point=True, color='#1f77b4').encode(
+        y=alt.Y('Taxa de Sucesso Média (%):Q', scale=alt.Scale(domain=[0, 100]), axis=alt.Axis(titleColor='#1f77b4')),
+        tooltip=['Ano:O', alt.Tooltip('Taxa de Sucesso Média (%):Q', format='.1f')]
+    )
+    return alt.layer(volume, sucesso).resolve_scale(y='independent')
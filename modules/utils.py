@@ -1,16 +1,8 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-def set_plot_style():
-    """Define o estilo visual para os gráficos"""
-    sns.set_style("whitegrid")
-    plt.rcParams['font.family'] = 'sans-serif'
-    plt.rcParams['font.sans-serif'] = ['Arial', 'Helvetica', 'DejaVu Sans']
-    plt.rcParams['axes.labelsize'] = 12
-    plt.rcParams['axes.titlesize'] = 14
-    plt.rcParams['xtick.labelsize'] = 10
-    plt.rcParams['ytick.labelsize'] = 10
+# Executa a função como fragmento quando a versão do Streamlit oferece suporte:
+# interações com widgets dentro dela reexecutam apenas a própria função
+fragmento = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda funcao: funcao)
 
 def create_text_area(title, default_text, height=120, key=None):
     """Cria uma área de texto editável com título"""